@@ -0,0 +1,71 @@
+"""add blind index columns for document serial numbers
+
+Revision ID: a4d8e2f61c37
+Revises: 8e1a2c7d4f90
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4d8e2f61c37"
+down_revision: Union[str, None] = "8e1a2c7d4f90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SERIAL_FIELDS = ("bike_serial", "akb1_serial", "akb2_serial")
+
+
+def _get_cipher():
+    # Import lazily to avoid issues when Alembic loads config.
+    from modules.utils.config import settings
+    from modules.utils.document_security import SensitiveDataCipher
+
+    return SensitiveDataCipher(settings.ENCRYPTION_KEY)
+
+
+def upgrade() -> None:
+    for field in _SERIAL_FIELDS:
+        op.add_column("user_documents", sa.Column(f"{field}_hash", sa.String(length=64), nullable=True))
+        op.create_index(
+            op.f(f"ix_user_documents_{field}_hash"),
+            "user_documents",
+            [f"{field}_hash"],
+            unique=False,
+        )
+
+    bind = op.get_bind()
+    metadata = sa.MetaData()
+    user_documents = sa.Table("user_documents", metadata, autoload_with=bind)
+    cipher = _get_cipher()
+
+    documents_result = bind.execute(
+        sa.select(
+            user_documents.c.id,
+            *(user_documents.c[field] for field in _SERIAL_FIELDS),
+        )
+    ).fetchall()
+
+    for row in documents_result:
+        row_map = row._mapping
+        updates = {
+            f"{field}_hash": cipher.blind_index(row_map[field])
+            for field in _SERIAL_FIELDS
+            if row_map[field] is not None
+        }
+        if updates:
+            bind.execute(
+                user_documents.update()
+                .where(user_documents.c.id == row_map["id"])
+                .values(**updates)
+            )
+
+
+def downgrade() -> None:
+    for field in reversed(_SERIAL_FIELDS):
+        op.drop_index(op.f(f"ix_user_documents_{field}_hash"), table_name="user_documents")
+        op.drop_column("user_documents", f"{field}_hash")
@@ -0,0 +1,47 @@
+"""add idempotency keys for payment creation
+
+Revision ID: a4e8d2c6f1b3
+Revises: e5c2a9f7b1d8
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a4e8d2c6f1b3"
+down_revision: Union[str, None] = "e5c2a9f7b1d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "payment_idempotency_keys",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=128), nullable=False),
+        sa.Column("request_hash", sa.String(length=64), nullable=False),
+        sa.Column("provider_key", sa.String(length=64), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("payment_id", sa.Integer(), nullable=True),
+        sa.Column("response", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["payment_id"], ["payments.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_payment_idempotency_keys_user_id_key",
+        "payment_idempotency_keys",
+        ["user_id", "key"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payment_idempotency_keys_user_id_key", table_name="payment_idempotency_keys")
+    op.drop_table("payment_idempotency_keys")
@@ -0,0 +1,37 @@
+"""add (status, updated_at) index on payments for reconciliation
+
+Revision ID: b7d3f9a1c5e2
+Revises: a4e8d2c6f1b3
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d3f9a1c5e2"
+down_revision: Union[str, None] = "a4e8d2c6f1b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps payments writable while the index builds; it cannot
+    # run inside a transaction. ix_payments_status is a prefix of the new one.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_payments_status_updated_at",
+            "payments",
+            ["status", "updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_payments_status", table_name="payments", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_payments_status", "payments", ["status"], unique=False, postgresql_concurrently=True)
+        op.drop_index("ix_payments_status_updated_at", table_name="payments", postgresql_concurrently=True)
@@ -0,0 +1,49 @@
+"""add trigram indexes for inventory search
+
+Revision ID: c81f4e2a9d63
+Revises: a4d8e2f61c37
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f4e2a9d63"
+down_revision: Union[str, None] = "a4d8e2f61c37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_TRGM_INDEXES = (
+    ("ix_bikes_number_trgm", "bikes", "number"),
+    ("ix_bikes_vin_trgm", "bikes", "vin"),
+    ("ix_bikes_name_trgm", "bikes", "name"),
+    ("ix_batteries_number_trgm", "batteries", "number"),
+)
+
+
+def upgrade() -> None:
+    # pg_trgm is PostgreSQL-only; other backends fall back to sequential ILIKE scans.
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for index_name, table_name, column in _TRGM_INDEXES:
+        op.create_index(
+            index_name,
+            table_name,
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for index_name, table_name, _ in reversed(_TRGM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,49 @@
+"""add per-user counters for payment and contract numbering
+
+Revision ID: d3b7f1e8a2c4
+Revises: c81f4e2a9d63
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3b7f1e8a2c4"
+down_revision: Union[str, None] = "c81f4e2a9d63"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_counters",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=32), nullable=False),
+        sa.Column("value", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "name"),
+    )
+
+    # Continue numbering after the highest number already issued to each user.
+    op.execute(
+        sa.text(
+            "INSERT INTO user_counters (user_id, name, value) "
+            "SELECT user_id, 'payment_number', MAX(payment_number) "
+            "FROM contract_payments GROUP BY user_id"
+        )
+    )
+    op.execute(
+        sa.text(
+            "INSERT INTO user_counters (user_id, name, value) "
+            "SELECT user_id, 'contract_number', COUNT(*) "
+            "FROM user_documents GROUP BY user_id"
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_counters")
@@ -0,0 +1,62 @@
+"""add composite and partial indexes for hot payment and document queries
+
+Revision ID: e5c2a9f7b1d8
+Revises: d3b7f1e8a2c4
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5c2a9f7b1d8"
+down_revision: Union[str, None] = "d3b7f1e8a2c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_SAVED_METHOD_WHERE = "status = 'succeeded' AND payment_method_id IS NOT NULL"
+
+_NEW_INDEXES = (
+    ("ix_contract_payments_user_id_payment_number", "contract_payments", ["user_id", "payment_number"], None),
+    ("ix_contract_payments_user_id_status_due_date", "contract_payments", ["user_id", "status", "due_date"], None),
+    ("ix_user_documents_user_id_created_at_id", "user_documents", ["user_id", "created_at", "id"], None),
+    ("ix_payments_order_id_status", "payments", ["order_id", "status"], None),
+    ("ix_payments_user_saved_method", "payments", ["user_id", "created_at"], _SAVED_METHOD_WHERE),
+)
+
+# Single-column indexes that become prefixes of the composite ones above.
+_REDUNDANT_INDEXES = (
+    ("ix_contract_payments_user_id", "contract_payments", ["user_id"]),
+    ("ix_payments_order_id", "payments", ["order_id"]),
+)
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps the tables writable while the indexes build; it
+    # cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns, where in _NEW_INDEXES:
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                postgresql_where=sa.text(where) if where else None,
+                sqlite_where=sa.text(where) if where else None,
+            )
+        for index_name, table_name, _ in _REDUNDANT_INDEXES:
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name, table_name, columns in reversed(_REDUNDANT_INDEXES):
+            op.create_index(
+                index_name, table_name, columns, unique=False, postgresql_concurrently=True
+            )
+        for index_name, table_name, _, _ in reversed(_NEW_INDEXES):
+            op.drop_index(index_name, table_name=table_name, postgresql_concurrently=True)
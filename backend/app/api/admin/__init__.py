@@ -15,6 +15,10 @@ from .inventory import router as inventory_router
 from .return_acts import router as return_acts_router
 from .return_act_docx import router as return_act_docx_router
 from .create_contract import router as create_contract_router
+from .contract_exports import router as contract_exports_router
+from .payments_export import router as payments_export_router
+from .system_metrics import router as system_metrics_router
+from .profiles import router as profiles_router
 
 admin_router = APIRouter()
 
@@ -32,4 +36,8 @@ admin_router.include_router(user_payment_schedule_router, tags=["Admin Payments"
 admin_router.include_router(inventory_router, tags=["Admin Inventory"])
 admin_router.include_router(return_acts_router, tags=["Admin Contracts"])
 admin_router.include_router(return_act_docx_router, tags=["Admin Contracts"])
-admin_router.include_router(create_contract_router, tags=["Admin Contracts"])
\ No newline at end of file
+admin_router.include_router(create_contract_router, tags=["Admin Contracts"])
+admin_router.include_router(contract_exports_router, tags=["Admin Contracts"])
+admin_router.include_router(payments_export_router, tags=["Admin Payments"])
+admin_router.include_router(system_metrics_router, tags=["Admin System"])
+admin_router.include_router(profiles_router, tags=["Admin System"])
\ No newline at end of file
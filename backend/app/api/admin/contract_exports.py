@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import FileResponse
+
+from app.handlers.admin.contract_export_handler import ContractExportHandler
+from modules.schemas.contract_export_schemas import (
+    ContractExportCreateRequest,
+    ContractExportJobRead,
+)
+
+router = APIRouter()
+
+
+@router.post(
+    "/admin/contracts/exports",
+    response_model=ContractExportJobRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def admin_create_contract_export(
+    body: ContractExportCreateRequest,
+    handler: ContractExportHandler = Depends(ContractExportHandler),
+):
+    return handler.create_export(body)
+
+
+@router.get("/admin/contracts/exports/{job_id}", response_model=ContractExportJobRead)
+def admin_get_contract_export(
+    job_id: str,
+    handler: ContractExportHandler = Depends(ContractExportHandler),
+):
+    return handler.get_export(job_id)
+
+
+@router.get("/admin/contracts/exports/{job_id}/download")
+def admin_download_contract_export(
+    job_id: str,
+    handler: ContractExportHandler = Depends(ContractExportHandler),
+):
+    job, archive_path = handler.get_export_archive(job_id)
+    # FileResponse answers Range/If-Range requests, so large archives can be resumed.
+    return FileResponse(
+        archive_path,
+        media_type="application/zip",
+        filename=f"contracts_{job.date_from.isoformat()}_{job.date_to.isoformat()}.zip",
+    )
@@ -9,6 +9,6 @@ router = APIRouter()
 @router.get("/admin/users/{user_id}", response_model=UserWithDocumentSummary)
 def admin_get_user_summary(
     user_id: int,
-    handler: AdminHandler = Depends(AdminHandler),
+    handler: AdminHandler = Depends(AdminHandler.read_only),
 ):
     return handler.get_user_summary(user_id)
\ No newline at end of file
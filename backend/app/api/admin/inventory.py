@@ -1,3 +1,5 @@
+from datetime import date
+
 from fastapi import APIRouter, Depends, Query, Response, status
 
 from app.handlers.admin.inventory_handler import InventoryHandler
@@ -14,16 +16,28 @@ from modules.schemas.inventory_schemas import (
     BikeRead,
     BikeStatusUpdate,
     BikeUpdate,
+    InventoryAvailabilityResult,
+    InventoryImportResult,
+    InventorySearchKind,
+    InventorySearchResult,
     LocationCreate,
     LocationRead,
     LocationUpdate,
 )
+from modules.utils.inventory_import import IMPORT_OPENAPI_EXTRA, read_import_rows
 
 router = APIRouter()
 
+_NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _set_next_cursor(response: Response, next_cursor: int | None) -> None:
+    if next_cursor is not None:
+        response.headers[_NEXT_CURSOR_HEADER] = str(next_cursor)
+
 
 @router.get("/admin/locations", response_model=list[LocationRead])
-def admin_list_locations(handler: InventoryHandler = Depends(InventoryHandler)):
+def admin_list_locations(handler: InventoryHandler = Depends(InventoryHandler.read_only)):
     return handler.list_locations()
 
 
@@ -38,7 +52,7 @@ def admin_create_location(
 @router.get("/admin/locations/{location_id}", response_model=LocationRead)
 def admin_get_location(
     location_id: int,
-    handler: InventoryHandler = Depends(InventoryHandler),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
 ):
     return handler.get_location(location_id)
 
@@ -61,12 +75,60 @@ def admin_delete_location(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
+@router.get("/admin/inventory/search", response_model=InventorySearchResult)
+def admin_search_inventory(
+    q: str = Query(..., min_length=1, max_length=64),
+    kind: InventorySearchKind = Query(default=InventorySearchKind.ALL),
+    status_filter: AssetStatus | None = Query(default=None, alias="status"),
+    limit: int = Query(default=20, ge=1, le=100),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
+):
+    return handler.search_inventory(q, kind=kind, status_filter=status_filter, limit=limit)
+
+
+@router.get("/admin/inventory/availability", response_model=InventoryAvailabilityResult)
+def admin_inventory_availability(
+    start: date = Query(...),
+    end: date = Query(...),
+    kind: InventorySearchKind = Query(default=InventorySearchKind.ALL),
+    location_id: int | None = Query(default=None),
+    type_id: int | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
+):
+    return handler.get_availability(
+        start,
+        end,
+        kind=kind,
+        location_id=location_id,
+        type_id=type_id,
+        limit=limit,
+    )
+
+
 @router.get("/admin/bikes", response_model=list[BikeRead])
 def admin_list_bikes(
+    response: Response,
     status_filter: AssetStatus | None = Query(default=None, alias="status"),
-    handler: InventoryHandler = Depends(InventoryHandler),
+    location_id: int | None = Query(default=None),
+    type_id: int | None = Query(default=None),
+    service_from: date | None = Query(default=None),
+    service_to: date | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    after_id: int | None = Query(default=None),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
 ):
-    return handler.list_bikes(status_filter)
+    bikes, next_cursor = handler.list_bikes(
+        status_filter,
+        location_id=location_id,
+        type_id=type_id,
+        service_from=service_from,
+        service_to=service_to,
+        limit=limit,
+        after_id=after_id,
+    )
+    _set_next_cursor(response, next_cursor)
+    return bikes
 
 
 @router.post("/admin/bikes", response_model=BikeRead)
@@ -77,10 +139,22 @@ def admin_create_bike(
     return handler.create_bike(body)
 
 
+@router.post(
+    "/admin/bikes/import",
+    response_model=InventoryImportResult,
+    openapi_extra=IMPORT_OPENAPI_EXTRA,
+)
+def admin_import_bikes(
+    rows: list = Depends(read_import_rows),
+    handler: InventoryHandler = Depends(InventoryHandler),
+):
+    return handler.import_bikes(rows)
+
+
 @router.get("/admin/bikes/{bike_id}", response_model=BikeRead)
 def admin_get_bike(
     bike_id: int,
-    handler: InventoryHandler = Depends(InventoryHandler),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
 ):
     return handler.get_bike(bike_id)
 
@@ -114,10 +188,21 @@ def admin_delete_bike(
 
 @router.get("/admin/batteries", response_model=list[BatteryRead])
 def admin_list_batteries(
+    response: Response,
     status_filter: AssetStatus | None = Query(default=None, alias="status"),
-    handler: InventoryHandler = Depends(InventoryHandler),
+    location_id: int | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=500),
+    after_id: int | None = Query(default=None),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
 ):
-    return handler.list_batteries(status_filter)
+    batteries, next_cursor = handler.list_batteries(
+        status_filter,
+        location_id=location_id,
+        limit=limit,
+        after_id=after_id,
+    )
+    _set_next_cursor(response, next_cursor)
+    return batteries
 
 
 @router.post("/admin/batteries", response_model=BatteryRead)
@@ -128,10 +213,22 @@ def admin_create_battery(
     return handler.create_battery(body)
 
 
+@router.post(
+    "/admin/batteries/import",
+    response_model=InventoryImportResult,
+    openapi_extra=IMPORT_OPENAPI_EXTRA,
+)
+def admin_import_batteries(
+    rows: list = Depends(read_import_rows),
+    handler: InventoryHandler = Depends(InventoryHandler),
+):
+    return handler.import_batteries(rows)
+
+
 @router.get("/admin/batteries/{battery_id}", response_model=BatteryRead)
 def admin_get_battery(
     battery_id: int,
-    handler: InventoryHandler = Depends(InventoryHandler),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
 ):
     return handler.get_battery(battery_id)
 
@@ -166,7 +263,7 @@ def admin_delete_battery(
 @router.get("/admin/bike-pricing", response_model=list[BikePricingRead])
 def admin_list_bike_pricing(
     type_id: int | None = Query(default=None),
-    handler: InventoryHandler = Depends(InventoryHandler),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
 ):
     items = handler.list_bike_pricing(type_id=type_id)
     return [BikePricingRead.model_validate(item) for item in items]
@@ -183,7 +280,7 @@ def admin_create_bike_pricing(
 @router.get("/admin/bike-pricing/{pricing_id}", response_model=BikePricingRead)
 def admin_get_bike_pricing(
     pricing_id: int,
-    handler: InventoryHandler = Depends(InventoryHandler),
+    handler: InventoryHandler = Depends(InventoryHandler.read_only),
 ):
     return BikePricingRead.model_validate(handler.get_bike_pricing(pricing_id))
 
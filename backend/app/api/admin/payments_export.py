@@ -0,0 +1,32 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from app.handlers.admin.admin_handler import AdminHandler
+from modules.schemas.payment_schemas import PaymentExportFormat
+
+router = APIRouter()
+
+_MEDIA_TYPES = {
+    PaymentExportFormat.csv: "text/csv; charset=utf-8",
+    PaymentExportFormat.xlsx: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+@router.get("/admin/payments/export")
+def admin_export_payments(
+    file_format: PaymentExportFormat = Query(default=PaymentExportFormat.csv, alias="format"),
+    due_from: date | None = Query(default=None),
+    due_to: date | None = Query(default=None),
+    status: str | None = Query(default=None),
+    payment_type: str | None = Query(default=None),
+    handler: AdminHandler = Depends(AdminHandler),
+):
+    content = handler.export_payments(file_format, due_from, due_to, status, payment_type)
+    filename = f"payments.{file_format.value}"
+    return StreamingResponse(
+        content,
+        media_type=_MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
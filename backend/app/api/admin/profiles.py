@@ -0,0 +1,33 @@
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import FileResponse, PlainTextResponse
+
+from app.handlers.admin.system_handler import SystemHandler
+from modules.schemas.system_schemas import ProfileFileFormat, ProfileRead
+
+router = APIRouter()
+
+
+@router.get("/admin/system/profiles", response_model=list[ProfileRead])
+def admin_list_profiles(
+    limit: int = Query(20, ge=1, le=100),
+    handler: SystemHandler = Depends(SystemHandler),
+):
+    return handler.list_profiles(limit)
+
+
+@router.get("/admin/system/profiles/{profile_id}/download")
+def admin_download_profile(
+    profile_id: str,
+    format: ProfileFileFormat = Query(ProfileFileFormat.prof),
+    handler: SystemHandler = Depends(SystemHandler),
+):
+    if format == ProfileFileFormat.text:
+        return PlainTextResponse(handler.get_profile_text(profile_id))
+
+    profile, path = handler.get_profile_file(profile_id)
+    # Raw pstats dump: open with ``python -m pstats`` or snakeviz.
+    return FileResponse(
+        path,
+        media_type="application/octet-stream",
+        filename=f"profile_{profile.id}.prof",
+    )
@@ -1,25 +1,33 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
 
 from app.handlers.admin.admin_handler import AdminHandler
+from modules.schemas.document_schemas import DocumentFileFormat
 
 router = APIRouter()
 
 _DOCX_MEDIA_TYPE = (
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 )
+_PDF_MEDIA_TYPE = "application/pdf"
 
 
 @router.get("/admin/users/{user_id}/return-acts/{act_id}/docx")
 def admin_get_return_act_docx(
     user_id: int,
     act_id: int,
+    file_format: DocumentFileFormat = Query(default=DocumentFileFormat.docx, alias="format"),
     handler: AdminHandler = Depends(AdminHandler),
 ):
-    buf = handler.get_return_act_docx_bytes(user_id, act_id)
-    filename = f"return_act_{act_id}.docx"
+    if file_format == DocumentFileFormat.pdf:
+        buf = handler.get_return_act_pdf_bytes(user_id, act_id)
+        media_type = _PDF_MEDIA_TYPE
+    else:
+        buf = handler.get_return_act_docx_bytes(user_id, act_id)
+        media_type = _DOCX_MEDIA_TYPE
+    filename = f"return_act_{act_id}.{file_format.value}"
     return StreamingResponse(
         buf,
-        media_type=_DOCX_MEDIA_TYPE,
+        media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
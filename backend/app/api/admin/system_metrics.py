@@ -0,0 +1,11 @@
+from fastapi import APIRouter, Depends
+
+from app.handlers.admin.system_handler import SystemHandler
+from modules.schemas.system_schemas import SystemMetricsRead
+
+router = APIRouter()
+
+
+@router.get("/admin/system/metrics", response_model=SystemMetricsRead)
+def admin_system_metrics(handler: SystemHandler = Depends(SystemHandler)):
+    return handler.get_metrics()
@@ -9,6 +9,6 @@ router = APIRouter()
 @router.get("/admin/users/{user_id}/payment-schedule", response_model=list[ContractPaymentRead])
 def admin_user_payment_schedule(
     user_id: int,
-    handler: AdminHandler = Depends(AdminHandler),
+    handler: AdminHandler = Depends(AdminHandler.read_only),
 ):
     return handler.get_user_payment_schedule(user_id)
\ No newline at end of file
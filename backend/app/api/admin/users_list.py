@@ -14,7 +14,7 @@ def admin_list_users(
         alias="status",
         description="all, approved, rejected, pending, draft",
     ),
-    handler: AdminHandler = Depends(AdminHandler),
+    handler: AdminHandler = Depends(AdminHandler.read_only),
 ):
     if status_filter in (None, "all"):
         return handler.list_users()
@@ -13,13 +13,14 @@ from modules.schemas.payment_schemas import (
     WebhookResponse,
 )
 from modules.utils.jwt_utils import get_current_user
+from modules.utils.payment_idempotency import IDEMPOTENCY_KEY_HEADER
 
 router = APIRouter()
 
 @router.get("/payments/schedule", response_model=list[ContractPaymentRead], tags=["Payments"])
 async def my_schedule(
     current_user: User = Depends(get_current_user),
-    handler: PaymentHandler = Depends(),
+    handler: PaymentHandler = Depends(PaymentHandler.read_only),
 ):
     return await handler.list_my_schedule(current_user)
 
@@ -32,17 +33,18 @@ async def my_schedule(
 async def my_schedule_item(
     schedule_payment_id: int,
     current_user: User = Depends(get_current_user),
-    handler: PaymentHandler = Depends(),
+    handler: PaymentHandler = Depends(PaymentHandler.read_only),
 ):
     return await handler.get_my_schedule_item(schedule_payment_id, current_user)
 
 @router.post("/payments/create", response_model=CreatePaymentResponse, tags=["Payments"])
 async def create_payment(
     data: CreatePaymentRequest,
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, max_length=64),
     current_user: User = Depends(get_current_user),
     handler: PaymentHandler = Depends(),
 ):
-    return await handler.create_payment(data, current_user)
+    return await handler.create_payment(data, current_user, idempotency_key)
 
 @router.get("/yookassa/webhook", response_model=WebhookResponse, tags=["YooKassa Webhook"])
 @router.get(
@@ -95,10 +97,11 @@ async def disable_autopay(
 @router.post("/autopay/charge", response_model=CreatePaymentResponse, tags=["Autopay"])
 async def charge_autopay(
     data: AutopayChargeRequest,
+    idempotency_key: str | None = Header(default=None, alias=IDEMPOTENCY_KEY_HEADER, max_length=64),
     current_user: User = Depends(get_current_user),
     handler: PaymentHandler = Depends(),
 ):
-    return await handler.charge_autopay(data, current_user)
+    return await handler.charge_autopay(data, current_user, idempotency_key)
 
 
 @router.post("/recalc/{order_id}", tags=["Orders"])
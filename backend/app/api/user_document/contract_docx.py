@@ -1,24 +1,32 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
 
 from app.handlers.user_document.user_document_handler import UserDocumentHandler
+from modules.schemas.document_schemas import DocumentFileFormat
 
 router = APIRouter()
 
 _DOCX_MEDIA_TYPE = (
     "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 )
+_PDF_MEDIA_TYPE = "application/pdf"
 
 
 @router.get("/users/me/contract-docx/{document_id}")
 def get_my_contract_docx(
     document_id: int,
+    file_format: DocumentFileFormat = Query(default=DocumentFileFormat.docx, alias="format"),
     handler: UserDocumentHandler = Depends(UserDocumentHandler),
 ):
-    buf = handler.get_my_contract_docx_bytes(document_id)
-    filename = f"contract_{document_id}.docx"
+    if file_format == DocumentFileFormat.pdf:
+        buf = handler.get_my_contract_pdf_bytes(document_id)
+        media_type = _PDF_MEDIA_TYPE
+    else:
+        buf = handler.get_my_contract_docx_bytes(document_id)
+        media_type = _DOCX_MEDIA_TYPE
+    filename = f"contract_{document_id}.{file_format.value}"
     return StreamingResponse(
         buf,
-        media_type=_DOCX_MEDIA_TYPE,
+        media_type=media_type,
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
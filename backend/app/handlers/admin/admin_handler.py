@@ -4,10 +4,9 @@ from decimal import Decimal, InvalidOperation
 from fastapi import Depends, HTTPException, status
 from sqlalchemy import func, or_
 from sqlalchemy.orm import Session
-from num2words import num2words
 
 
-from modules.connection_to_db.database import get_session
+from modules.connection_to_db.database import get_read_session, get_session
 from modules.models.inventory import Battery, Bike
 from modules.models.payment import ContractPayment
 from modules.models.return_act import ReturnAct
@@ -22,17 +21,27 @@ from modules.schemas.document_schemas import (
     UserDocumentRead,
     UserWithDocumentSummary,
 )
+from modules.schemas.payment_schemas import PaymentExportFormat
 from modules.schemas.return_act_schemas import ReturnActCreateRequest, ReturnActRead
 from modules.utils.admin_utils import get_current_admin
+from modules.utils.availability import availability_index
+from modules.utils.counters import (
+    CONTRACT_NUMBER_COUNTER,
+    PAYMENT_NUMBER_COUNTER,
+    next_user_counter,
+)
 from modules.utils.document_security import (
     decrypt_document_fields,
     decrypt_user_fields,
     encrypt_document_fields,
     get_sensitive_data_cipher,
     render_contract_docx,
+    render_contract_pdf,
     render_return_act_docx,
+    render_return_act_pdf,
     serialize_document_for_response,
 )
+from modules.utils.payment_export import iter_payments_csv, iter_payments_xlsx
 from modules.utils.payment_schedule import rebuild_schedule_for_document
 from modules.utils.pricing import calc_total_amount, resolve_weekly_amount
 
@@ -67,6 +76,15 @@ class AdminHandler:
         self.admin = admin
         self.cipher = get_sensitive_data_cipher()
 
+    @classmethod
+    def read_only(
+        cls,
+        db: Session = Depends(get_read_session),
+        admin: User = Depends(get_current_admin),
+    ) -> "AdminHandler":
+        """Handler bound to the read session, for endpoints that never write."""
+        return cls(db=db, admin=admin)
+
     def list_users(
         self, status_filter: DocumentStatusEnum | None = None
     ) -> list[UserWithDocumentSummary]:
@@ -214,6 +232,7 @@ class AdminHandler:
 
         self.db.commit()
         self.db.refresh(target_doc)
+        availability_index.refresh_document(target_doc)
         return UserDocumentRead(**serialize_document_for_response(target_doc, self.cipher, user))
 
     def _sync_inventory_statuses_for_user_documents(
@@ -359,12 +378,7 @@ class AdminHandler:
         act.return_act_number = f"{contract_number}-{act.id}"
 
         if body.damage_amount > 0:
-            payment_number = (
-                self.db.query(ContractPayment)
-                .filter(ContractPayment.user_id == user_id)
-                .count()
-                + 1
-            )
+            payment_number = next_user_counter(self.db, user_id, PAYMENT_NUMBER_COUNTER)
             damage_schedule = ContractPayment(
                 user_id=user_id,
                 document_id=document_id,
@@ -414,12 +428,7 @@ class AdminHandler:
         accrued_rent_amount_decimal = Decimal(accrued_rent_amount)
 
         if recalculated_total > accrued_rent_amount_decimal:
-            payment_number = (
-                self.db.query(ContractPayment)
-                .filter(ContractPayment.user_id == user_id)
-                .count()
-                + 1
-            )
+            payment_number = next_user_counter(self.db, user_id, PAYMENT_NUMBER_COUNTER)
             debt_diff = recalculated_total - accrued_rent_amount_decimal
             recalc_schedule = ContractPayment(
                 user_id=user_id,
@@ -445,6 +454,7 @@ class AdminHandler:
 
         self.db.commit()
         self.db.refresh(act)
+        availability_index.refresh_document(doc)
         return ReturnActRead(
             id=act.id,
             return_act_number=act.return_act_number,
@@ -545,7 +555,38 @@ class AdminHandler:
             .all()
         )
 
+    def export_payments(
+        self,
+        file_format: PaymentExportFormat,
+        due_from: date | None,
+        due_to: date | None,
+        status_filter: str | None,
+        payment_type: str | None,
+    ):
+        if due_from is not None and due_to is not None and due_from > due_to:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Начало периода не может быть позже его окончания",
+            )
+        export = iter_payments_xlsx if file_format == PaymentExportFormat.xlsx else iter_payments_csv
+        return export(
+            due_from=due_from,
+            due_to=due_to,
+            status=status_filter,
+            payment_type=payment_type,
+        )
+
     def get_contract_docx_bytes(self, user_id: int, document_id: int):
+        user, doc, decrypted_fields = self._get_contract_render_data(user_id, document_id)
+        return render_contract_docx(user, doc, decrypted_fields)
+
+    def get_contract_pdf_bytes(self, user_id: int, document_id: int):
+        user, doc, decrypted_fields = self._get_contract_render_data(user_id, document_id)
+        return render_contract_pdf(user, doc, decrypted_fields)
+
+    def _get_contract_render_data(
+        self, user_id: int, document_id: int
+    ) -> tuple[User, UserDocument, dict]:
         user = self._get_user_or_404(user_id)
         doc = self._get_user_document_or_404(user_id, document_id)
 
@@ -559,9 +600,15 @@ class AdminHandler:
             **decrypt_user_fields(user, self.cipher),
             **decrypt_document_fields(doc, self.cipher),
         }
-        return render_contract_docx(user, doc, decrypted_fields)
+        return user, doc, decrypted_fields
 
     def get_return_act_docx_bytes(self, user_id: int, act_id: int):
+        return render_return_act_docx(self._get_return_act_values(user_id, act_id))
+
+    def get_return_act_pdf_bytes(self, user_id: int, act_id: int):
+        return render_return_act_pdf(self._get_return_act_values(user_id, act_id))
+
+    def _get_return_act_values(self, user_id: int, act_id: int) -> dict:
         user = self._get_user_or_404(user_id)
         act = self._get_return_act_or_404(user_id, act_id)
 
@@ -586,7 +633,7 @@ class AdminHandler:
             "Сумма_повреждений": act.damage_amount,
             "Срок_долга": act.debt_term_days,
         }
-        return render_return_act_docx(values)
+        return values
 
     def _ensure_inventory_is_free_for_contract(
         self, update_payload: dict[str, object]
@@ -734,13 +781,9 @@ class AdminHandler:
         if doc.id is None:
             self.db.flush()
 
-        total_user_documents = (
-            self.db.query(UserDocument)
-            .filter(UserDocument.user_id == doc.user_id)
-            .count()
-        )
+        user_contract_seq = next_user_counter(self.db, doc.user_id, CONTRACT_NUMBER_COUNTER)
 
-        contract_number = f"{doc.user_id}.{doc.id}.{total_user_documents}"
+        contract_number = f"{doc.user_id}.{doc.id}.{user_contract_seq}"
         doc.contract_number = self.cipher.encrypt(contract_number)
 
     def _generate_amount_text(self, amount: str | int | float | None) -> str | None:
@@ -763,6 +806,9 @@ class AdminHandler:
         except (InvalidOperation, ValueError):
             return None
 
+        # num2words loads all its language modules on import; pay for it on first use.
+        from num2words import num2words
+
         return num2words(numeric_value, lang="ru")
 
     def _recalculate_contract_amount(
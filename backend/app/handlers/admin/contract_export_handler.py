@@ -0,0 +1,54 @@
+from fastapi import Depends, HTTPException, status
+from sqlalchemy.orm import Session
+
+from modules.connection_to_db.database import get_session
+from modules.models.user import User
+from modules.schemas.contract_export_schemas import (
+    ContractExportCreateRequest,
+    ContractExportJobRead,
+    ContractExportState,
+)
+from modules.utils.admin_utils import get_current_admin
+from modules.utils.contract_export import (
+    get_contract_export_archive_path,
+    get_contract_export_job,
+    start_contract_export,
+)
+
+
+class ContractExportHandler:
+    def __init__(
+        self,
+        db: Session = Depends(get_session),
+        admin: User = Depends(get_current_admin),
+    ):
+        self.db = db
+        self.admin = admin
+
+    def create_export(self, body: ContractExportCreateRequest) -> ContractExportJobRead:
+        return start_contract_export(body, requested_by=self.admin.id)
+
+    def get_export(self, job_id: str) -> ContractExportJobRead:
+        job = get_contract_export_job(job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Задание экспорта не найдено",
+            )
+        return job
+
+    def get_export_archive(self, job_id: str) -> tuple[ContractExportJobRead, str]:
+        job = self.get_export(job_id)
+        if job.state != ContractExportState.completed:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Архив еще не готов",
+            )
+
+        archive_path = get_contract_export_archive_path(job.id)
+        if not archive_path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Файл архива не найден",
+            )
+        return job, str(archive_path)
@@ -1,9 +1,13 @@
 from datetime import date
+from typing import Any
 
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import case, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
 
-from modules.connection_to_db.database import get_session
+from modules.connection_to_db.database import get_read_session, get_session
 from modules.models.inventory import Battery, Bike, BikePricing, Location
 from modules.models.user_document import UserDocument
 from modules.models.user import User
@@ -12,6 +16,7 @@ from modules.schemas.inventory_schemas import (
     AssetStatus,
     BatteryCreate,
     BatteryRead,
+    BatterySearchItem,
     BatteryStatusUpdate,
     BatteryUpdate,
     BikeCreate,
@@ -19,13 +24,20 @@ from modules.schemas.inventory_schemas import (
     BikePricingRead,
     BikePricingUpdate,
     BikeRead,
+    BikeSearchItem,
     BikeStatusUpdate,
     BikeUpdate,
+    InventoryAvailabilityResult,
+    InventoryImportResult,
+    InventoryImportRowError,
+    InventorySearchKind,
+    InventorySearchResult,
     LocationCreate,
     LocationRead,
     LocationUpdate,
 )
 from modules.utils.admin_utils import get_current_admin
+from modules.utils.availability import BATTERY, BIKE, availability_index
 from modules.utils.document_security import (
     decrypt_document_fields,
     decrypt_user_fields,
@@ -43,6 +55,15 @@ class InventoryHandler:
         self.admin = admin
         self.cipher = get_sensitive_data_cipher()
 
+    @classmethod
+    def read_only(
+        cls,
+        db: Session = Depends(get_read_session),
+        admin: User = Depends(get_current_admin),
+    ) -> "InventoryHandler":
+        """Handler bound to the read session, for endpoints that never write."""
+        return cls(db=db, admin=admin)
+
     def list_locations(self) -> list[Location]:
         return self.db.query(Location).order_by(Location.id.asc()).all()
 
@@ -72,21 +93,36 @@ class InventoryHandler:
         self.db.delete(location)
         self.db.commit()
 
-    def list_bikes(self, status_filter: AssetStatus | None = None) -> list[BikeRead]:
-        query = self.db.query(Bike)
+    def list_bikes(
+        self,
+        status_filter: AssetStatus | None = None,
+        location_id: int | None = None,
+        type_id: int | None = None,
+        service_from: date | None = None,
+        service_to: date | None = None,
+        limit: int = 100,
+        after_id: int | None = None,
+    ) -> tuple[list[BikeRead], int | None]:
+        query = self.db.query(Bike).options(selectinload(Bike.location))
         if status_filter:
             query = query.filter(Bike.status == status_filter.value)
-        bikes = query.order_by(Bike.id.asc()).all()
-        bike_contracts, _ = self._get_active_contract_maps()
+        if location_id is not None:
+            query = query.filter(Bike.location_id == location_id)
+        if type_id is not None:
+            query = query.filter(Bike.type_id == type_id)
+        if service_from is not None:
+            query = query.filter(Bike.next_service_date >= service_from)
+        if service_to is not None:
+            query = query.filter(Bike.next_service_date <= service_to)
 
-        return [self._to_bike_read(bike, bike_contracts.get(bike.vin)) for bike in bikes]
+        bikes, next_cursor = self._fetch_page(query, Bike.id, limit, after_id)
+        return self._to_bike_reads(bikes), next_cursor
 
     def get_bike(self, bike_id: int) -> BikeRead:
         bike = self.db.query(Bike).filter(Bike.id == bike_id).first()
         if not bike:
             raise HTTPException(status_code=404, detail="Велосипед не найден")
-        bike_contracts, _ = self._get_active_contract_maps()
-        return self._to_bike_read(bike, bike_contracts.get(bike.vin))
+        return self._to_bike_reads([bike])[0]
 
     def create_bike(self, body: BikeCreate) -> BikeRead:
         self._ensure_location_exists(body.location_id)
@@ -120,8 +156,7 @@ class InventoryHandler:
 
         self.db.commit()
         self.db.refresh(bike)
-        bike_contracts, _ = self._get_active_contract_maps()
-        return self._to_bike_read(bike, bike_contracts.get(bike.vin))
+        return self._to_bike_reads([bike])[0]
 
     def update_bike_status(self, bike_id: int, body: BikeStatusUpdate) -> BikeRead:
         bike = self.db.query(Bike).filter(Bike.id == bike_id).first()
@@ -131,8 +166,7 @@ class InventoryHandler:
         bike.status = body.status.value
         self.db.commit()
         self.db.refresh(bike)
-        bike_contracts, _ = self._get_active_contract_maps()
-        return self._to_bike_read(bike, bike_contracts.get(bike.vin))
+        return self._to_bike_reads([bike])[0]
 
     def delete_bike(self, bike_id: int) -> None:
         bike = self.db.query(Bike).filter(Bike.id == bike_id).first()
@@ -141,23 +175,36 @@ class InventoryHandler:
         self.db.delete(bike)
         self.db.commit()
 
-    def list_batteries(self, status_filter: AssetStatus | None = None) -> list[BatteryRead]:
-        query = self.db.query(Battery)
+    def import_bikes(self, rows: list[Any]) -> InventoryImportResult:
+        return self._import_assets(
+            rows,
+            model=Bike,
+            schema=BikeCreate,
+            unique_fields=("number", "vin"),
+            label="Велосипед",
+        )
+
+    def list_batteries(
+        self,
+        status_filter: AssetStatus | None = None,
+        location_id: int | None = None,
+        limit: int = 100,
+        after_id: int | None = None,
+    ) -> tuple[list[BatteryRead], int | None]:
+        query = self.db.query(Battery).options(selectinload(Battery.location))
         if status_filter:
             query = query.filter(Battery.status == status_filter.value)
-        batteries = query.order_by(Battery.id.asc()).all()
-        _, battery_contracts = self._get_active_contract_maps()
-        return [
-            self._to_battery_read(battery, battery_contracts.get(battery.number))
-            for battery in batteries
-        ]
+        if location_id is not None:
+            query = query.filter(Battery.location_id == location_id)
+
+        batteries, next_cursor = self._fetch_page(query, Battery.id, limit, after_id)
+        return self._to_battery_reads(batteries), next_cursor
 
     def get_battery(self, battery_id: int) -> BatteryRead:
         battery = self.db.query(Battery).filter(Battery.id == battery_id).first()
         if not battery:
             raise HTTPException(status_code=404, detail="АКБ не найден")
-        _, battery_contracts = self._get_active_contract_maps()
-        return self._to_battery_read(battery, battery_contracts.get(battery.number))
+        return self._to_battery_reads([battery])[0]
 
     def create_battery(self, body: BatteryCreate) -> BatteryRead:
         self._ensure_location_exists(body.location_id)
@@ -190,8 +237,7 @@ class InventoryHandler:
 
         self.db.commit()
         self.db.refresh(battery)
-        _, battery_contracts = self._get_active_contract_maps()
-        return self._to_battery_read(battery, battery_contracts.get(battery.number))
+        return self._to_battery_reads([battery])[0]
 
     def update_battery_status(
         self, battery_id: int, body: BatteryStatusUpdate
@@ -203,8 +249,7 @@ class InventoryHandler:
         battery.status = body.status.value
         self.db.commit()
         self.db.refresh(battery)
-        _, battery_contracts = self._get_active_contract_maps()
-        return self._to_battery_read(battery, battery_contracts.get(battery.number))
+        return self._to_battery_reads([battery])[0]
 
     def delete_battery(self, battery_id: int) -> None:
         battery = self.db.query(Battery).filter(Battery.id == battery_id).first()
@@ -213,6 +258,111 @@ class InventoryHandler:
         self.db.delete(battery)
         self.db.commit()
 
+    def import_batteries(self, rows: list[Any]) -> InventoryImportResult:
+        return self._import_assets(
+            rows,
+            model=Battery,
+            schema=BatteryCreate,
+            unique_fields=("number",),
+            label="АКБ",
+        )
+
+    def search_inventory(
+        self,
+        q: str,
+        kind: InventorySearchKind = InventorySearchKind.ALL,
+        status_filter: AssetStatus | None = None,
+        limit: int = 20,
+    ) -> InventorySearchResult:
+        term = q.strip()
+        if not term:
+            return InventorySearchResult()
+
+        escaped = self._escape_like(term)
+        prefix = f"{escaped}%"
+        substring = f"%{escaped}%"
+        result = InventorySearchResult()
+
+        if kind in (InventorySearchKind.ALL, InventorySearchKind.BIKE):
+            query = self.db.query(Bike).filter(
+                or_(
+                    Bike.number.ilike(substring, escape="\\"),
+                    Bike.vin.ilike(substring, escape="\\"),
+                    Bike.name.ilike(substring, escape="\\"),
+                )
+            )
+            if status_filter:
+                query = query.filter(Bike.status == status_filter.value)
+            # Prefix hits on number/VIN first: that is what operators usually type.
+            rank = case(
+                (Bike.number.ilike(prefix, escape="\\"), 0),
+                (Bike.vin.ilike(prefix, escape="\\"), 1),
+                else_=2,
+            )
+            bikes = query.order_by(rank, Bike.number.asc()).limit(limit).all()
+            result.bikes = [BikeSearchItem.model_validate(bike) for bike in bikes]
+
+        if kind in (InventorySearchKind.ALL, InventorySearchKind.BATTERY):
+            query = self.db.query(Battery).filter(
+                Battery.number.ilike(substring, escape="\\")
+            )
+            if status_filter:
+                query = query.filter(Battery.status == status_filter.value)
+            rank = case((Battery.number.ilike(prefix, escape="\\"), 0), else_=1)
+            batteries = query.order_by(rank, Battery.number.asc()).limit(limit).all()
+            result.batteries = [
+                BatterySearchItem.model_validate(battery) for battery in batteries
+            ]
+
+        return result
+
+    def get_availability(
+        self,
+        start: date,
+        end: date,
+        kind: InventorySearchKind = InventorySearchKind.ALL,
+        location_id: int | None = None,
+        type_id: int | None = None,
+        limit: int = 100,
+    ) -> InventoryAvailabilityResult:
+        if start > end:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Начало периода не может быть позже его окончания",
+            )
+
+        availability_index.ensure_fresh(self.db)
+        unavailable = (AssetStatus.REPAIR.value, AssetStatus.DECOMMISSIONED.value)
+        result = InventoryAvailabilityResult(start=start, end=end)
+
+        if kind in (InventorySearchKind.ALL, InventorySearchKind.BIKE):
+            query = self.db.query(Bike).filter(Bike.status.not_in(unavailable))
+            if location_id is not None:
+                query = query.filter(Bike.location_id == location_id)
+            if type_id is not None:
+                query = query.filter(Bike.type_id == type_id)
+            for bike in query.order_by(Bike.id.asc()).yield_per(500):
+                if availability_index.is_free(BIKE, (bike.number, bike.vin), start, end):
+                    result.bikes.append(BikeSearchItem.model_validate(bike))
+                    if len(result.bikes) >= limit:
+                        break
+
+        if kind in (InventorySearchKind.ALL, InventorySearchKind.BATTERY):
+            query = self.db.query(Battery).filter(Battery.status.not_in(unavailable))
+            if location_id is not None:
+                query = query.filter(Battery.location_id == location_id)
+            for battery in query.order_by(Battery.id.asc()).yield_per(500):
+                if availability_index.is_free(BATTERY, (battery.number,), start, end):
+                    result.batteries.append(BatterySearchItem.model_validate(battery))
+                    if len(result.batteries) >= limit:
+                        break
+
+        return result
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
     def list_bike_pricing(self, type_id: int | None = None) -> list[BikePricing]:
         query = self.db.query(BikePricing)
         if type_id is not None:
@@ -269,6 +419,93 @@ class InventoryHandler:
         self.db.delete(pricing)
         self.db.commit()
 
+    def _import_assets(
+        self,
+        rows: list[Any],
+        model: type[Bike] | type[Battery],
+        schema: type[BaseModel],
+        unique_fields: tuple[str, ...],
+        label: str,
+    ) -> InventoryImportResult:
+        row_errors: dict[int, list[str]] = {}
+        valid: dict[int, dict[str, Any]] = {}
+
+        for row_no, raw in enumerate(rows, start=1):
+            try:
+                item = schema.model_validate(raw)
+            except ValidationError as exc:
+                row_errors[row_no] = [
+                    f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}"
+                    for err in exc.errors()
+                ]
+                continue
+            payload = item.model_dump()
+            payload["status"] = item.status.value
+            valid[row_no] = payload
+
+        # Duplicates inside the file itself: the first occurrence wins.
+        seen: dict[str, dict[str, int]] = {field: {} for field in unique_fields}
+        for row_no, payload in valid.items():
+            for field in unique_fields:
+                first_row = seen[field].setdefault(payload[field], row_no)
+                if first_row != row_no:
+                    row_errors.setdefault(row_no, []).append(
+                        f"{field}: значение уже встречается в строке {first_row}"
+                    )
+
+        # One IN query per check instead of a round trip per row.
+        columns = [getattr(model, field) for field in unique_fields]
+        existing_rows = (
+            self.db.execute(
+                select(*columns).where(
+                    or_(*(column.in_(seen[column.key]) for column in columns))
+                )
+            ).all()
+            if valid
+            else []
+        )
+        existing = {
+            field: {row[idx] for row in existing_rows}
+            for idx, field in enumerate(unique_fields)
+        }
+
+        location_ids = {p["location_id"] for p in valid.values() if p["location_id"] is not None}
+        known_locations = (
+            set(self.db.scalars(select(Location.id).where(Location.id.in_(location_ids))))
+            if location_ids
+            else set()
+        )
+
+        for row_no, payload in valid.items():
+            for field in unique_fields:
+                if payload[field] in existing[field]:
+                    row_errors.setdefault(row_no, []).append(
+                        f"{label} с таким {field} уже существует"
+                    )
+            if payload["location_id"] is not None and payload["location_id"] not in known_locations:
+                row_errors.setdefault(row_no, []).append("Указанная локация не существует")
+
+        to_insert = [payload for row_no, payload in valid.items() if row_no not in row_errors]
+        if to_insert:
+            try:
+                # executemany is batched into multi-row INSERT ... VALUES statements.
+                self.db.execute(insert(model), to_insert)
+                self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Данные изменились во время импорта, повторите загрузку",
+                )
+
+        return InventoryImportResult(
+            created=len(to_insert),
+            errors=[
+                InventoryImportRowError(row=row_no, errors=messages)
+                for row_no, messages in sorted(row_errors.items())
+            ],
+        )
+
     def _ensure_pricing_weeks_range(self, min_weeks_count: int, max_weeks_count: int) -> None:
         if min_weeks_count <= 0 or max_weeks_count <= 0:
             raise HTTPException(
@@ -354,14 +591,32 @@ class InventoryHandler:
                 detail="Указанная локация не существует",
             )
 
-    def _get_active_contract_maps(
-        self,
-    ) -> tuple[dict[str, ActiveContractInfo], dict[str, ActiveContractInfo]]:
+    @staticmethod
+    def _fetch_page(query, id_column, limit: int, after_id: int | None):
+        # Keyset pagination: "id > cursor" stays an index range scan at any depth.
+        if after_id is not None:
+            query = query.filter(id_column > after_id)
+        items = query.order_by(id_column.asc()).limit(limit + 1).all()
+        if len(items) > limit:
+            items = items[:limit]
+            return items, items[-1].id
+        return items, None
+
+    def _get_active_contracts_by_hash(
+        self, hash_columns: list, serials: set[str]
+    ) -> dict[str, ActiveContractInfo]:
+        """Active contracts keyed by serial blind index, for the given serials only."""
+        hashes = {self.cipher.blind_index(serial) for serial in serials}
+        hashes.discard(None)
+        if not hashes:
+            return {}
+
         today = date.today()
         docs = (
             self.db.query(UserDocument)
             .join(User)
             .filter(
+                or_(*(column.in_(hashes) for column in hash_columns)),
                 UserDocument.filled_date.is_not(None),
                 UserDocument.end_date.is_not(None),
                 UserDocument.filled_date <= today,
@@ -371,30 +626,46 @@ class InventoryHandler:
             .all()
         )
 
-        bike_contracts: dict[str, ActiveContractInfo] = {}
-        battery_contracts: dict[str, ActiveContractInfo] = {}
-
+        contracts: dict[str, ActiveContractInfo] = {}
         for doc in docs:
             decrypted_doc = decrypt_document_fields(doc, self.cipher)
             decrypted_user = decrypt_user_fields(doc.user, self.cipher)
-
             contract_info = ActiveContractInfo(
                 contract_number=decrypted_doc.get("contract_number"),
                 user_full_name=decrypted_user.get("full_name") or doc.user.email,
                 rental_start=doc.filled_date,
                 rental_end=doc.end_date,
             )
+            for column in hash_columns:
+                value = getattr(doc, column.key)
+                if value in hashes and value not in contracts:
+                    contracts[value] = contract_info
+        return contracts
+
+    def _to_bike_reads(self, bikes: list[Bike]) -> list[BikeRead]:
+        # A contract may reference a bike either by its number or by its VIN.
+        contracts = self._get_active_contracts_by_hash(
+            [UserDocument.bike_serial_hash],
+            {bike.vin for bike in bikes} | {bike.number for bike in bikes},
+        )
+        return [
+            self._to_bike_read(
+                bike,
+                contracts.get(self.cipher.blind_index(bike.vin))
+                or contracts.get(self.cipher.blind_index(bike.number)),
+            )
+            for bike in bikes
+        ]
 
-            bike_serial = decrypted_doc.get("bike_serial")
-            if bike_serial and bike_serial not in bike_contracts:
-                bike_contracts[bike_serial] = contract_info
-
-            for field in ("akb1_serial", "akb2_serial", "akb3_serial"):
-                akb_serial = decrypted_doc.get(field)
-                if akb_serial and akb_serial not in battery_contracts:
-                    battery_contracts[akb_serial] = contract_info
-
-        return bike_contracts, battery_contracts
+    def _to_battery_reads(self, batteries: list[Battery]) -> list[BatteryRead]:
+        contracts = self._get_active_contracts_by_hash(
+            [UserDocument.akb1_serial_hash, UserDocument.akb2_serial_hash],
+            {battery.number for battery in batteries},
+        )
+        return [
+            self._to_battery_read(battery, contracts.get(self.cipher.blind_index(battery.number)))
+            for battery in batteries
+        ]
 
     def _to_bike_read(self, bike: Bike, contract: ActiveContractInfo | None) -> BikeRead:
         return BikeRead(
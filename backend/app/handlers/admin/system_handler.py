@@ -0,0 +1,76 @@
+from fastapi import Depends, HTTPException, status
+
+from modules.connection_to_db.database import engine, replica_engine, replica_router
+from modules.connection_to_db.pool_metrics import pool_snapshot
+from modules.models.user import User
+from modules.schemas.system_schemas import (
+    CircuitBreakerRead,
+    DatabaseMetricsRead,
+    PoolMetricsRead,
+    ProfileRead,
+    ReplicaStatusRead,
+    SystemMetricsRead,
+)
+from modules.utils.admin_utils import get_current_admin
+from modules.utils.config import settings
+from modules.utils.rate_limit import PROFILE_DOWNLOAD_PER_ADMIN, enforce_rate_limit
+from modules.utils.request_profiler import (
+    get_profile,
+    get_profile_path,
+    list_profiles,
+    render_profile_text,
+)
+from modules.utils.yookassa_client import yookassa_breaker
+
+
+class SystemHandler:
+    def __init__(self, admin: User = Depends(get_current_admin)):
+        self.admin = admin
+
+    def get_metrics(self) -> SystemMetricsRead:
+        """Counters of this worker process; with several workers each reports its own."""
+        return SystemMetricsRead(
+            database=self._database_metrics(),
+            yookassa=CircuitBreakerRead(**yookassa_breaker.snapshot()),
+        )
+
+    def _database_metrics(self) -> DatabaseMetricsRead:
+        replica = None
+        if replica_engine is not None:
+            replica = PoolMetricsRead(**pool_snapshot(replica_engine.pool))
+        return DatabaseMetricsRead(
+            liveness=settings.DB_POOL_LIVENESS,
+            recycle_seconds=settings.DB_POOL_RECYCLE_SECONDS,
+            primary=PoolMetricsRead(**pool_snapshot(engine.pool)),
+            replica=replica,
+            replica_status=ReplicaStatusRead(**replica_router.status()),
+        )
+
+    def list_profiles(self, limit: int) -> list[ProfileRead]:
+        return list_profiles(limit)
+
+    def get_profile_file(self, profile_id: str) -> tuple[ProfileRead, str]:
+        enforce_rate_limit(PROFILE_DOWNLOAD_PER_ADMIN, f"admin:{self.admin.id}")
+        profile = get_profile(profile_id)
+        if not profile:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Профиль не найден",
+            )
+        if profile.error:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=profile.error,
+            )
+
+        path = get_profile_path(profile.id)
+        if not path.exists():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Файл профиля не найден",
+            )
+        return profile, str(path)
+
+    def get_profile_text(self, profile_id: str) -> str:
+        profile, _ = self.get_profile_file(profile_id)
+        return render_profile_text(profile.id)
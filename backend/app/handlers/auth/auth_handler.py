@@ -2,7 +2,7 @@ import re
 import secrets
 from datetime import datetime, timedelta, timezone
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
 from jose import JWTError
 from sqlalchemy import select, update
@@ -34,11 +34,20 @@ from modules.utils.jwt_utils import (
     decode_token,
 )
 from modules.utils.password_utils import hash_password, verify_password
+from modules.utils.rate_limit import (
+    CODE_CONFIRM_PER_EMAIL,
+    CODE_CONFIRM_PER_IP,
+    CODE_REQUEST_PER_EMAIL,
+    CODE_REQUEST_PER_IP,
+    LOGIN_PER_EMAIL,
+    LOGIN_PER_IP,
+    RateLimitRule,
+    enforce_rate_limit,
+    get_client_ip,
+)
 
 
 class AuthHandler:
-    MAX_FAILED_LOGIN_ATTEMPTS = 3
-    LOCKOUT_PERIOD = timedelta(seconds=20)
     PASSWORD_RESET_LOCKOUT = timedelta(
         seconds=settings.PASSWORD_RESET_LOCKOUT_SECONDS
     )
@@ -54,9 +63,21 @@ class AuthHandler:
         r"^(?=.*[A-Za-z])(?=.*\d)(?=.*[!\"№@#$%^&*()_+\-=\[\]{};':\\|,.<>/?`~:])[A-Za-z\d!\"№@#$%^&*()_+\-=\[\]{};':\\|,.<>/?`~:]{9,}$"
     )
 
-    def __init__(self, session: Session = Depends(get_session)):
+    def __init__(
+        self,
+        request: Request,
+        session: Session = Depends(get_session),
+    ):
+        self.request = request
         self.session = session
 
+    def _enforce_rate_limits(
+        self, ip_rule: RateLimitRule, email_rule: RateLimitRule, email: str
+    ) -> None:
+        # Runs before any query or bcrypt call, so bursts never reach the database.
+        enforce_rate_limit(ip_rule, get_client_ip(self.request))
+        enforce_rate_limit(email_rule, email)
+
     def _get_user_by_email(self, email: str) -> User | None:
         stmt = select(User).where(User.email == email)
         result = self.session.execute(stmt)
@@ -68,6 +89,7 @@ class AuthHandler:
     async def request_registration_code(
         self, data: RegistrationCodeRequest
     ) -> dict[str, str]:
+        self._enforce_rate_limits(CODE_REQUEST_PER_IP, CODE_REQUEST_PER_EMAIL, data.email)
         if self._get_user_by_email(data.email):
             self._err("Пользователь с такой почтой уже зарегистрирован")
 
@@ -82,6 +104,7 @@ class AuthHandler:
         return {"detail": "Письмо с кодом подтверждения отправлено"}
 
     async def register(self, data: UserCreate) -> UserRead:
+        self._enforce_rate_limits(CODE_CONFIRM_PER_IP, CODE_CONFIRM_PER_EMAIL, data.email)
         exists = self._get_user_by_email(data.email)
         if exists:
             self._err("User already exists")
@@ -115,21 +138,15 @@ class AuthHandler:
         return UserRead.model_validate(user)
 
     async def login(self, form: OAuth2PasswordRequestForm) -> Token:
+        self._enforce_rate_limits(LOGIN_PER_IP, LOGIN_PER_EMAIL, form.username)
         user = self._get_user_by_email(form.username)
 
-        if user:
-            self._ensure_not_locked(user)
-
         if not user or not verify_password(form.password, user.hashed_password):
-            if user:
-                self._register_failed_login(user)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid email or password",
             )
 
-        self._reset_failed_attempts(user)
-
         return self._build_token_pair(user.id)
 
     async def refresh(self, refresh_token: str) -> Token:
@@ -190,6 +207,7 @@ class AuthHandler:
     async def request_password_reset(
         self, data: PasswordResetRequestSchema
     ) -> dict[str, str]:
+        self._enforce_rate_limits(CODE_REQUEST_PER_IP, CODE_REQUEST_PER_EMAIL, data.email)
         user = self._get_user_by_email(data.email)
 
         if not user:
@@ -206,6 +224,7 @@ class AuthHandler:
         return {"detail": "Письмо с кодом подтверждения отправлено"}
 
     async def reset_password(self, data: PasswordResetConfirm) -> dict[str, str]:
+        self._enforce_rate_limits(CODE_CONFIRM_PER_IP, CODE_CONFIRM_PER_EMAIL, data.email)
         user = self._get_user_by_email(data.email)
         if not user:
             self._err("Пользователь не найден", status.HTTP_404_NOT_FOUND)
@@ -310,7 +329,10 @@ class AuthHandler:
     ) -> None:
         now = datetime.now(timezone.utc)
 
-        if verification.expires_at <= now:
+        expires_at = verification.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at <= now:
             verification.is_used = True
             self.session.commit()
             self._err("Срок действия кода истёк")
@@ -327,9 +349,9 @@ class AuthHandler:
                     status.HTTP_429_TOO_MANY_REQUESTS,
                 )
 
+            # Persisted together with the outcome of this attempt.
             verification.attempts = 0
             verification.locked_until = None
-            self.session.commit()
 
     def _register_failed_registration_attempt(
         self, verification: EmailVerificationRequest
@@ -344,40 +366,6 @@ class AuthHandler:
 
         self.session.commit()
 
-    def _ensure_not_locked(self, user: User) -> None:
-        if (
-            user.failed_login_attempts < self.MAX_FAILED_LOGIN_ATTEMPTS
-            or not user.last_failed_login_at
-        ):
-            return
-
-        last_failed = user.last_failed_login_at
-        if last_failed.tzinfo is None:
-            last_failed = last_failed.replace(tzinfo=timezone.utc)
-
-        now = datetime.now(timezone.utc)
-        elapsed = now - last_failed
-        if elapsed < self.LOCKOUT_PERIOD:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Слишком много неуспешных попыток. Попробуйте позже.",
-            )
-
-        self._reset_failed_attempts(user)
-
-    def _register_failed_login(self, user: User) -> None:
-        user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
-        user.last_failed_login_at = datetime.now(timezone.utc)
-        self.session.commit()
-
-    def _reset_failed_attempts(self, user: User) -> None:
-        if user.failed_login_attempts == 0 and user.last_failed_login_at is None:
-            return
-
-        user.failed_login_attempts = 0
-        user.last_failed_login_at = None
-        self.session.commit()
-
     def _ensure_password_reset_resend_allowed(self, user_id: int) -> None:
         now = datetime.now(timezone.utc)
         stmt = (
@@ -448,7 +436,10 @@ class AuthHandler:
     ) -> None:
         now = datetime.now(timezone.utc)
 
-        if reset_request.expires_at <= now:
+        expires_at = reset_request.expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at <= now:
             reset_request.is_used = True
             self.session.commit()
             self._err("Срок действия кода истёк")
@@ -465,9 +456,9 @@ class AuthHandler:
                     status.HTTP_429_TOO_MANY_REQUESTS,
                 )
 
+            # Persisted together with the outcome of this attempt.
             reset_request.attempts = 0
             reset_request.locked_until = None
-            self.session.commit()
 
     def _register_failed_reset_attempt(
         self, reset_request: PasswordResetRequest
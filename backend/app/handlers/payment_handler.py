@@ -1,12 +1,15 @@
 import json
 from decimal import Decimal
 from datetime import date
+from typing import Callable
 
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from modules.connection_to_db.database import get_session
+from modules.connection_to_db.database import get_read_session, get_session
 from modules.models.payment import ContractPayment, Order, Payment
+from modules.models.payment_idempotency_key import PaymentIdempotencyKey
 from modules.models.user import User
 from modules.schemas.payment_schemas import (
     AutopayChargeRequest,
@@ -18,6 +21,15 @@ from modules.schemas.payment_schemas import (
     RecalcRequest,
 )
 from modules.utils.config import settings
+from modules.utils.payment_idempotency import (
+    COMPLETED,
+    claim_idempotency_key,
+    client_key,
+    complete_idempotency_key,
+    fail_idempotency_key,
+    request_hash,
+    schedule_key,
+)
 from modules.utils.yookassa_client import YooKassaClient
 
 
@@ -25,7 +37,21 @@ class PaymentHandler:
     def __init__(self, session: Session = Depends(get_session)):
         self.session = session
 
-    async def create_payment(self, data: CreatePaymentRequest, current_user: User) -> CreatePaymentResponse:
+    @classmethod
+    def read_only(cls, session: Session = Depends(get_read_session)) -> "PaymentHandler":
+        """Handler bound to the read session, for endpoints that never write."""
+        return cls(session=session)
+
+    async def create_payment(
+        self, data: CreatePaymentRequest, current_user: User, idempotency_key: str | None = None
+    ) -> CreatePaymentResponse:
+        return await run_in_threadpool(
+            self._run_idempotent, "payment", data, current_user, idempotency_key, self._create_payment
+        )
+
+    def _create_payment(
+        self, data: CreatePaymentRequest, current_user: User, reservation: PaymentIdempotencyKey | None
+    ) -> CreatePaymentResponse:
         schedule_item = self._get_schedule_item_for_user(data.schedule_payment_id, current_user.id)
         amount = schedule_item.amount if schedule_item else data.amount
         if amount is None:
@@ -56,7 +82,7 @@ class PaymentHandler:
             "receipt": receipt,
         }
 
-        result = YooKassaClient().create_payment(payload)
+        result = YooKassaClient().create_payment(payload, idempotence_key=reservation.provider_key if reservation else None)
         payment = self._store_payment(order, current_user, amount, data.currency, result, data.save_payment_method, is_autopay=False)
         self.session.flush()
 
@@ -69,16 +95,7 @@ class PaymentHandler:
             schedule_item.status = "processing"
 
         self._sync_order_status(order, payment.status)
-        self.session.commit()
-        self.session.refresh(payment)
-
-        return CreatePaymentResponse(
-            order_id=order.id,
-            payment_id=payment.id,
-            yookassa_payment_id=payment.yookassa_payment_id,
-            status=payment.status,
-            confirmation_url=payment.confirmation_url,
-        )
+        return self._commit_payment_response(order, payment, reservation)
 
     async def webhook(self, payload: dict, authorization: str | None = None) -> dict:
         # YooKassa webhooks are authenticated by source and HTTPS endpoint.
@@ -95,8 +112,18 @@ class PaymentHandler:
         if not payment:
             return {"detail": "Payment not found, ignored"}
 
+        await run_in_threadpool(self.apply_payment_object, payment, payment_object, payload)
+        return {"detail": "ok"}
+
+    def apply_payment_object(self, payment: Payment, payment_object: dict, raw_payload: dict) -> None:
+        """Bring ``payment``, its order and schedule item to the state YooKassa reports.
+
+        Shared by the webhook and the reconciliation job, so a lost
+        notification converges to the same result. Once a payment succeeds,
+        the next due schedule item is charged by autopay.
+        """
         payment.status = payment_object.get("status", payment.status)
-        payment.raw_payload = json.dumps(payload, ensure_ascii=False)
+        payment.raw_payload = json.dumps(raw_payload, ensure_ascii=False)
 
         payment_method = payment_object.get("payment_method", {})
         if payment_method.get("id"):
@@ -116,9 +143,7 @@ class PaymentHandler:
         self.session.commit()
 
         if payment.status == "succeeded":
-            await self._charge_next_schedule_payment(payment.user_id)
-        
-        return {"detail": "ok"}
+            self._charge_next_schedule_payment(payment.user_id)
 
     async def enable_autopay(self, data: AutopayEnableRequest, current_user: User) -> dict:
         payment_method_id = data.payment_method_id or current_user.autopay_payment_method_id
@@ -151,7 +176,16 @@ class PaymentHandler:
         self.session.commit()
         return {"detail": "autopay disabled"}
 
-    async def charge_autopay(self, data: AutopayChargeRequest, current_user: User) -> CreatePaymentResponse:
+    async def charge_autopay(
+        self, data: AutopayChargeRequest, current_user: User, idempotency_key: str | None = None
+    ) -> CreatePaymentResponse:
+        return await run_in_threadpool(
+            self._run_idempotent, "autopay", data, current_user, idempotency_key, self._charge_autopay
+        )
+
+    def _charge_autopay(
+        self, data: AutopayChargeRequest, current_user: User, reservation: PaymentIdempotencyKey | None
+    ) -> CreatePaymentResponse:
         if not current_user.autopay_enabled or not current_user.autopay_payment_method_id:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Autopay is not enabled")
 
@@ -180,7 +214,7 @@ class PaymentHandler:
             "receipt": receipt,
         }
 
-        result = YooKassaClient().create_payment(payload)
+        result = YooKassaClient().create_payment(payload, idempotence_key=reservation.provider_key if reservation else None)
         payment = self._store_payment(order, current_user, amount, data.currency, result, True, is_autopay=True)
         self.session.flush()
 
@@ -190,16 +224,7 @@ class PaymentHandler:
             schedule_item.status = "processing"
 
         self._sync_order_status(order, payment.status)
-        self.session.commit()
-        self.session.refresh(payment)
-
-        return CreatePaymentResponse(
-            order_id=order.id,
-            payment_id=payment.id,
-            yookassa_payment_id=payment.yookassa_payment_id,
-            status=payment.status,
-            confirmation_url=payment.confirmation_url,
-        )
+        return self._commit_payment_response(order, payment, reservation)
 
     async def recalc(self, order_id: int, data: RecalcRequest, current_user: User) -> dict:
         order = self._get_order_for_user(order_id, current_user.id)
@@ -255,6 +280,56 @@ class PaymentHandler:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Schedule payment not found")
         return ContractPaymentRead.model_validate(item)
 
+    def _run_idempotent(
+        self,
+        scope: str,
+        data: CreatePaymentRequest | AutopayChargeRequest,
+        user: User,
+        idempotency_key: str | None,
+        create: Callable[..., CreatePaymentResponse],
+    ) -> CreatePaymentResponse:
+        """Create the payment once per idempotency key; repeats get the stored response.
+
+        Without an ``Idempotency-Key`` header the key is derived from the
+        schedule item; requests for neither run unguarded, as before. Called
+        in the threadpool: the YooKassa call blocks for up to its timeout and
+        may wait for a bulkhead slot.
+        """
+        if idempotency_key:
+            key, derived = client_key(scope, idempotency_key), False
+        elif data.schedule_payment_id is not None:
+            key, derived = schedule_key(data.schedule_payment_id), True
+        else:
+            return create(data, user, None)
+
+        reservation = claim_idempotency_key(self.session, user.id, key, request_hash(scope, data), derived=derived)
+        if reservation.status == COMPLETED:
+            response = CreatePaymentResponse.model_validate_json(reservation.response)
+            if reservation.payment is not None:
+                response.status = reservation.payment.status
+            return response
+
+        try:
+            return create(data, user, reservation)
+        except Exception:
+            fail_idempotency_key(self.session, reservation)
+            raise
+
+    def _commit_payment_response(
+        self, order: Order, payment: Payment, reservation: PaymentIdempotencyKey | None
+    ) -> CreatePaymentResponse:
+        response = CreatePaymentResponse(
+            order_id=order.id,
+            payment_id=payment.id,
+            yookassa_payment_id=payment.yookassa_payment_id,
+            status=payment.status,
+            confirmation_url=payment.confirmation_url,
+        )
+        if reservation is not None:
+            complete_idempotency_key(reservation, payment.id, response)
+        self.session.commit()
+        return response
+
     def _get_order_for_user(self, order_id: int, user_id: int) -> Order:
         order = self.session.query(Order).filter(Order.id == order_id, Order.user_id == user_id).first()
         if not order:
@@ -342,7 +417,7 @@ class PaymentHandler:
         elif payment.status == "canceled":
             schedule_item.status = "failed"
 
-    async def _charge_next_schedule_payment(self, user_id: int) -> None:
+    def _charge_next_schedule_payment(self, user_id: int) -> None:
         user = self.session.query(User).filter(User.id == user_id).first()
         if not user or not user.autopay_enabled or not user.autopay_payment_method_id:
             return
@@ -360,7 +435,8 @@ class PaymentHandler:
         if not next_item:
             return
 
-        await self.charge_autopay(
+        self._run_idempotent(
+            "autopay",
             AutopayChargeRequest(
                 schedule_payment_id=next_item.id,
                 amount=next_item.amount,
@@ -368,6 +444,8 @@ class PaymentHandler:
                 description=f"Автосписание по графику #{next_item.payment_number}",
             ),
             user,
+            None,
+            self._charge_autopay,
         )
 
     def _sync_order_status(self, order: Order, payment_status: str) -> None:
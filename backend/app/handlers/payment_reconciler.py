@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.handlers.payment_handler import PaymentHandler
+from modules.connection_to_db.database import SessionLocal
+from modules.models.payment import Payment
+from modules.utils.config import settings
+from modules.utils.yookassa_client import YooKassaClient
+
+logger = logging.getLogger(__name__)
+
+_PENDING_STATUSES = ("pending", "waiting_for_capture")
+
+
+class PaymentReconciler:
+    """Re-checks payments whose YooKassa notification never arrived.
+
+    Every ``interval_seconds`` a batch of up to ``batch_size`` payments that
+    are still pending and were not updated for ``stale_after_seconds`` is
+    leased: the rows are selected with ``FOR UPDATE SKIP LOCKED`` and their
+    ``updated_at`` is bumped in the same transaction, so the other workers
+    skip them and each payment is polled at most once per
+    ``stale_after_seconds``. Their state is then fetched from YooKassa, at
+    most ``calls_per_second`` calls a second, and applied exactly as the
+    webhook would apply it.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker[Session],
+        interval_seconds: float,
+        stale_after_seconds: float,
+        batch_size: int,
+        calls_per_second: float,
+    ) -> None:
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.stale_after_seconds = stale_after_seconds
+        self.batch_size = batch_size
+        self.calls_per_second = calls_per_second
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="payment-reconciler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.reconcile_once()
+            except Exception:
+                logger.exception("Сверка платежей с YooKassa завершилась ошибкой")
+
+    def reconcile_once(self) -> int:
+        """Reconcile one batch; returns the number of payments whose status changed."""
+        changed = 0
+        for index, (payment_id, yookassa_payment_id) in enumerate(self._lease_batch()):
+            if index and self._stop.wait(1 / self.calls_per_second):
+                break
+            try:
+                changed += self._reconcile_payment(payment_id, yookassa_payment_id)
+            except HTTPException as exc:
+                if exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+                    # The circuit breaker is open: the rest of the batch would fail too.
+                    logger.warning("Сверка платежей прервана: YooKassa недоступна")
+                    break
+                logger.warning("Не удалось сверить платёж %s с YooKassa: %s", payment_id, exc.detail)
+        if changed:
+            logger.info("Сверка с YooKassa: обновлено платежей: %s", changed)
+        return changed
+
+    def _lease_batch(self) -> list[tuple[int, str]]:
+        now = datetime.utcnow()
+        with self.session_factory() as session:
+            rows = (
+                session.query(Payment.id, Payment.yookassa_payment_id)
+                .filter(
+                    Payment.status.in_(_PENDING_STATUSES),
+                    Payment.updated_at < now - timedelta(seconds=self.stale_after_seconds),
+                    Payment.yookassa_payment_id.isnot(None),
+                )
+                .order_by(Payment.updated_at.asc())
+                .limit(self.batch_size)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            if rows:
+                session.execute(
+                    update(Payment).where(Payment.id.in_([row.id for row in rows])).values(updated_at=now)
+                )
+            session.commit()
+        return [(row.id, row.yookassa_payment_id) for row in rows]
+
+    def _reconcile_payment(self, payment_id: int, yookassa_payment_id: str) -> bool:
+        # No session is open while YooKassa answers.
+        payment_object = YooKassaClient().get_payment(yookassa_payment_id)
+
+        with self.session_factory() as session:
+            payment = session.query(Payment).filter(Payment.id == payment_id).with_for_update().first()
+            # A webhook may have settled the payment meanwhile.
+            if payment is None or payment.status not in _PENDING_STATUSES:
+                return False
+            if payment_object.get("status", payment.status) == payment.status:
+                return False
+
+            previous_status = payment.status
+            PaymentHandler(session=session).apply_payment_object(
+                payment, payment_object, {"type": "reconciliation", "object": payment_object}
+            )
+            logger.info(
+                "Платёж %s: статус %s -> %s по данным YooKassa",
+                payment_id,
+                previous_status,
+                payment.status,
+            )
+            return True
+
+
+def start_payment_reconciler() -> PaymentReconciler | None:
+    if not settings.PAYMENT_RECONCILE_ENABLED:
+        return None
+    if not settings.YOOKASSA_SHOP_ID or not settings.YOOKASSA_SECRET_KEY:
+        logger.info("Сверка платежей отключена: не настроены ключи YooKassa")
+        return None
+
+    reconciler = PaymentReconciler(
+        SessionLocal,
+        interval_seconds=settings.PAYMENT_RECONCILE_INTERVAL_SECONDS,
+        stale_after_seconds=settings.PAYMENT_RECONCILE_STALE_AFTER_SECONDS,
+        batch_size=settings.PAYMENT_RECONCILE_BATCH_SIZE,
+        calls_per_second=settings.PAYMENT_RECONCILE_CALLS_PER_SECOND,
+    )
+    reconciler.start()
+    return reconciler
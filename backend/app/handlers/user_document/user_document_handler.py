@@ -12,6 +12,7 @@ from modules.utils.document_security import (
     encrypt_document_fields,
     get_sensitive_data_cipher,
     render_contract_docx,
+    render_contract_pdf,
     serialize_document_for_response,
 )
 from modules.utils.jwt_utils import get_current_user
@@ -146,6 +147,14 @@ class UserDocumentHandler:
         return serialize_document_for_response(doc, self.cipher, self.user)
 
     def get_my_contract_docx_bytes(self, document_id: int):
+        doc, decrypted_fields = self._get_my_contract_render_data(document_id)
+        return render_contract_docx(self.user, doc, decrypted_fields)
+
+    def get_my_contract_pdf_bytes(self, document_id: int):
+        doc, decrypted_fields = self._get_my_contract_render_data(document_id)
+        return render_contract_pdf(self.user, doc, decrypted_fields)
+
+    def _get_my_contract_render_data(self, document_id: int) -> tuple[UserDocument, dict]:
         doc = self._get_my_document(document_id)
         if not doc:
             raise HTTPException(
@@ -163,4 +172,4 @@ class UserDocumentHandler:
             **decrypt_user_fields(self.user, self.cipher),
             **decrypt_document_fields(doc, self.cipher),
         }
-        return render_contract_docx(self.user, doc, decrypted_fields)
\ No newline at end of file
+        return doc, decrypted_fields
\ No newline at end of file
@@ -1,52 +1,38 @@
-import logging
-import logging.handlers
-from pathlib import Path
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.admin import admin_router
 from app.api.auth import auth_router
 from app.api.payments.routes import router as payments_router
 from app.api.user_document import user_document_router
+from app.handlers.payment_reconciler import start_payment_reconciler
+from app.middleware import AccessLogMiddleware, CompressionMiddleware, ProfilingMiddleware
+from modules.connection_to_db.database import engine
+from modules.utils.config import settings
+from modules.utils.json_response import FastJSONResponse
+from modules.utils.lifecycle import check_readiness, drain, install_drain_signal_handler
+from modules.utils.logging_utils import setup_logging, stop_logging
 
 
-def _setup_logging() -> None:
-    log_dir = Path("/backend/logs")
-    log_dir.mkdir(parents=True, exist_ok=True)
+setup_logging(settings.LOG_DIR, access_log=settings.ACCESS_LOG_ENABLED)
 
-    formatter = logging.Formatter(
-        fmt="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
 
-    # Rotate at midnight, keep 5 days
-    file_handler = logging.handlers.TimedRotatingFileHandler(
-        filename=log_dir / "app.log",
-        when="midnight",
-        interval=1,
-        backupCount=5,
-        encoding="utf-8",
-        utc=True,
-    )
-    file_handler.setFormatter(formatter)
-    file_handler.setLevel(logging.INFO)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    install_drain_signal_handler()
+    reconciler = start_payment_reconciler()
+    yield
+    if reconciler is not None:
+        await run_in_threadpool(reconciler.stop, settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    # In-flight requests are already finished by the server; calls to
+    # YooKassa may still run in threads whose requests were cancelled.
+    await run_in_threadpool(drain, settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    # Flush whatever is still queued before the process exits.
+    stop_logging()
 
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    console_handler.setLevel(logging.INFO)
-
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
-
-    # Suppress noisy third-party loggers
-    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
-    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
-
-
-_setup_logging()
 
 openapi_tags = [
     {"name": "Auth", "description": "Авторизация, регистрация и управление токенами."},
@@ -68,15 +54,24 @@ app = FastAPI(
     title="Bike API",
     version="1.0.0",
     openapi_tags=openapi_tags,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
+if settings.PROFILING_ENABLED:
+    # Innermost, so error responses of the profiler still get CORS headers.
+    app.add_middleware(ProfilingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Request-ID", "X-Profile-Id"],
 )
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+app.add_middleware(AccessLogMiddleware)
 
 app.include_router(admin_router)
 app.include_router(auth_router)
@@ -86,4 +81,11 @@ app.include_router(payments_router, prefix="/api")
 
 @app.get("/health", status_code=status.HTTP_200_OK, tags=["Admin System"])
 async def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/ready", tags=["Admin System"])
+def readiness_check():
+    ready, payload = check_readiness(engine)
+    status_code = status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    return FastJSONResponse(status_code=status_code, content=payload)
\ No newline at end of file
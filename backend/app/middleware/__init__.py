@@ -0,0 +1,5 @@
+from app.middleware.access_log import AccessLogMiddleware
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+
+__all__ = ["AccessLogMiddleware", "CompressionMiddleware", "ProfilingMiddleware"]
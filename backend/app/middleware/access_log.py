@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import logging
+import re
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from modules.utils.logging_utils import ACCESS_LOGGER_NAME
+from modules.utils.request_metrics import RequestMetrics, current_request_metrics
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+# Accept upstream ids (e.g. from nginx) only if they are short and log-safe.
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{8,64}$")
+
+access_logger = logging.getLogger(ACCESS_LOGGER_NAME)
+
+
+def _incoming_request_id(scope: Scope) -> str | None:
+    for name, value in scope.get("headers", ()):
+        if name == b"x-request-id":
+            candidate = value.decode("latin-1")
+            return candidate if _REQUEST_ID_RE.match(candidate) else None
+    return None
+
+
+class AccessLogMiddleware:
+    """Pure ASGI middleware writing one structured access record per HTTP request.
+
+    Unlike ``BaseHTTPMiddleware`` it does not buffer or re-wrap the response,
+    so streaming downloads keep streaming; the recorded duration covers the
+    whole response body.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = _incoming_request_id(scope) or uuid.uuid4().hex
+        metrics = RequestMetrics(request_id=request_id)
+        token = current_request_metrics.set(metrics)
+        status_code = 500
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            duration = time.perf_counter() - metrics.started_at
+            route = scope.get("route")
+            access_logger.info(
+                "request",
+                extra={
+                    "request_id": request_id,
+                    "fields": {
+                        "method": scope["method"],
+                        "route": getattr(route, "path", None),
+                        "status": status_code,
+                        "duration_ms": round(duration * 1000, 2),
+                        "db_ms": round(metrics.db_seconds * 1000, 2),
+                        "db_queries": metrics.db_queries,
+                        "pool_wait_ms": round(metrics.pool_wait_seconds * 1000, 2),
+                    },
+                },
+            )
+            current_request_metrics.reset(token)
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import zlib
+from typing import Callable, NamedTuple
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Text-like payloads only. Everything else (DOCX, XLSX and ZIP archives, PDF,
+# images) is either already compressed or not worth the CPU.
+COMPRESSIBLE_TYPES = frozenset(
+    {
+        "application/json",
+        "application/x-ndjson",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+    }
+)
+_SKIPPED_STATUSES = frozenset({204, 206, 304})
+# Preferred first when the client gives several the same q-value.
+_SUPPORTED_ENCODINGS = ("br", "gzip")
+
+
+def _is_compressible(content_type: str) -> bool:
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    return media_type.startswith("text/") or media_type in COMPRESSIBLE_TYPES
+
+
+def _accepted_encodings(header: str) -> dict[str, float]:
+    accepted: dict[str, float] = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+class _Compressor(NamedTuple):
+    compress: Callable[[bytes], bytes]
+    flush: Callable[[], bytes]
+    finish: Callable[[], bytes]
+
+
+def _gzip_compressor(level: int) -> _Compressor:
+    # wbits=31 produces a gzip container instead of a raw zlib stream.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return _Compressor(
+        compress=compressor.compress,
+        flush=lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+        finish=compressor.flush,
+    )
+
+
+def _brotli_compressor(quality: int) -> _Compressor:
+    compressor = brotli.Compressor(quality=quality)
+    return _Compressor(
+        compress=compressor.process,
+        flush=compressor.flush,
+        finish=compressor.finish,
+    )
+
+
+class CompressionMiddleware:
+    """Negotiated gzip/brotli compression as pure ASGI middleware.
+
+    Complete bodies shorter than ``minimum_size`` are sent as is. Streaming
+    responses are compressed chunk by chunk and flushed after every chunk,
+    so CSV/NDJSON exports are never buffered in memory and clients receive
+    rows as they are produced.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def _choose_encoding(self, scope: Scope) -> str | None:
+        """The supported encoding with the highest q-value, if any is acceptable."""
+        accepted = _accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        wildcard = accepted.get("*", 0.0)
+        best, best_quality = None, 0.0
+        for encoding in _SUPPORTED_ENCODINGS:
+            quality = accepted.get(encoding, wildcard)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _compressor(self, encoding: str) -> _Compressor:
+        if encoding == "br":
+            return _brotli_compressor(self.brotli_quality)
+        return _gzip_compressor(self.gzip_level)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(scope)
+        start_message: Message | None = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] in _SKIPPED_STATUSES
+                    or "content-encoding" in headers
+                    or not _is_compressible(headers.get("content-type", ""))
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                # The body depends on Accept-Encoding from here on, even when
+                # this client gets it uncompressed.
+                MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                    return
+                # Hold the start message until the first body chunk tells us
+                # whether the response is worth compressing.
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                pending_start, start_message = start_message, None
+                headers = MutableHeaders(scope=pending_start)
+
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(pending_start)
+                    await send(message)
+                    return
+
+                compressor = self._compressor(encoding)
+                headers["Content-Encoding"] = encoding
+                if not more_body:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers["Content-Length"] = str(len(body))
+                    await send(pending_start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+                # Streaming: the final length is unknown.
+                del headers["Content-Length"]
+                await send(pending_start)
+
+            if more_body:
+                chunk = compressor.compress(body) + compressor.flush()
+            else:
+                chunk = compressor.compress(body) + compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from jose import JWTError
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from modules.connection_to_db.database import SessionLocal
+from modules.schemas.system_schemas import ProfileRead
+from modules.utils.admin_utils import get_current_admin
+from modules.utils.jwt_utils import decode_token, get_current_user, oauth2_scheme
+from modules.utils.rate_limit import PROFILE_RUN_PER_ADMIN, enforce_rate_limit
+from modules.utils.request_metrics import get_request_id
+from modules.utils.request_profiler import (
+    PROFILE_ID_HEADER,
+    PROFILE_REQUEST_HEADER,
+    new_profile_id,
+    save_profile,
+    start_profiler,
+    stop_profiler,
+)
+
+_PROFILE_HEADER_NAME = PROFILE_REQUEST_HEADER.lower().encode("latin-1")
+
+logger = logging.getLogger(__name__)
+
+
+async def _profiling_admin_id(request: Request) -> int | None:
+    """Id of the admin asking for a profile, or None to serve the request unprofiled.
+
+    A stray ``X-Profile`` header from anyone else must not change the
+    response, and must not cost a DB lookup per request: the token is
+    checked and the per-admin rate limit applied before the user is loaded.
+    """
+    token = (
+        await oauth2_scheme(request)
+        or request.query_params.get("access_token")
+        or request.cookies.get("access_token")
+    )
+    if not token:
+        return None
+    try:
+        claims = decode_token(token)
+        user_id = int(claims.get("sub"))
+        if claims.get("type") not in (None, "access"):
+            return None
+        enforce_rate_limit(PROFILE_RUN_PER_ADMIN, f"admin:{user_id}")
+    except (JWTError, TypeError, ValueError, HTTPException):
+        return None
+
+    with SessionLocal() as db:
+        try:
+            user = await get_current_user(request, token, db)
+            admin = await get_current_admin(user)
+        except HTTPException:
+            return None
+        return admin.id
+
+
+class ProfilingMiddleware:
+    """Runs a request under cProfile when an admin sends the ``X-Profile`` header.
+
+    Requests without the header cost one header lookup. When the sender is
+    not an admin (``get_current_admin``) or is over the per-admin rate
+    limit, the header is ignored and the request is served unprofiled. Only
+    one request per worker is profiled at a time. The profile id is returned
+    in ``X-Profile-Id`` and the stats are written to
+    ``SECURE_STORAGE_DIR/profiles`` after the response is sent.
+
+    The profile is not limited to the request. On Python 3.12+ cProfile
+    observes every thread of the worker: endpoint code in the threadpool and
+    anything else the worker serves concurrently. On older interpreters it
+    observes the event loop thread, which still includes the coroutines of
+    other requests that run while the profiled one awaits.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not any(
+            name == _PROFILE_HEADER_NAME for name, _ in scope.get("headers", ())
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        admin_id = await _profiling_admin_id(Request(scope))
+        if admin_id is None:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = start_profiler()
+        if profiler is None:
+            response = JSONResponse(
+                {"detail": "Профилирование уже выполняется, повторите запрос позже"},
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        profile_id = new_profile_id()
+        created_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        status_code = None
+
+        async def send_with_profile_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            stop_profiler(profiler)
+            route = scope.get("route")
+            profile = ProfileRead(
+                id=profile_id,
+                method=scope["method"],
+                path=scope["path"],
+                route=getattr(route, "path", None),
+                status_code=status_code,
+                duration_ms=round((time.perf_counter() - started) * 1000, 2),
+                request_id=get_request_id(),
+                requested_by=admin_id,
+                created_at=created_at,
+            )
+            try:
+                await run_in_threadpool(save_profile, profiler, profile)
+            except OSError:
+                logger.exception("Не удалось сохранить профиль %s", profile_id)
@@ -0,0 +1,20 @@
+"""Default settings for running benchmarks without a .env file.
+
+Import this module before anything from ``modules`` or ``app``: the settings
+object is created at import time. Real environment variables still win.
+"""
+
+import os
+import tempfile
+
+_DEFAULTS = {
+    "DATABASE_URL": "sqlite:///./benchmark.db",
+    "SECRET_KEY": "benchmark-secret-key",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "30",
+    "ENCRYPTION_KEY": "0Y6ACr7Nw3MgkNmK3bU1ZbGm8y8F5GmHq8hVbC5l0wI=",
+    "LOG_DIR": os.path.join(tempfile.gettempdir(), "benchmark-logs"),
+}
+
+for _name, _value in _DEFAULTS.items():
+    os.environ.setdefault(_name, _value)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass(frozen=True)
+class TimingResult:
+    name: str
+    iterations: int
+    mean_us: float
+    median_us: float
+    p95_us: float
+
+    def format(self) -> str:
+        return (
+            f"{self.name:<32} {self.iterations:>8} iters  "
+            f"mean {self.mean_us:9.2f} us  median {self.median_us:9.2f} us  "
+            f"p95 {self.p95_us:9.2f} us"
+        )
+
+
+def measure(
+    name: str,
+    func: Callable[[], object],
+    iterations: int = 10_000,
+    repeats: int = 20,
+    warmup: int = 100,
+) -> TimingResult:
+    """Time ``func`` in ``repeats`` batches and report per-call latency in microseconds."""
+    for _ in range(warmup):
+        func()
+
+    per_call: list[float] = []
+    batch = max(1, iterations // repeats)
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(batch):
+            func()
+        per_call.append((time.perf_counter() - started) / batch * 1_000_000)
+
+    per_call.sort()
+    return TimingResult(
+        name=name,
+        iterations=batch * repeats,
+        mean_us=statistics.fmean(per_call),
+        median_us=statistics.median(per_call),
+        p95_us=per_call[min(len(per_call) - 1, int(len(per_call) * 0.95))],
+    )
@@ -0,0 +1,217 @@
+"""Per-call cost of the document_security, pricing and formatting hot paths.
+
+Covers field encryption and decryption, the document response serializer,
+placeholder replacement in the contract DOCX, phone normalization, the
+amount-in-words text and the weekly price lookup against SQLite. The DOCX
+case uses the configured contract template when it exists and otherwise a
+generated document of the same shape: placeholders split across runs, a
+requisites table, header and footer.
+
+Run from the backend directory: ``python -m benchmarks.hot_functions``.
+Use ``python -m benchmarks.run`` to store and compare results.
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (must run before settings are imported)
+
+import argparse
+import io
+from datetime import date
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.handlers.admin.admin_handler import AdminHandler
+from app.handlers.payment_handler import PaymentHandler
+from modules.connection_to_db.database import Base
+from modules.models.inventory import Bike, BikePricing
+from modules.models.models_alembic_import import *  # noqa: F401,F403
+from modules.models.types import DocumentStatusEnum
+from modules.models.user import User
+from modules.models.user_document import UserDocument
+from modules.utils.document_security import (
+    _build_contract_values,
+    _replace_placeholders_in_docx,
+    decrypt_document_fields,
+    decrypt_user_fields,
+    encrypt_document_fields,
+    get_contract_template_path,
+    get_sensitive_data_cipher,
+    serialize_document_for_response,
+)
+from modules.utils.pricing import resolve_weekly_amount
+
+from benchmarks._timing import TimingResult, measure
+
+PERSONAL_DATA = {
+    "full_name": "Иванов Иван Иванович",
+    "inn": "771234567890",
+    "registration_address": "г. Великий Новгород, ул. Большая Московская, д. 1, кв. 12",
+    "residential_address": "г. Великий Новгород, ул. Ломоносова, д. 9, кв. 40",
+    "passport": "4912345678",
+    "phone": "+79110000000",
+    "bank_account": "40817810099910004312",
+}
+DOCUMENT_DATA = {
+    "contract_number": "1.1.1",
+    "bike_serial": "B00042",
+    "akb1_serial": "A00042",
+    "akb2_serial": "A00043",
+    "amount": "10000",
+    "amount_text": "десять тысяч",
+}
+
+BIKES = 500
+PRICING_BANDS = ((1, 3, 3000), (4, 11, 2500), (12, 25, 2200), (26, 52, 2000))
+
+
+def _user_and_document() -> tuple[User, UserDocument]:
+    cipher = get_sensitive_data_cipher()
+    user = User(
+        id=1,
+        email="user@example.com",
+        role="user",
+        status=DocumentStatusEnum.APPROVED,
+        **encrypt_document_fields(PERSONAL_DATA, cipher),
+    )
+    doc = UserDocument(
+        id=1,
+        user_id=1,
+        weeks_count=4,
+        filled_date=date(2026, 10, 1),
+        active=True,
+        signed=True,
+        **encrypt_document_fields(DOCUMENT_DATA, cipher),
+    )
+    doc.user = user
+    return user, doc
+
+
+def _synthetic_contract_template() -> bytes:
+    """A contract-shaped DOCX: Word splits placeholders into runs, so do we."""
+    from docx import Document
+
+    document = Document()
+    section = document.sections[0]
+    section.header.paragraphs[0].text = "Договор аренды № {№_договора}"
+    section.footer.paragraphs[0].text = "Арендатор ____________ {last_name} {first_name}"
+
+    document.add_heading("ДОГОВОР АРЕНДЫ ЭЛЕКТРОВЕЛОСИПЕДА № {№_договора}", level=1)
+    paragraph = document.add_paragraph()
+    for part in ("г. {CITY}", "\t\t\t", "{Дата_", "заполнения}"):
+        paragraph.add_run(part)
+    for number in range(1, 61):
+        paragraph = document.add_paragraph()
+        paragraph.add_run(f"{number}. Арендодатель передает, а Арендатор ")
+        paragraph.add_run("{ФИО}" if number % 5 == 0 else "принимает во временное пользование ")
+        paragraph.add_run("электровелосипед с серийным номером {Серийный_")
+        paragraph.add_run("номер_велик}" if number % 3 == 0 else "номер_велик} ")
+        paragraph.add_run(" сроком на {Кол_во_недель} {неделю} до {Дат_конец_аренды}.")
+
+    table = document.add_table(rows=12, cols=2)
+    rows = (
+        ("ФИО", "{ФИО}"),
+        ("Паспорт", "{PASSPORT}"),
+        ("ИНН", "{INN}"),
+        ("Адрес регистрации", "{REGISTRATION_ADDRESS}"),
+        ("Адрес проживания", "{RESIDENTIAL_ADDRESS}"),
+        ("Телефон", "{PHONE}"),
+        ("E-mail", "{EMAIL}"),
+        ("Счет", "{BANK_ACCOUNT}"),
+        ("АКБ 1", "{Серийный_нормер_АКБ_1}"),
+        ("АКБ 2", "{Серийный_нормер_АКБ_2}"),
+        ("Сумма", "{Сумма} ({Сумма_пропись}) руб."),
+        ("Приложение", "№ {Номер_приложения}"),
+    )
+    for row, (label, value) in zip(table.rows, rows):
+        row.cells[0].text = label
+        row.cells[1].text = value
+
+    buf = io.BytesIO()
+    document.save(buf)
+    return buf.getvalue()
+
+
+def _template_bytes(template: Path | None) -> tuple[bytes, str]:
+    path = template or get_contract_template_path()
+    if path.exists():
+        return path.read_bytes(), str(path)
+    return _synthetic_contract_template(), "synthetic contract-shaped template"
+
+
+def _pricing_session() -> Session:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[Bike.__table__, BikePricing.__table__])
+    session = Session(engine)
+    for type_id in range(1, 6):
+        for min_weeks, max_weeks, amount in PRICING_BANDS:
+            session.add(
+                BikePricing(
+                    type_id=type_id,
+                    name_type=f"type {type_id}",
+                    min_weeks_count=min_weeks,
+                    max_weeks_count=max_weeks,
+                    amount_weeks=amount + type_id * 100,
+                )
+            )
+    session.add_all(
+        Bike(number=f"B{i:05d}", vin=f"VIN{i:014d}", name="Kugoo Kirin V1", type_id=i % 5 + 1)
+        for i in range(BIKES)
+    )
+    session.commit()
+    return session
+
+
+def main(argv: list[str] | None = None) -> list[TimingResult]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--template", type=Path, help="contract DOCX to use instead of the configured one")
+    args = parser.parse_args(argv)
+
+    from docx import Document
+
+    cipher = get_sensitive_data_cipher()
+    user, doc = _user_and_document()
+    encrypted_phone = user.phone
+    decrypted_fields = {**decrypt_user_fields(user, cipher), **decrypt_document_fields(doc, cipher)}
+    values = _build_contract_values(user, doc, decrypted_fields)
+    template, template_source = _template_bytes(args.template)
+
+    # Neither method touches handler state, so the handlers are not constructed.
+    admin_handler = AdminHandler.__new__(AdminHandler)
+    payment_handler = PaymentHandler.__new__(PaymentHandler)
+    session = _pricing_session()
+
+    def replace_placeholders() -> None:
+        _replace_placeholders_in_docx(Document(io.BytesIO(template)), values)
+
+    print(f"docx template: {template_source} ({len(template) // 1024} KiB)")
+    results = [
+        measure("cipher.encrypt", lambda: cipher.encrypt(PERSONAL_DATA["phone"]), 5000),
+        measure("cipher.decrypt", lambda: cipher.decrypt(encrypted_phone), 5000),
+        measure("decrypt_user_fields", lambda: decrypt_user_fields(user, cipher), 2000),
+        measure("decrypt_document_fields", lambda: decrypt_document_fields(doc, cipher), 2000),
+        measure(
+            "serialize_document_for_response",
+            lambda: serialize_document_for_response(doc, cipher, user),
+            1000,
+        ),
+        measure("docx open template", lambda: Document(io.BytesIO(template)), 100, 10, 5),
+        measure("docx open+replace placeholders", replace_placeholders, 100, 10, 5),
+        measure("_normalize_phone", lambda: payment_handler._normalize_phone("8 (911) 000-00-00"), 50_000),
+        measure("amount text (num2words)", lambda: admin_handler._generate_amount_text("12 345"), 20_000),
+        measure(
+            "resolve_weekly_amount (sqlite)",
+            lambda: resolve_weekly_amount(session, "VIN00000000000250", 8),
+            2000,
+        ),
+    ]
+    session.close()
+    for result in results:
+        print(result.format())
+    return results
+
+
+if __name__ == "__main__":
+    main()
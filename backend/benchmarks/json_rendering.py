@@ -0,0 +1,160 @@
+"""Response rendering cost of the large list endpoints: stdlib JSONResponse vs FastJSONResponse.
+
+Both paths start from what FastAPI hands to the response class after
+``response_model`` serialization (``mode="json"`` Python data), so the
+difference is the rendering step alone. ``serialize+render`` adds the
+model dump to show its share of the total.
+
+Run from the backend directory: ``python -m benchmarks.json_rendering``.
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (must run before settings are imported)
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from modules.schemas.document_schemas import UserContractItem, UserWithDocumentSummary
+from modules.schemas.inventory_schemas import BikeRead
+from modules.schemas.payment_schemas import ContractPaymentRead
+from modules.utils.json_response import FastJSONResponse
+
+from benchmarks._timing import measure
+
+ROWS = 1000
+
+
+def _users() -> list[UserWithDocumentSummary]:
+    return [
+        UserWithDocumentSummary(
+            id=i,
+            email=f"user{i}@example.com",
+            full_name="Иванов Иван Иванович",
+            inn=771234567890,
+            registration_address="г. Великий Новгород, ул. Большая Московская, д. 1",
+            residential_address="г. Великий Новгород, ул. Большая Московская, д. 1",
+            passport=4912345678,
+            phone="+79110000000",
+            bank_account=40817810099910004312,
+            role="user",
+            status="approved",
+        )
+        for i in range(ROWS)
+    ]
+
+
+def _bikes() -> list[BikeRead]:
+    return [
+        BikeRead(
+            id=i,
+            number=f"B{i:05d}",
+            vin=f"VIN{i:014d}",
+            name="Kugoo Kirin V1",
+            description="Курьерский электровелосипед",
+            purchase_date=date(2025, 3, 1),
+            last_service_date=date(2026, 9, 1),
+            next_service_date=date(2026, 12, 1),
+            type_id=1,
+            location_id=1,
+            location={"id": 1, "name": "Склад", "address": "ул. Ломоносова, 9"},
+            active_contract={
+                "contract_number": f"{i}-1",
+                "user_full_name": "Иванов Иван Иванович",
+                "rental_start": date(2026, 10, 1),
+                "rental_end": date(2026, 11, 1),
+            },
+        )
+        for i in range(ROWS)
+    ]
+
+
+def _contracts() -> list[UserContractItem]:
+    return [
+        UserContractItem(
+            id=i,
+            status="approved",
+            last_name="Иванов",
+            first_name="Иван",
+            patronymic="Иванович",
+            full_name="Иванов Иван Иванович",
+            inn=771234567890,
+            passport=4912345678,
+            phone="+79110000000",
+            active=True,
+            signed=True,
+            contract_docx_url=f"/users/me/contract-docx/{i}",
+        )
+        for i in range(ROWS)
+    ]
+
+
+def _schedule() -> list[ContractPaymentRead]:
+    paid_at = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+    return [
+        ContractPaymentRead(
+            id=i,
+            document_id=1,
+            payment_number=i + 1,
+            due_date=date(2026, 1, 1) + timedelta(weeks=i),
+            amount=Decimal("2500.00"),
+            description="Еженедельный платеж",
+            payment_type="rent",
+            status="paid",
+            order_id=i,
+            payment_id=i,
+            paid_at=paid_at,
+        )
+        for i in range(ROWS)
+    ]
+
+
+ENDPOINTS = {
+    "/admin/users": (UserWithDocumentSummary, _users),
+    "/admin/bikes": (BikeRead, _bikes),
+    "/admin/users/{id}/contracts": (UserContractItem, _contracts),
+    "/api/payments/schedule": (ContractPaymentRead, _schedule),
+}
+
+
+def main() -> list:
+    stdlib = JSONResponse(content=None)
+    fast = FastJSONResponse(content=None)
+
+    results = []
+    for endpoint, (model, factory) in ENDPOINTS.items():
+        adapter = TypeAdapter(list[model])
+        items = factory()
+        payload = adapter.dump_python(items, mode="json")
+        assert fast.render(payload) == fast.render(items)
+
+        print(f"{endpoint} ({ROWS} rows, {len(fast.render(payload)) // 1024} KiB)")
+        endpoint_results = [
+            measure("  render stdlib json", lambda: stdlib.render(payload), 200, 10, 5),
+            measure("  render orjson", lambda: fast.render(payload), 200, 10, 5),
+            measure(
+                "  serialize+render stdlib",
+                lambda: stdlib.render(adapter.dump_python(items, mode="json")),
+                200,
+                10,
+                5,
+            ),
+            measure(
+                "  serialize+render orjson",
+                lambda: fast.render(adapter.dump_python(items, mode="json")),
+                200,
+                10,
+                5,
+            ),
+        ]
+        for result in endpoint_results:
+            print(result.format())
+        results.extend(endpoint_results)
+    return results
+
+
+if __name__ == "__main__":
+    main()
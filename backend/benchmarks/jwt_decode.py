@@ -0,0 +1,38 @@
+"""Per-request cost of access-token verification, with and without the verified-token cache.
+
+Run from the backend directory: ``python -m benchmarks.jwt_decode``.
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (must run before settings are imported)
+
+import datetime
+
+from modules.utils.jwt_utils import create_access_token, decode_token, verified_token_cache
+
+from benchmarks._timing import measure
+
+
+def main() -> list:
+    token = create_access_token({"sub": "1"}, datetime.timedelta(minutes=30))
+
+    def cold() -> None:
+        verified_token_cache.clear()
+        decode_token(token)
+
+    def warm() -> None:
+        decode_token(token)
+
+    results = [
+        measure("decode_token (full verify)", cold),
+        measure("decode_token (cached)", warm),
+    ]
+    for result in results:
+        print(result.format())
+    print(f"speedup: x{results[0].median_us / results[1].median_us:.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""Plan check for the hot payment and document queries.
+
+Creates the schema in a scratch database, seeds it with production-like
+volumes, runs ``ANALYZE`` and then asks the planner how it would execute each
+hot query. Exits with status 1 when a query stops using its index or falls
+back to a full scan of a large table, so it can run as a CI step after model
+or migration changes.
+
+Run from the backend directory::
+
+    python -m benchmarks.query_plans
+    python -m benchmarks.query_plans --database-url postgresql://.../scratch
+
+The default is a throwaway SQLite file. A PostgreSQL URL must point to an
+empty scratch database: the tables are created and dropped by this script.
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (must run before settings are imported)
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Callable
+
+from sqlalchemy import Engine, create_engine, inspect, insert, select, text
+from sqlalchemy.sql import Select
+
+from modules.connection_to_db.database import Base
+from modules.models.models_alembic_import import *  # noqa: F401,F403
+from modules.models.payment import ContractPayment, Order, Payment
+from modules.models.user import User
+from modules.models.user_document import UserDocument
+
+# Tables whose full scan on a hot path is a regression.
+LARGE_TABLES = ("payments", "contract_payments", "user_documents", "orders")
+
+# Per-user volumes of a long-lived installation: a couple of contracts with a
+# weekly schedule each, most of it already paid.
+DOCUMENTS_PER_USER = 2
+SCHEDULE_WEEKS = 26
+
+
+@dataclass(frozen=True)
+class PlanCheck:
+    name: str
+    build: Callable[[int], Select]
+    expected_index: str
+
+
+def _hot_queries() -> list[PlanCheck]:
+    # Mirrors of the handler queries; keep them in sync when a handler changes.
+    return [
+        PlanCheck(
+            "list_my_schedule",
+            lambda user_id: select(ContractPayment)
+            .where(ContractPayment.user_id == user_id)
+            .order_by(ContractPayment.payment_number.asc()),
+            "ix_contract_payments_user_id_payment_number",
+        ),
+        PlanCheck(
+            "next_due_schedule_payment",
+            lambda user_id: select(ContractPayment)
+            .where(
+                ContractPayment.user_id == user_id,
+                ContractPayment.status == "pending",
+                ContractPayment.due_date <= date.today(),
+            )
+            .order_by(ContractPayment.payment_number.asc())
+            .limit(1),
+            "ix_contract_payments_user_id_status_due_date",
+        ),
+        PlanCheck(
+            "pending_future_rent_rows",
+            lambda user_id: select(ContractPayment).where(
+                ContractPayment.user_id == user_id,
+                ContractPayment.document_id == user_id * DOCUMENTS_PER_USER,
+                ContractPayment.payment_type == "rent",
+                ContractPayment.status == "pending",
+                ContractPayment.due_date > date.today(),
+            ),
+            "ix_contract_payments_user_id_status_due_date",
+        ),
+        PlanCheck(
+            "latest_user_document",
+            lambda user_id: select(UserDocument)
+            .where(UserDocument.user_id == user_id)
+            .order_by(UserDocument.created_at.desc(), UserDocument.id.desc())
+            .limit(1),
+            "ix_user_documents_user_id_created_at_id",
+        ),
+        PlanCheck(
+            "order_succeeded_payment",
+            lambda user_id: select(Payment)
+            .where(Payment.order_id == user_id * 10, Payment.status == "succeeded")
+            .limit(1),
+            "ix_payments_order_id_status",
+        ),
+        PlanCheck(
+            "latest_saved_payment_method",
+            lambda user_id: select(Payment)
+            .where(
+                Payment.user_id == user_id,
+                Payment.status == "succeeded",
+                Payment.payment_method_id.isnot(None),
+            )
+            .order_by(Payment.created_at.desc())
+            .limit(1),
+            "ix_payments_user_saved_method",
+        ),
+        PlanCheck(
+            "stale_pending_payments",
+            lambda user_id: select(Payment.id, Payment.yookassa_payment_id)
+            .where(
+                Payment.status.in_(("pending", "waiting_for_capture")),
+                Payment.updated_at < datetime.utcnow() - timedelta(minutes=10),
+                Payment.yookassa_payment_id.isnot(None),
+            )
+            .order_by(Payment.updated_at.asc())
+            .limit(50),
+            "ix_payments_status_updated_at",
+        ),
+    ]
+
+
+def _seed(engine: Engine, users: int, seed: int) -> dict[str, int]:
+    rnd = random.Random(seed)
+    now = datetime.utcnow()
+    today = date.today()
+    counts = dict.fromkeys(("users", "user_documents", "contract_payments", "orders", "payments"), 0)
+
+    with engine.begin() as conn:
+        conn.execute(
+            insert(User),
+            [
+                {
+                    "id": user_id,
+                    "email": f"user{user_id}@example.com",
+                    "hashed_password": "x",
+                    "role": "user",
+                    "status": "approved",
+                }
+                for user_id in range(1, users + 1)
+            ],
+        )
+        counts["users"] = users
+
+        documents, schedule, orders, payments = [], [], [], []
+        for user_id in range(1, users + 1):
+            for doc_offset in range(DOCUMENTS_PER_USER):
+                document_id = user_id * DOCUMENTS_PER_USER - doc_offset
+                started = today - timedelta(weeks=rnd.randint(0, SCHEDULE_WEEKS * 2))
+                documents.append(
+                    {
+                        "id": document_id,
+                        "user_id": user_id,
+                        "signed": True,
+                        "active": doc_offset == 0,
+                        "filled_date": started,
+                        "end_date": started + timedelta(weeks=SCHEDULE_WEEKS),
+                        "created_at": now - (today - started),
+                    }
+                )
+                for number in range(1, SCHEDULE_WEEKS + 1):
+                    due_date = started + timedelta(weeks=number - 1)
+                    schedule.append(
+                        {
+                            "user_id": user_id,
+                            "document_id": document_id,
+                            "payment_number": doc_offset * SCHEDULE_WEEKS + number,
+                            "due_date": due_date,
+                            "amount": Decimal("1500.00"),
+                            "payment_type": "rent",
+                            "status": "paid" if due_date < today else "pending",
+                        }
+                    )
+
+            for order_offset in range(10):
+                order_id = user_id * 10 - order_offset
+                created_at = now - timedelta(days=rnd.randint(0, 365))
+                outcome = rnd.random()
+                succeeded = outcome < 0.8
+                # A few payments whose webhook never arrived.
+                payment_status = "succeeded" if succeeded else "pending" if outcome < 0.81 else "canceled"
+                orders.append(
+                    {
+                        "id": order_id,
+                        "user_id": user_id,
+                        "amount": Decimal("1500.00"),
+                        "status": "succeeded" if succeeded else "canceled",
+                        "created_at": created_at,
+                    }
+                )
+                payments.append(
+                    {
+                        "order_id": order_id,
+                        "user_id": user_id,
+                        "yookassa_payment_id": f"pay-{order_id}",
+                        "status": payment_status,
+                        "amount": Decimal("1500.00"),
+                        "payment_method_id": f"pm-{user_id}" if succeeded and order_offset < 3 else None,
+                        "created_at": created_at,
+                        "updated_at": created_at,
+                    }
+                )
+
+        for table, rows in (
+            (UserDocument, documents),
+            (ContractPayment, schedule),
+            (Order, orders),
+            (Payment, payments),
+        ):
+            conn.execute(insert(table), rows)
+            counts[table.__tablename__] = len(rows)
+
+        conn.execute(text("ANALYZE"))
+    return counts
+
+
+def _sqlite_plan(conn, sql: str) -> tuple[list[str], set[str], set[str]]:
+    details = [row[3] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}"))]
+    indexes = {word for line in details for word in line.replace("(", " ").split() if word.startswith("ix_")}
+    full_scans = {
+        table
+        for line in details
+        for table in LARGE_TABLES
+        if line.startswith(f"SCAN {table}") and "INDEX" not in line
+    }
+    return details, indexes, full_scans
+
+
+def _postgres_plan(conn, sql: str) -> tuple[list[str], set[str], set[str]]:
+    raw = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+    details, indexes, full_scans = [], set(), set()
+
+    def walk(node: dict, depth: int) -> None:
+        relation = node.get("Relation Name")
+        index = node.get("Index Name")
+        details.append(
+            "  " * depth
+            + node["Node Type"]
+            + (f" on {relation}" if relation else "")
+            + (f" using {index}" if index else "")
+        )
+        if index:
+            indexes.add(index)
+        if node["Node Type"] == "Seq Scan" and relation in LARGE_TABLES:
+            full_scans.add(relation)
+        for child in node.get("Plans", ()):
+            walk(child, depth + 1)
+
+    walk(plan, 0)
+    return details, indexes, full_scans
+
+
+def _check_plans(engine: Engine, users: int, verbose: bool) -> list[str]:
+    explain = _postgres_plan if engine.dialect.name == "postgresql" else _sqlite_plan
+    failures = []
+    user_id = max(1, users // 2)
+    with engine.connect() as conn:
+        for check in _hot_queries():
+            # Literal values: PostgreSQL plans the first executions of a prepared
+            # statement with the actual parameters, and partial indexes are only
+            # matched against known values.
+            sql = str(
+                check.build(user_id).compile(
+                    dialect=engine.dialect, compile_kwargs={"literal_binds": True}
+                )
+            )
+            details, indexes, full_scans = explain(conn, sql)
+            problems = []
+            if check.expected_index not in indexes:
+                problems.append(f"не использует {check.expected_index}")
+            if full_scans:
+                problems.append("полный просмотр " + ", ".join(sorted(full_scans)))
+
+            print(f"{'FAIL' if problems else 'ok  '}  {check.name}: {'; '.join(problems) or check.expected_index}")
+            if problems or verbose:
+                for line in details:
+                    print(f"        {line}")
+            failures.extend(f"{check.name}: {problem}" for problem in problems)
+    return failures
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", help="empty scratch database; defaults to a temporary SQLite file")
+    parser.add_argument("--users", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only failing ones")
+    args = parser.parse_args(argv)
+
+    temp_path = None
+    url = args.database_url
+    if url is None:
+        fd, temp_path = tempfile.mkstemp(prefix="query-plans-", suffix=".db")
+        os.close(fd)
+        url = f"sqlite:///{temp_path}"
+
+    engine = create_engine(url)
+    try:
+        if inspect(engine).has_table(User.__tablename__):
+            print("База данных не пустая: укажите отдельную временную базу для проверки планов")
+            return 2
+
+        Base.metadata.create_all(engine)
+        try:
+            started = time.perf_counter()
+            counts = _seed(engine, args.users, args.seed)
+            print(
+                f"{engine.dialect.name}: seeded "
+                + ", ".join(f"{name}={count}" for name, count in counts.items())
+                + f" in {time.perf_counter() - started:.1f} s\n"
+            )
+            failures = _check_plans(engine, args.users, args.verbose)
+        finally:
+            Base.metadata.drop_all(engine)
+    finally:
+        engine.dispose()
+        if temp_path is not None:
+            os.remove(temp_path)
+
+    if failures:
+        print(f"\n{len(failures)} regression(s)")
+        return 1
+    print("\nall hot queries use their indexes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,153 @@
+"""Run the micro-benchmark suites, store the results and compare them with a baseline.
+
+Each run is written to ``benchmarks/results/<timestamp>-<commit>.json``. With
+``--baseline`` the medians are compared per benchmark and the command exits
+with status 1 when any of them got slower than ``--threshold`` percent, so it
+can gate a deploy. Timings depend on the machine: compare runs made on the
+same host.
+
+Run from the backend directory::
+
+    python -m benchmarks.run                                  # run and store
+    python -m benchmarks.run --baseline benchmarks/results/<old>.json
+    python -m benchmarks.run --baseline old.json --current new.json   # compare only
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (must run before settings are imported)
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+from benchmarks._timing import TimingResult
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _hot_functions() -> list[TimingResult]:
+    from benchmarks import hot_functions
+
+    return hot_functions.main([])
+
+
+def _jwt_decode() -> list[TimingResult]:
+    from benchmarks import jwt_decode
+
+    return jwt_decode.main()
+
+
+SUITES: dict[str, Callable[[], list[TimingResult]]] = {
+    "hot_functions": _hot_functions,
+    "jwt_decode": _jwt_decode,
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=RESULTS_DIR.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _run_suites(names: list[str]) -> dict:
+    results = []
+    for name in names:
+        print(f"== {name}")
+        for result in SUITES[name]():
+            results.append({"suite": name, **asdict(result)})
+        print()
+
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()} {platform.node()}",
+        "results": results,
+    }
+
+
+def _write_run(run: dict, output: Path | None) -> Path:
+    if output is None:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        output = RESULTS_DIR / f"{stamp}-{run['commit'] or 'nogit'}.json"
+    output.write_text(json.dumps(run, ensure_ascii=False, indent=2), encoding="utf-8")
+    return output
+
+
+def _compare(baseline: dict, current: dict, threshold_percent: float) -> list[str]:
+    """Print a per-benchmark comparison of medians; return the regressed names."""
+    old = {(row["suite"], row["name"]): row for row in baseline["results"]}
+    regressions = []
+
+    print(f"baseline: {baseline.get('commit')} {baseline.get('created_at')}")
+    print(f"current:  {current.get('commit')} {current.get('created_at')}\n")
+    if baseline.get("machine") != current.get("machine"):
+        print("warning: runs come from different machines, differences may be noise\n")
+
+    for row in current["results"]:
+        key = (row["suite"], row["name"])
+        label = f"{row['suite']}/{row['name']}"
+        if key not in old:
+            print(f"  new   {label:<48} {row['median_us']:10.2f} us")
+            continue
+
+        before = old[key]["median_us"]
+        change = (row["median_us"] - before) / before * 100 if before else 0.0
+        regressed = change > threshold_percent
+        if regressed:
+            regressions.append(label)
+        print(
+            f"  {'SLOW' if regressed else 'ok  '}  {label:<48} "
+            f"{before:10.2f} -> {row['median_us']:10.2f} us  {change:+6.1f}%"
+        )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="default: all suites")
+    parser.add_argument("--output", type=Path, help="where to write the results JSON")
+    parser.add_argument("--baseline", type=Path, help="results JSON to compare against")
+    parser.add_argument("--current", type=Path, help="compare this results JSON instead of running")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed slowdown of the median, percent")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        if not args.baseline:
+            parser.error("--current requires --baseline")
+        current = json.loads(args.current.read_text(encoding="utf-8"))
+    else:
+        current = _run_suites(args.suite or list(SUITES))
+        print(f"results written to {_write_run(current, args.output)}")
+
+    if not args.baseline:
+        return 0
+
+    print()
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    regressions = _compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) slower than {args.threshold:.0f}%: " + ", ".join(regressions))
+        return 1
+    print(f"\nno regressions above {args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
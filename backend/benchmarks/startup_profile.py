@@ -0,0 +1,102 @@
+"""Cold-start profile of the API process with a pass/fail budget.
+
+Imports ``app.main`` in fresh interpreters, reports the median import time
+and the slowest modules from ``-X importtime``, and exits with status 1 when
+the median exceeds the budget or when a module that must stay lazy was
+imported at startup. Suitable as a CI step.
+
+Run from the backend directory::
+
+    python -m benchmarks.startup_profile
+    python -m benchmarks.startup_profile --budget-ms 1800   # tighter, on a known host
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (subprocesses inherit the defaults)
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Medians of about 1.0-1.5 s were measured on a single-CPU CI-class host; the
+# default leaves ~1.6x headroom over the slowest so shared-runner noise does
+# not fail the step. Eager document libraries are caught by LAZY_MODULES.
+DEFAULT_BUDGET_MS = 2500.0
+
+# Only needed to render documents; importing them at startup is a regression.
+LAZY_MODULES = ("docx", "lxml", "reportlab", "num2words")
+
+_TIMED_IMPORT = (
+    "import time\n"
+    "started = time.perf_counter()\n"
+    "import app.main\n"
+    "print(time.perf_counter() - started)\n"
+)
+
+
+def _run(importtime: bool) -> subprocess.CompletedProcess:
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _TIMED_IMPORT]
+    return subprocess.run(
+        command,
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """Return (self_us, cumulative_us, module) rows from ``-X importtime`` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), module.rstrip()))
+    return rows
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args(argv)
+
+    timings = [float(_run(importtime=False).stdout.strip()) * 1000 for _ in range(args.runs)]
+    median_ms = statistics.median(timings)
+
+    rows = _parse_importtime(_run(importtime=True).stderr)
+    print(f"import app.main: median {median_ms:.0f} ms over {args.runs} runs "
+          f"(min {min(timings):.0f}, max {max(timings):.0f}); budget {args.budget_ms:.0f} ms")
+    print(f"\nslowest modules by cumulative time (top {args.top}):")
+    for self_us, cumulative_us, module in sorted(rows, key=lambda row: -row[1])[: args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {module.strip()}")
+
+    imported = {module.strip() for _, _, module in rows}
+    eager = sorted(name for name in LAZY_MODULES if name in imported)
+
+    failed = False
+    if eager:
+        print(f"\nFAIL: imported at startup but should be lazy: {', '.join(eager)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"\nFAIL: cold start {median_ms:.0f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("\nOK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
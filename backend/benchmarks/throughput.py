@@ -0,0 +1,143 @@
+"""Multi-core throughput of the production server for different worker counts.
+
+Starts ``gunicorn -c gunicorn.conf.py`` with each ``--workers`` value, drives
+it with keep-alive clients running in separate processes (so the load
+generator is not limited by one GIL), then stops it with SIGTERM and reports
+requests per second, latency percentiles and scaling against the first run.
+
+Run from the backend directory, e.g. against an authenticated list endpoint::
+
+    python -m benchmarks.throughput --workers 1,4 --path /admin/bikes \\
+        --header "Authorization: Bearer <token>"
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (the server inherits the defaults)
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on port {port} within {timeout} s")
+
+
+def _client(args: tuple[int, str, dict[str, str], float]) -> tuple[int, int, list[float]]:
+    port, path, headers, duration = args
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies: list[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            connection.request("GET", path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        if response.status >= 400:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+    connection.close()
+    return len(latencies), errors, latencies
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(workers: int, path: str, headers: dict[str, str], duration: float, concurrency: int) -> dict:
+    port = _free_port()
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "BIND": f"127.0.0.1:{port}"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py"],
+        cwd=BACKEND_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until_up(port)
+        with multiprocessing.Pool(concurrency) as pool:
+            results = pool.map(_client, [(port, path, headers, duration)] * concurrency)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        exit_code = server.wait(timeout=60)
+
+    latencies = sorted(latency for _, _, chunk in results for latency in chunk)
+    requests = sum(count for count, _, _ in results)
+    return {
+        "workers": workers,
+        "requests": requests,
+        "errors": sum(errors for _, errors, _ in results),
+        "rps": requests / duration,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "shutdown_exit_code": exit_code,
+    }
+
+
+def main(argv: list[str] | None = None) -> list[dict]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", default=f"1,{os.cpu_count() or 1}")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--header", action="append", default=[], help='"Name: value", repeatable')
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=max(2, (os.cpu_count() or 1) * 2))
+    args = parser.parse_args(argv)
+
+    headers = dict(
+        (name.strip(), value.strip())
+        for name, value in (header.split(":", 1) for header in args.header)
+    )
+    worker_counts = sorted({int(value) for value in args.workers.split(",")})
+
+    results = []
+    for workers in worker_counts:
+        result = run(workers, args.path, headers, args.duration, args.concurrency)
+        results.append(result)
+        scaling = result["rps"] / results[0]["rps"] if results[0]["rps"] else 0.0
+        print(
+            f"workers={workers:<3} {result['rps']:9.1f} req/s  x{scaling:4.2f}  "
+            f"p50 {result['p50_ms']:7.1f} ms  p95 {result['p95_ms']:7.1f} ms  "
+            f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}  "
+            f"shutdown exit {result['shutdown_exit_code']}"
+        )
+    return results
+
+
+if __name__ == "__main__":
+    main()
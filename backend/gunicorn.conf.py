@@ -0,0 +1,59 @@
+"""Production server: ``gunicorn app.main:app -c gunicorn.conf.py``.
+
+Runs one uvicorn worker process per available CPU so bcrypt, Fernet and
+document rendering are spread over all cores. The application is imported
+once in the master (``preload_app``) and shared copy-on-write by workers;
+anything holding sockets or threads is re-created after fork. Workers
+append to the master's log files; only the master rotates them, at
+midnight, which is why ``preload_app`` must stay on.
+"""
+
+import os
+
+
+def _default_workers() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", _default_workers()))
+worker_class = "uvicorn_worker.UvicornWorker"
+preload_app = True
+
+# SIGTERM: stop accepting, finish in-flight requests, run lifespan shutdown
+# (which waits up to SHUTDOWN_DRAIN_TIMEOUT_SECONDS for YooKassa calls).
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+keepalive = 5
+
+# Heartbeat files on tmpfs, so a slow overlay filesystem cannot stall workers.
+worker_tmp_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+loglevel = os.getenv("LOG_LEVEL", "info")
+# Requests are logged by AccessLogMiddleware.
+accesslog = None
+
+
+def when_ready(server):
+    from modules.utils.config import settings
+
+    if server.cfg.workers > 1 and settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_BACKEND != "redis":
+        server.log.warning(
+            "RATE_LIMIT_BACKEND=%s keeps buckets per worker: with %s workers the effective "
+            "rate limits are %s times higher. Use RATE_LIMIT_BACKEND=redis.",
+            settings.RATE_LIMIT_BACKEND,
+            server.cfg.workers,
+            server.cfg.workers,
+        )
+
+
+def post_fork(server, worker):
+    # Connections opened by the master during preload must not be shared
+    # between processes; drop them without closing the parent's sockets.
+    from modules.connection_to_db.database import engine, replica_engine
+
+    engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.dispose(close=False)
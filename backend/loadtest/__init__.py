@@ -0,0 +1,4 @@
+"""Load-testing harness: local YooKassa and SMTP stand-ins and scripted user journeys.
+
+Run from the backend directory: ``python -m loadtest.run --help``.
+"""
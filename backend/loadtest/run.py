@@ -0,0 +1,244 @@
+"""End-to-end load test of the rental journey against a local production server.
+
+Starts the YooKassa emulator and the SMTP sink in this process, creates and
+seeds a scratch database, runs ``gunicorn -c gunicorn.conf.py`` pointed at
+all three, and drives ``--users`` concurrent virtual users through
+register -> fill profile -> admin approve -> contract -> sign -> pay ->
+webhook -> autopay. Prints p50/p95/p99 latency and throughput per step and
+exits with status 1 if any step failed.
+
+Run from the backend directory::
+
+    python -m loadtest.run --users 20 --iterations 3
+    python -m loadtest.run --users 50 --workers 4 \\
+        --database-url postgresql://.../loadtest --cancel-rate 0.05
+
+SQLite serializes writers, so keep ``--workers 1`` without a PostgreSQL
+``--database-url``; that URL must point to an empty scratch database.
+"""
+
+from __future__ import annotations
+
+from benchmarks import _env  # noqa: F401  (secrets defaults; the server inherits them)
+
+import argparse
+import http.client
+import json
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from loadtest.scenarios import RENTAL_STEPS, ApiClient, RentalJourney, StepRecorder
+from loadtest.smtp_sink import SmtpSink
+from loadtest.yookassa_emulator import EmulatorSettings, YooKassaEmulator
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+ADMIN_EMAIL = "loadtest-admin@example.com"
+ADMIN_PASSWORD = "LoadTestAdmin123!x"
+PRICING_BANDS = ((1, 3, 3000), (4, 11, 2500), (12, 52, 2000))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_up(port: int, server: subprocess.Popen, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Server exited with code {server.returncode}")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start on port {port} within {timeout} s")
+
+
+def _seed(bikes: int) -> None:
+    """Create the schema, an admin and enough free bikes for every journey."""
+    from sqlalchemy import inspect
+
+    from modules.connection_to_db.database import Base, SessionLocal, engine
+    from modules.models.models_alembic_import import Bike, BikePricing, Location, User
+    from modules.models.types import DocumentStatusEnum
+    from modules.utils.password_utils import hash_password
+
+    if inspect(engine).has_table(User.__tablename__):
+        raise SystemExit("База данных не пустая: укажите отдельную временную базу для нагрузочного теста")
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        session.add(
+            User(
+                email=ADMIN_EMAIL,
+                hashed_password=hash_password(ADMIN_PASSWORD),
+                role="admin",
+                status=DocumentStatusEnum.APPROVED,
+            )
+        )
+        location = Location(name="Склад", address="ул. Ломоносова, 9")
+        session.add(location)
+        session.flush()
+        session.add_all(
+            BikePricing(
+                type_id=1,
+                name_type="Курьерский",
+                min_weeks_count=min_weeks,
+                max_weeks_count=max_weeks,
+                amount_weeks=amount,
+            )
+            for min_weeks, max_weeks, amount in PRICING_BANDS
+        )
+        session.add_all(
+            Bike(number=f"LT{i:05d}", vin=f"LTVIN{i:012d}", name="Kugoo Kirin V1", type_id=1, location_id=location.id)
+            for i in range(bikes)
+        )
+        session.commit()
+    engine.dispose()
+
+
+def _print_report(rows: list[dict], outcomes: dict[str, int], wall_seconds: float) -> None:
+    print(f"\n{'step':<26} {'ok':>6} {'err':>5} {'ops/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for row in rows:
+        print(
+            f"{row['step']:<26} {row['ok']:>6} {row['errors']:>5} {row['throughput_per_s']:>8.2f} "
+            f"{row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['max_ms']:>9.1f}"
+        )
+    for row in rows:
+        if row["first_error"]:
+            print(f"  first error in '{row['step']}': {row['first_error']}")
+    print(f"\njourneys in {wall_seconds:.1f} s: " + ", ".join(f"{name}={count}" for name, count in sorted(outcomes.items())))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=1, help="journeys per virtual user")
+    parser.add_argument("--workers", type=int, default=1, help="gunicorn worker processes")
+    parser.add_argument("--database-url", help="empty scratch database; defaults to a temporary SQLite file")
+    parser.add_argument("--latency-ms", type=float, default=150.0, help="YooKassa API response latency")
+    parser.add_argument("--webhook-delay-ms", type=float, default=300.0, help="payment -> webhook delay")
+    parser.add_argument("--cancel-rate", type=float, default=0.0, help="share of payments YooKassa cancels")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of YooKassa calls answered with 500")
+    parser.add_argument("--output", type=Path, help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="loadtest-"))
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+
+    sink = SmtpSink().start()
+    emulator = YooKassaEmulator(
+        EmulatorSettings(
+            webhook_url=f"{base_url}/api/yookassa/webhook",
+            latency_ms=args.latency_ms,
+            webhook_delay_ms=args.webhook_delay_ms,
+            cancel_rate=args.cancel_rate,
+            error_rate=args.error_rate,
+        )
+    ).start()
+
+    server_env = {
+        "DATABASE_URL": args.database_url or f"sqlite:///{workdir / 'loadtest.db'}",
+        "SECURE_STORAGE_DIR": str(workdir / "secure_storage"),
+        "LOG_DIR": str(workdir / "logs"),
+        "YOOKASSA_SHOP_ID": "loadtest",
+        "YOOKASSA_SECRET_KEY": "loadtest",
+        "YOOKASSA_API_URL": emulator.url,
+        "YOOKASSA_RETURN_URL": f"{base_url}/return",
+        "SMTP_HOST": sink.address[0],
+        "SMTP_PORT": str(sink.address[1]),
+        "SMTP_USE_TLS": "false",
+        "SMTP_USE_SSL": "false",
+        # Every virtual user comes from 127.0.0.1.
+        "RATE_LIMIT_ENABLED": "false",
+        "WEB_CONCURRENCY": str(args.workers),
+        "BIND": f"127.0.0.1:{port}",
+    }
+    os.environ.update(server_env)
+    journeys = args.users * args.iterations
+    _seed(bikes=journeys)
+
+    server_log = (workdir / "server.log").open("wb")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "app.main:app", "-c", "gunicorn.conf.py"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+        stdout=server_log,
+        stderr=subprocess.STDOUT,
+    )
+    recorder = StepRecorder()
+    try:
+        _wait_until_up(port, server)
+        status, token = ApiClient(base_url, recorder).request(
+            "POST", "/auth/login", form={"username": ADMIN_EMAIL, "password": ADMIN_PASSWORD}
+        )
+        if status != 200:
+            raise RuntimeError(f"Admin login failed: HTTP {status} {token}")
+        journey = RentalJourney(base_url, recorder, sink, admin_token=token["access_token"])
+        run_id = uuid.uuid4().hex[:8]
+
+        def virtual_user(index: int) -> None:
+            for iteration in range(args.iterations):
+                number = index * args.iterations + iteration
+                journey.run(f"lt-{run_id}-{number}@example.com", f"LT{number:05d}")
+
+        print(
+            f"{args.users} virtual users x {args.iterations} journeys, {args.workers} worker(s), "
+            f"{server_env['DATABASE_URL'].split(':', 1)[0]}; YooKassa latency {args.latency_ms:.0f} ms, "
+            f"webhook after {args.webhook_delay_ms:.0f} ms, cancel {args.cancel_rate:.0%}, errors {args.error_rate:.0%}"
+        )
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.users) as pool:
+            list(pool.map(virtual_user, range(args.users)))
+        wall_seconds = time.perf_counter() - started
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=60)
+        server_log.close()
+        emulator.stop()
+        sink.stop()
+
+    rows = recorder.summary(RENTAL_STEPS, wall_seconds)
+    _print_report(rows, recorder.outcomes, wall_seconds)
+    print(f"YooKassa emulator: {json.dumps(emulator.stats.as_dict())}; e-mails received: {sink.messages_received}")
+
+    failed = sum(row["errors"] for row in rows)
+    if failed:
+        print(f"server log kept in {workdir / 'server.log'}")
+    else:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {
+                    "config": {key: str(value) for key, value in vars(args).items()},
+                    "wall_seconds": round(wall_seconds, 2),
+                    "steps": rows,
+                    "outcomes": dict(recorder.outcomes),
+                    "yookassa": emulator.stats.as_dict(),
+                },
+                ensure_ascii=False,
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
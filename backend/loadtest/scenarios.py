@@ -0,0 +1,267 @@
+"""Scripted user journeys and the per-step latency recorder they report to."""
+
+from __future__ import annotations
+
+import http.client
+import json
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from urllib.parse import urlencode, urlsplit
+
+from loadtest.smtp_sink import SmtpSink
+
+# Step names of the rental journey, in the order they are reported.
+RENTAL_STEPS = (
+    "register: request code",
+    "register: confirm",
+    "login",
+    "fill profile",
+    "submit profile",
+    "admin: approve",
+    "admin: create contract",
+    "admin: sign",
+    "payment schedule",
+    "pay",
+    "webhook -> paid",
+    "autopay charge",
+    "autopay webhook -> paid",
+)
+
+PASSWORD = "LoadTest123!x"
+
+
+class StepFailed(Exception):
+    pass
+
+
+class PaymentCanceled(Exception):
+    """The emulator declined the payment; the journey ends without an error."""
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class StepRecorder:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._latencies: dict[str, list[float]] = defaultdict(list)
+        self._errors: dict[str, int] = defaultdict(int)
+        self._error_samples: dict[str, str] = {}
+        self.outcomes: dict[str, int] = defaultdict(int)
+
+    def record(self, step: str, seconds: float, error: str | None = None) -> None:
+        with self._lock:
+            if error is None:
+                self._latencies[step].append(seconds)
+            else:
+                self._errors[step] += 1
+                self._error_samples.setdefault(step, error)
+
+    def outcome(self, name: str) -> None:
+        with self._lock:
+            self.outcomes[name] += 1
+
+    def summary(self, steps: tuple[str, ...], wall_seconds: float) -> list[dict]:
+        rows = []
+        with self._lock:
+            for step in steps:
+                latencies = sorted(self._latencies.get(step, ()))
+                rows.append(
+                    {
+                        "step": step,
+                        "ok": len(latencies),
+                        "errors": self._errors.get(step, 0),
+                        "throughput_per_s": round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0,
+                        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+                        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+                        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+                        "max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+                        "first_error": self._error_samples.get(step),
+                    }
+                )
+        return rows
+
+
+class ApiClient:
+    """One keep-alive connection per virtual user; every call is timed as a step."""
+
+    def __init__(self, base_url: str, recorder: StepRecorder, timeout: float = 60.0) -> None:
+        parts = urlsplit(base_url)
+        self._host = parts.hostname or "127.0.0.1"
+        self._port = parts.port or 80
+        self._timeout = timeout
+        self._recorder = recorder
+        self._connection = http.client.HTTPConnection(self._host, self._port, timeout=timeout)
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _send(
+        self, method: str, path: str, body: bytes | None, headers: dict[str, str]
+    ) -> tuple[int, bytes]:
+        try:
+            self._connection.request(method, path, body=body, headers=headers)
+            response = self._connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            # Reconnect once: the server may have closed an idle keep-alive connection.
+            self._connection.close()
+            self._connection = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+            self._connection.request(method, path, body=body, headers=headers)
+            response = self._connection.getresponse()
+            return response.status, response.read()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        json_body: dict | None = None,
+        form: dict | None = None,
+        token: str | None = None,
+    ) -> tuple[int, object]:
+        headers = {}
+        body = None
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        elif form is not None:
+            body = urlencode(form).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+
+        status, raw = self._send(method, path, body, headers)
+        try:
+            payload = json.loads(raw) if raw else None
+        except ValueError:
+            payload = raw.decode("utf-8", "replace")
+        return status, payload
+
+    def step(self, step: str, method: str, path: str, **kwargs) -> object:
+        started = time.perf_counter()
+        try:
+            status, payload = self.request(method, path, **kwargs)
+        except (OSError, http.client.HTTPException) as exc:
+            self._recorder.record(step, 0.0, f"{type(exc).__name__}: {exc}")
+            raise StepFailed(step) from exc
+
+        elapsed = time.perf_counter() - started
+        if status >= 400:
+            self._recorder.record(step, elapsed, f"HTTP {status}: {str(payload)[:200]}")
+            raise StepFailed(step)
+        self._recorder.record(step, elapsed)
+        return payload
+
+    def wait_for_order(
+        self, step: str, order_id: int, token: str, started: float, timeout: float, poll: float = 0.05
+    ) -> str:
+        """Poll the order until the webhook settles it; the step time starts at ``started``."""
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            status, payload = self.request("GET", f"/api/orders/{order_id}", token=token)
+            if status == 200 and payload["status"] in ("succeeded", "canceled"):
+                self._recorder.record(step, time.perf_counter() - started)
+                return payload["status"]
+            time.sleep(poll)
+        self._recorder.record(step, 0.0, f"order {order_id} not settled within {timeout} s")
+        raise StepFailed(step)
+
+
+@dataclass(frozen=True)
+class RentalJourney:
+    base_url: str
+    recorder: StepRecorder
+    sink: SmtpSink
+    admin_token: str
+    webhook_timeout: float = 30.0
+
+    def run(self, email: str, bike_number: str) -> None:
+        client = ApiClient(self.base_url, self.recorder)
+        try:
+            self._run(client, email, bike_number)
+            self.recorder.outcome("completed")
+        except PaymentCanceled:
+            self.recorder.outcome("payment canceled")
+        except StepFailed as exc:
+            self.recorder.outcome(f"failed at {exc}")
+        finally:
+            client.close()
+
+    def _run(self, client: ApiClient, email: str, bike_number: str) -> None:
+        admin = self.admin_token
+        client.step("register: request code", "POST", "/auth/register/code", json_body={"email": email})
+        code = self.sink.wait_for_message(email).code
+        user = client.step(
+            "register: confirm",
+            "POST",
+            "/auth/register",
+            json_body={"email": email, "code": code, "password": PASSWORD, "password_repeat": PASSWORD},
+        )
+        token = client.step(
+            "login", "POST", "/auth/login", form={"username": email, "password": PASSWORD}
+        )["access_token"]
+
+        client.step(
+            "fill profile",
+            "PUT",
+            "/users/me/document",
+            token=token,
+            json_body={
+                "last_name": "Нагрузочный",
+                "first_name": "Тест",
+                "patronymic": "Петрович",
+                "inn": 771234567890,
+                "registration_address": "г. Великий Новгород, ул. Большая Московская, д. 1",
+                "residential_address": "г. Великий Новгород, ул. Ломоносова, д. 9",
+                "passport": 4912345678,
+                "phone": "+79110000000",
+                "bank_account": 40817810099910004312,
+            },
+        )
+        client.step("submit profile", "POST", "/users/me/document/submit", token=token)
+
+        user_id = user["id"]
+        client.step("admin: approve", "POST", f"/admin/users/{user_id}/document/approve", token=admin)
+        document = client.step(
+            "admin: create contract",
+            "POST",
+            f"/admin/users/{user_id}/contracts",
+            token=admin,
+            json_body={"bike_serial": bike_number, "weeks_count": 4, "filled_date": date.today().isoformat()},
+        )
+        client.step(
+            "admin: sign", "POST", f"/admin/users/{user_id}/documents/{document['id']}/sign", token=admin
+        )
+
+        schedule = client.step("payment schedule", "GET", "/api/payments/schedule", token=token)
+        first, second = schedule[0], schedule[1]
+
+        paid = client.step(
+            "pay",
+            "POST",
+            "/api/payments/create",
+            token=token,
+            json_body={"schedule_payment_id": first["id"], "save_payment_method": True},
+        )
+        self._settle(client, "webhook -> paid", paid["order_id"], token)
+
+        charged = client.step(
+            "autopay charge",
+            "POST",
+            "/api/autopay/charge",
+            token=token,
+            json_body={"schedule_payment_id": second["id"]},
+        )
+        self._settle(client, "autopay webhook -> paid", charged["order_id"], token)
+
+    def _settle(self, client: ApiClient, step: str, order_id: int, token: str) -> None:
+        status = client.wait_for_order(step, order_id, token, time.perf_counter(), self.webhook_timeout)
+        if status == "canceled":
+            raise PaymentCanceled(order_id)
@@ -0,0 +1,162 @@
+"""Local SMTP server that accepts every message and keeps it in memory.
+
+Speaks the subset of SMTP that ``smtplib`` uses for plain (non-TLS)
+delivery, so the application can run with ``SMTP_USE_TLS=false`` against
+it. Load-test scenarios read registration codes from the sink instead of a
+real mailbox.
+
+Standalone: ``python -m loadtest.smtp_sink --port 8025`` prints every
+message it receives.
+"""
+
+from __future__ import annotations
+
+import argparse
+import email
+import re
+import socketserver
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from email import policy
+
+_CODE_RE = re.compile(r"Код подтверждения:\s*(\S+)")
+
+
+@dataclass(frozen=True)
+class ReceivedMessage:
+    recipients: tuple[str, ...]
+    subject: str
+    body: str
+    received_at: float
+
+    @property
+    def code(self) -> str | None:
+        match = _CODE_RE.search(self.body)
+        return match.group(1) if match else None
+
+
+class SmtpSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, echo: bool = False) -> None:
+        self.echo = echo
+        self._mailboxes: dict[str, list[ReceivedMessage]] = defaultdict(list)
+        self._received = threading.Condition()
+        self.messages_received = 0
+        self._server = socketserver.ThreadingTCPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._server.server_address[:2]
+        return host, port
+
+    def start(self) -> "SmtpSink":
+        threading.Thread(target=self._server.serve_forever, name="smtp-sink", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def deliver(self, recipients: list[str], raw: bytes) -> None:
+        parsed = email.message_from_bytes(raw, policy=policy.default)
+        body_part = parsed.get_body(preferencelist=("plain",))
+        message = ReceivedMessage(
+            recipients=tuple(recipients),
+            subject=str(parsed.get("Subject", "")),
+            body=body_part.get_content() if body_part else "",
+            received_at=time.monotonic(),
+        )
+        with self._received:
+            for recipient in recipients:
+                self._mailboxes[recipient.lower()].append(message)
+            self.messages_received += 1
+            self._received.notify_all()
+        if self.echo:
+            print(f"--- {', '.join(recipients)}: {message.subject}\n{message.body}")
+
+    def wait_for_message(self, recipient: str, timeout: float = 10.0) -> ReceivedMessage:
+        """Return the latest message for ``recipient``, waiting for the first one if needed."""
+        deadline = time.monotonic() + timeout
+        with self._received:
+            while not self._mailboxes.get(recipient.lower()):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No message for {recipient} within {timeout} s")
+                self._received.wait(remaining)
+            return self._mailboxes[recipient.lower()][-1]
+
+
+def _make_handler(sink: SmtpSink) -> type[socketserver.StreamRequestHandler]:
+    class Handler(socketserver.StreamRequestHandler):
+        def reply(self, line: str) -> None:
+            self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+        def handle(self) -> None:
+            self.reply("220 smtp-sink ESMTP ready")
+            recipients: list[str] = []
+            while True:
+                line = self.rfile.readline()
+                if not line:
+                    return
+                command = line.decode("utf-8", "replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    self.wfile.write(b"250-smtp-sink\r\n250-8BITMIME\r\n250 AUTH PLAIN LOGIN\r\n")
+                elif verb in ("HELO", "NOOP"):
+                    self.reply("250 OK")
+                elif verb == "AUTH":
+                    self.reply("235 Authentication successful")
+                elif verb == "MAIL":
+                    recipients = []
+                    self.reply("250 OK")
+                elif verb == "RCPT":
+                    recipients.append(command.split(":", 1)[1].split()[0].strip("<>"))
+                    self.reply("250 OK")
+                elif verb == "DATA":
+                    self.reply("354 End data with <CR><LF>.<CR><LF>")
+                    sink.deliver(recipients, self._read_data())
+                    self.reply("250 OK: queued")
+                elif verb == "RSET":
+                    recipients = []
+                    self.reply("250 OK")
+                elif verb == "QUIT":
+                    self.reply("221 Bye")
+                    return
+                else:
+                    self.reply("502 Command not implemented")
+
+        def _read_data(self) -> bytes:
+            lines = []
+            while True:
+                line = self.rfile.readline()
+                if not line or line in (b".\r\n", b".\n"):
+                    break
+                # Undo dot-stuffing.
+                lines.append(line[1:] if line.startswith(b"..") else line)
+            return b"".join(lines)
+
+    return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args(argv)
+
+    sink = SmtpSink(args.host, args.port, echo=True).start()
+    print(f"SMTP sink on {args.host}:{sink.address[1]}; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.stop()
+
+
+if __name__ == "__main__":
+    main()
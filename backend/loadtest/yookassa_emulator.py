@@ -0,0 +1,277 @@
+"""Local stand-in for the YooKassa API.
+
+Implements the calls ``YooKassaClient`` makes (``POST /payments``,
+``GET /payments/{id}``, ``POST /refunds``) and, like the real service,
+reports the outcome of a payment asynchronously: after ``webhook_delay_ms``
+it posts a ``payment.succeeded`` or ``payment.canceled`` notification to the
+application's webhook and retries delivery on errors. Response latency, the
+share of canceled payments and the share of failing API calls are
+configurable, so degraded provider behaviour can be load-tested too.
+
+Standalone: ``python -m loadtest.yookassa_emulator --port 8081
+--webhook-url http://127.0.0.1:8000/api/yookassa/webhook`` and point
+``YOOKASSA_API_URL`` of the application at it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import error, request
+
+WEBHOOK_ATTEMPTS = 5
+
+
+@dataclass
+class EmulatorSettings:
+    webhook_url: str | None = None
+    latency_ms: float = 150.0
+    latency_jitter_ms: float = 50.0
+    webhook_delay_ms: float = 300.0
+    cancel_rate: float = 0.0
+    error_rate: float = 0.0
+    seed: int | None = None
+
+
+@dataclass
+class EmulatorStats:
+    payments_created: int = 0
+    refunds_created: int = 0
+    api_errors_injected: int = 0
+    idempotent_replays: int = 0
+    webhooks_delivered: int = 0
+    webhooks_failed: int = 0
+    webhook_retries: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def as_dict(self) -> dict[str, int]:
+        with self.lock:
+            return {name: value for name, value in vars(self).items() if name != "lock"}
+
+
+def _now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class YooKassaEmulator:
+    def __init__(self, settings: EmulatorSettings, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.settings = settings
+        self.stats = EmulatorStats()
+        self._random = random.Random(settings.seed)
+        self._random_lock = threading.Lock()
+        self._payments: dict[str, dict] = {}
+        self._idempotent: dict[str, tuple[int, dict]] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "YooKassaEmulator":
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="yookassa-emulator", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _chance(self, rate: float) -> bool:
+        with self._random_lock:
+            return rate > 0 and self._random.random() < rate
+
+    def _sleep_latency(self) -> None:
+        with self._random_lock:
+            jitter = self._random.uniform(-1, 1) * self.settings.latency_jitter_ms
+        time.sleep(max(0.0, self.settings.latency_ms + jitter) / 1000)
+
+    def handle(self, method: str, path: str, headers, body: bytes) -> tuple[int, dict]:
+        if not headers.get("Authorization", "").startswith("Basic "):
+            return 401, {"type": "error", "code": "invalid_credentials"}
+
+        self._sleep_latency()
+        if self._chance(self.settings.error_rate):
+            self.stats.add("api_errors_injected")
+            return 500, {"type": "error", "code": "internal_server_error"}
+
+        if method == "GET" and path.startswith("/payments/"):
+            with self._lock:
+                payment = self._payments.get(path.rsplit("/", 1)[-1])
+            return (200, payment) if payment else (404, {"type": "error", "code": "not_found"})
+
+        if method != "POST" or path not in ("/payments", "/refunds"):
+            return 404, {"type": "error", "code": "not_found"}
+
+        key = headers.get("Idempotence-Key")
+        if not key:
+            return 400, {"type": "error", "code": "invalid_request", "parameter": "Idempotence-Key"}
+        with self._lock:
+            replay = self._idempotent.get(key)
+        if replay:
+            self.stats.add("idempotent_replays")
+            return replay
+
+        payload = json.loads(body or b"{}")
+        response = self._create_payment(payload) if path == "/payments" else self._create_refund(payload)
+        with self._lock:
+            self._idempotent[key] = response
+        return response
+
+    def _create_payment(self, payload: dict) -> tuple[int, dict]:
+        payment_id = str(uuid.uuid4())
+        saved_method_id = payload.get("payment_method_id")
+        payment = {
+            "id": payment_id,
+            "status": "pending",
+            "paid": False,
+            "amount": payload.get("amount"),
+            "description": payload.get("description"),
+            "metadata": payload.get("metadata", {}),
+            "created_at": _now_iso(),
+            "test": True,
+            "payment_method": {
+                "type": "bank_card",
+                "id": saved_method_id or str(uuid.uuid4()),
+                "saved": bool(saved_method_id),
+            },
+        }
+        if not saved_method_id:
+            payment["confirmation"] = {
+                "type": "redirect",
+                "confirmation_url": f"{self.url}/checkout/{payment_id}",
+            }
+
+        with self._lock:
+            self._payments[payment_id] = payment
+        self.stats.add("payments_created")
+
+        if self.settings.webhook_url:
+            canceled = self._chance(self.settings.cancel_rate)
+            timer = threading.Timer(
+                self.settings.webhook_delay_ms / 1000,
+                self._finish_payment,
+                args=(payment_id, canceled, bool(payload.get("save_payment_method"))),
+            )
+            timer.daemon = True
+            timer.start()
+        return 200, payment
+
+    def _create_refund(self, payload: dict) -> tuple[int, dict]:
+        self.stats.add("refunds_created")
+        return 200, {
+            "id": str(uuid.uuid4()),
+            "status": "succeeded",
+            "payment_id": payload.get("payment_id"),
+            "amount": payload.get("amount"),
+            "created_at": _now_iso(),
+        }
+
+    def _finish_payment(self, payment_id: str, canceled: bool, save_method: bool) -> None:
+        with self._lock:
+            payment = self._payments[payment_id]
+            payment["status"] = "canceled" if canceled else "succeeded"
+            payment["paid"] = not canceled
+            if canceled:
+                payment["cancellation_details"] = {"party": "payment_network", "reason": "general_decline"}
+            else:
+                payment["captured_at"] = _now_iso()
+                payment["payment_method"]["saved"] = payment["payment_method"]["saved"] or save_method
+            notification = {
+                "type": "notification",
+                "event": f"payment.{payment['status']}",
+                "object": json.loads(json.dumps(payment)),
+            }
+        self._deliver(notification)
+
+    def _deliver(self, notification: dict) -> None:
+        data = json.dumps(notification).encode("utf-8")
+        for attempt in range(WEBHOOK_ATTEMPTS):
+            req = request.Request(self.settings.webhook_url, data=data, method="POST")
+            req.add_header("Content-Type", "application/json")
+            try:
+                with request.urlopen(req, timeout=30) as response:
+                    response.read()
+                self.stats.add("webhooks_delivered")
+                return
+            except (error.URLError, OSError):
+                self.stats.add("webhook_retries")
+                time.sleep(0.5 * 2**attempt)
+        self.stats.add("webhooks_failed")
+
+
+def _make_handler(emulator: YooKassaEmulator) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status_code, payload = emulator.handle(self.command, self.path.rstrip("/"), self.headers, body)
+            data = json.dumps(payload).encode("utf-8")
+            self.send_response(status_code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = _respond
+        do_POST = _respond
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--webhook-url")
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--webhook-delay-ms", type=float, default=300.0)
+    parser.add_argument("--cancel-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    emulator = YooKassaEmulator(
+        EmulatorSettings(
+            webhook_url=args.webhook_url,
+            latency_ms=args.latency_ms,
+            webhook_delay_ms=args.webhook_delay_ms,
+            cancel_rate=args.cancel_rate,
+            error_rate=args.error_rate,
+        ),
+        host=args.host,
+        port=args.port,
+    ).start()
+    print(f"YooKassa emulator on {emulator.url}; Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        emulator.stop()
+        print(json.dumps(emulator.stats.as_dict()))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,55 @@ from __future__ import annotations
 
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 
+from modules.connection_to_db.pool_metrics import InstrumentedQueuePool
+from modules.connection_to_db.replica import ReplicaRouter
 from modules.utils.config import settings
+from modules.utils.request_metrics import install_query_metrics
+from modules.utils.slow_query_log import install_slow_query_log
 
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_size=10,
-    max_overflow=20,
-    pool_pre_ping=True,
-    echo=False,
-    future=True,
+def _create_engine(url: str) -> Engine:
+    if settings.DB_POOL_LIVENESS == "pre_ping":
+        # One round trip per checkout, but a dead connection is never handed out.
+        liveness = {"pool_pre_ping": True, "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS}
+    elif settings.DB_POOL_LIVENESS == "recycle":
+        # No per-checkout ping: connections are replaced once they reach the
+        # recycle age, and a disconnect error invalidates the whole pool.
+        if settings.DB_POOL_RECYCLE_SECONDS <= 0:
+            raise RuntimeError("DB_POOL_LIVENESS=recycle требует DB_POOL_RECYCLE_SECONDS > 0")
+        liveness = {"pool_pre_ping": False, "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS}
+    else:
+        raise RuntimeError("DB_POOL_LIVENESS должен быть pre_ping или recycle")
+
+    created = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        echo=False,
+        future=True,
+        **liveness,
+    )
+    install_query_metrics(created)
+    install_slow_query_log(created)
+    return created
+
+
+engine = _create_engine(settings.DATABASE_URL)
+replica_engine = (
+    _create_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
+)
+
+replica_router = ReplicaRouter(
+    engine,
+    replica_engine,
+    max_lag_seconds=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+    check_interval_seconds=settings.DATABASE_REPLICA_CHECK_INTERVAL_SECONDS,
 )
 
 SessionLocal: sessionmaker[Session] = sessionmaker(
@@ -24,6 +60,20 @@ SessionLocal: sessionmaker[Session] = sessionmaker(
     expire_on_commit=False,
 )
 
+# Bound per session by get_read_session: the replica when it is usable,
+# otherwise the primary.
+ReadSessionLocal: sessionmaker[Session] = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+@event.listens_for(ReadSessionLocal, "before_flush")
+def _reject_read_session_writes(session, flush_context, instances) -> None:
+    # Fail the same way in development (no replica) as in production.
+    raise RuntimeError("Read-only session cannot write; use get_session")
+
 Base = declarative_base()
 
 
@@ -33,3 +83,16 @@ def get_session() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def open_read_session() -> Session:
+    return ReadSessionLocal(bind=replica_router.get_engine())
+
+
+def get_read_session() -> Generator[Session, None, None]:
+    """Session for handlers that only read; may lag behind the primary by a few seconds."""
+    db = open_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+from modules.utils.request_metrics import current_request_metrics
+
+_WINDOW = 1024
+
+
+def _percentile(ordered: list[float], fraction: float) -> float | None:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def _window_summary(values: deque[float]) -> dict[str, float | None]:
+    ordered = sorted(values)
+    return {
+        "p50_ms": _ms(_percentile(ordered, 0.50)),
+        "p95_ms": _ms(_percentile(ordered, 0.95)),
+        "max_ms": _ms(ordered[-1] if ordered else None),
+    }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _round(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds, 3)
+
+
+class PoolStats:
+    """Counters and recent samples for one pool; percentiles cover the last 1024 checkouts."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.connections_opened = 0
+        self.invalidations = 0
+        self.peak_overflow = 0
+        self._waits: deque[float] = deque(maxlen=_WINDOW)
+        self._checkouts: deque[float] = deque(maxlen=_WINDOW)
+        self._ages: deque[float] = deque(maxlen=_WINDOW)
+
+    def record_wait(self, seconds: float, overflow: int) -> None:
+        with self._lock:
+            self._waits.append(seconds)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self._checkouts.append(seconds)
+
+    def record_age(self, seconds: float) -> None:
+        with self._lock:
+            self._ages.append(seconds)
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            ages = sorted(self._ages)
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "connections_opened": self.connections_opened,
+                "invalidations": self.invalidations,
+                "peak_overflow": self.peak_overflow,
+                "wait": _window_summary(self._waits),
+                "checkout": _window_summary(self._checkouts),
+                "connection_age_seconds": {
+                    "p50": _round(_percentile(ages, 0.50)),
+                    "max": _round(ages[-1] if ages else None),
+                },
+            }
+
+
+def _listen(pool: QueuePool, stats: PoolStats) -> None:
+    # The listeners close over the stats rather than the pool: ``recreate()``
+    # copies them into the new pool, and a bound method would keep the
+    # disposed pool alive.
+    def on_connect(dbapi_connection, connection_record) -> None:
+        connection_record.info["connected_at"] = time.monotonic()
+        stats.record_connect()
+
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        connected_at = connection_record.info.get("connected_at")
+        if connected_at is not None:
+            stats.record_age(time.monotonic() - connected_at)
+
+    def on_invalidate(dbapi_connection, connection_record, exception) -> None:
+        stats.record_invalidation()
+
+    event.listen(pool, "connect", on_connect)
+    event.listen(pool, "checkout", on_checkout)
+    event.listen(pool, "invalidate", on_invalidate)
+    event.listen(pool, "soft_invalidate", on_invalidate)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that measures how long checkouts take and how old connections are.
+
+    ``wait`` is the time spent getting a connection out of the queue
+    (including opening a new one); ``checkout`` additionally covers the
+    pre-ping, if enabled. The stats survive ``engine.dispose()``: the
+    recreated pool keeps counting into the same ``PoolStats``.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        # A pool built by recreate() gets the listeners with the old dispatch.
+        if kwargs.get("_dispatch") is None:
+            _listen(self, self.stats)
+
+    def recreate(self) -> InstrumentedQueuePool:
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+    def connect(self):
+        started = time.perf_counter()
+        connection = super().connect()
+        self.stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            self.stats.record_wait(waited, max(self.overflow(), 0))
+            metrics = current_request_metrics.get()
+            if metrics is not None:
+                metrics.pool_wait_seconds += waited
+
+
+def pool_snapshot(pool) -> dict[str, Any]:
+    snapshot: dict[str, Any] = {}
+    if isinstance(pool, QueuePool):
+        size = pool.size()
+        checked_out = pool.checkedout()
+        snapshot.update(
+            size=size,
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+            checked_out=checked_out,
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            headroom=size + max(pool._max_overflow, 0) - checked_out,
+        )
+    stats = getattr(pool, "stats", None)
+    if isinstance(stats, PoolStats):
+        snapshot.update(stats.snapshot())
+    return snapshot
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+# Replay lag in seconds. A standby that has replayed everything it received is
+# not lagging even if the primary has been idle for a while (in which case
+# pg_last_xact_replay_timestamp() is simply old).
+_POSTGRES_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def _replication_lag(connection: Connection) -> float:
+    if connection.dialect.name == "postgresql":
+        return float(connection.execute(_POSTGRES_LAG_SQL).scalar_one())
+    # Other backends (e.g. two SQLite files in development) have no notion of
+    # replication: reachable means usable.
+    connection.execute(text("SELECT 1"))
+    return 0.0
+
+
+class ReplicaRouter:
+    """Chooses the engine for read-only sessions.
+
+    The replica is used while it is reachable and its lag is within
+    ``max_lag_seconds``; otherwise reads go to the primary. The check runs at
+    most once per ``check_interval_seconds`` and only in one thread at a
+    time, other threads use the last known state meanwhile.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replica: Engine | None,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+    ) -> None:
+        self.primary = primary
+        self.replica = replica
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._lock = threading.Lock()
+        self._healthy: bool | None = None
+        self._lag: float | None = None
+        self._checked_at: float | None = None
+
+    def get_engine(self) -> Engine:
+        if self.replica is None:
+            return self.primary
+
+        checked_at = self._checked_at
+        if (
+            checked_at is None or time.monotonic() - checked_at >= self.check_interval_seconds
+        ) and self._lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._lock.release()
+
+        return self.replica if self._healthy else self.primary
+
+    def status(self) -> dict:
+        return {
+            "configured": self.replica is not None,
+            "healthy": bool(self._healthy),
+            "lag_seconds": self._lag,
+        }
+
+    def _refresh(self) -> None:
+        try:
+            with self.replica.connect() as connection:
+                lag = _replication_lag(connection)
+        except Exception as exc:
+            healthy, lag = False, None
+            reason = f"недоступна: {exc}"
+        else:
+            healthy = lag <= self.max_lag_seconds
+            reason = f"отставание {lag:.1f} с"
+
+        if healthy != self._healthy:
+            if healthy:
+                logger.info("Реплика БД снова используется для чтения (%s)", reason)
+            else:
+                logger.warning("Чтение переключено на основную БД: реплика %s", reason)
+
+        self._healthy = healthy
+        self._lag = lag
+        self._checked_at = time.monotonic()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Date, ForeignKey, Integer, String, Text
+from sqlalchemy import Column, Date, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 
 from modules.connection_to_db.database import Base
@@ -32,6 +32,28 @@ class Bike(Base):
 
     location = relationship("Location", back_populates="bikes")
 
+    # Trigram indexes for ILIKE search (PostgreSQL, created by migration c81f4e2a9d63).
+    __table_args__ = (
+        Index(
+            "ix_bikes_number_trgm",
+            "number",
+            postgresql_using="gin",
+            postgresql_ops={"number": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_bikes_vin_trgm",
+            "vin",
+            postgresql_using="gin",
+            postgresql_ops={"vin": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_bikes_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
+
 
 class Battery(Base):
     __tablename__ = "batteries"
@@ -48,6 +70,15 @@ class Battery(Base):
 
     location = relationship("Location", back_populates="batteries")
 
+    __table_args__ = (
+        Index(
+            "ix_batteries_number_trgm",
+            "number",
+            postgresql_using="gin",
+            postgresql_ops={"number": "gin_trgm_ops"},
+        ),
+    )
+
 
 class BikePricing(Base):
     __tablename__ = "bike_pricing"
@@ -7,3 +7,7 @@ from .payment import ContractPayment, Order, Payment
 from .inventory import Bike, Battery, BikePricing, Location
 
 from .return_act import ReturnAct
+
+from .user_counter import UserCounter
+
+from .payment_idempotency_key import PaymentIdempotencyKey
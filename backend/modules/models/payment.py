@@ -6,6 +6,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
@@ -41,12 +42,27 @@ class Order(Base):
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        # Succeeded payments of an order; also serves plain order_id lookups.
+        Index("ix_payments_order_id_status", "order_id", "status"),
+        # Latest saved card of a user, looked up when autopay is enabled.
+        Index(
+            "ix_payments_user_saved_method",
+            "user_id",
+            "created_at",
+            postgresql_where=text("status = 'succeeded' AND payment_method_id IS NOT NULL"),
+            sqlite_where=text("status = 'succeeded' AND payment_method_id IS NOT NULL"),
+        ),
+        # Stale pending payments for the reconciliation job; also serves
+        # plain status lookups.
+        Index("ix_payments_status_updated_at", "status", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False, index=True)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     yookassa_payment_id = Column(String(64), nullable=True, unique=True, index=True)
-    status = Column(String(32), nullable=False, default="pending", server_default="pending", index=True)
+    status = Column(String(32), nullable=False, default="pending", server_default="pending")
     amount = Column(Numeric(10, 2), nullable=False)
     currency = Column(String(3), nullable=False, default="RUB", server_default="RUB")
     confirmation_url = Column(Text, nullable=True)
@@ -63,9 +79,16 @@ class Payment(Base):
 
 class ContractPayment(Base):
     __tablename__ = "contract_payments"
+    __table_args__ = (
+        # Schedule listings, ordered by number. Leads with user_id, so it also
+        # covers the foreign key.
+        Index("ix_contract_payments_user_id_payment_number", "user_id", "payment_number"),
+        # Pending/overdue items of a user (autopay, contract recalculation).
+        Index("ix_contract_payments_user_id_status_due_date", "user_id", "status", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     document_id = Column(Integer, ForeignKey("user_documents.id", ondelete="CASCADE"), nullable=False, index=True)
     payment_number = Column(Integer, nullable=False)
     due_date = Column(Date, nullable=False)
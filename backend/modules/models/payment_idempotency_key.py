@@ -0,0 +1,26 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text
+from sqlalchemy.orm import relationship
+
+from modules.connection_to_db.database import Base
+
+
+class PaymentIdempotencyKey(Base):
+    __tablename__ = "payment_idempotency_keys"
+    __table_args__ = (
+        Index("ix_payment_idempotency_keys_user_id_key", "user_id", "key", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    key = Column(String(128), nullable=False)
+    request_hash = Column(String(64), nullable=False)
+    # Sent to YooKassa as its Idempotence-Key.
+    provider_key = Column(String(64), nullable=False)
+    status = Column(String(16), nullable=False)
+    payment_id = Column(Integer, ForeignKey("payments.id", ondelete="SET NULL"), nullable=True)
+    response = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
+
+    payment = relationship("Payment")
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, ForeignKey, Integer, String
+
+from modules.connection_to_db.database import Base
+
+
+class UserCounter(Base):
+    __tablename__ = "user_counters"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    name = Column(String(32), primary_key=True)
+    value = Column(Integer, nullable=False, default=0, server_default="0")
@@ -1,6 +1,6 @@
 from datetime import date, timedelta
 
-from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import Session, relationship
 
@@ -9,6 +9,10 @@ from modules.connection_to_db.database import Base
 
 class UserDocument(Base):
     __tablename__ = "user_documents"
+    __table_args__ = (
+        # A user's documents, newest first; also the only index on user_id.
+        Index("ix_user_documents_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -18,6 +22,9 @@ class UserDocument(Base):
     akb1_serial = Column(String, nullable=True)
     akb2_serial = Column(String, nullable=True)
     akb3_serial = Column(String, nullable=True)
+    bike_serial_hash = Column(String(64), nullable=True, index=True)
+    akb1_serial_hash = Column(String(64), nullable=True, index=True)
+    akb2_serial_hash = Column(String(64), nullable=True, index=True)
     amount = Column(String, nullable=True)
     amount_text = Column(String, nullable=True)
     weeks_count = Column(Integer, nullable=True)
@@ -0,0 +1,51 @@
+from datetime import date, datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field, model_validator
+
+from modules.schemas.document_schemas import DocumentFileFormat
+
+
+class ContractExportStatusFilter(str, Enum):
+    all = "all"
+    signed = "signed"
+    active = "active"
+    closed = "closed"
+
+
+class ContractExportState(str, Enum):
+    pending = "pending"
+    running = "running"
+    completed = "completed"
+    failed = "failed"
+
+
+class ContractExportCreateRequest(BaseModel):
+    date_from: date = Field(..., description="Начало периода по дате заполнения договора")
+    date_to: date = Field(..., description="Конец периода по дате заполнения договора")
+    status: ContractExportStatusFilter = ContractExportStatusFilter.signed
+    file_format: DocumentFileFormat = DocumentFileFormat.docx
+
+    @model_validator(mode="after")
+    def validate_period(self) -> "ContractExportCreateRequest":
+        if self.date_from > self.date_to:
+            raise ValueError("date_from не может быть позже date_to")
+        return self
+
+
+class ContractExportJobRead(BaseModel):
+    id: str
+    state: ContractExportState
+    status: ContractExportStatusFilter
+    file_format: DocumentFileFormat
+    date_from: date
+    date_to: date
+    requested_by: int
+    total: int = 0
+    processed: int = 0
+    failed: int = 0
+    errors: list[str] = Field(default_factory=list)
+    created_at: datetime
+    updated_at: datetime
+    finished_at: datetime | None = None
+    download_url: str | None = None
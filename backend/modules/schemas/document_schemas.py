@@ -16,6 +16,11 @@ class DocumentStatus(str, Enum):
     rejected = "rejected"
 
 
+class DocumentFileFormat(str, Enum):
+    docx = "docx"
+    pdf = "pdf"
+
+
 def _validate_digits_only(value: str | int | None, field_name: str) -> int | None:
     if value is None:
         return None
@@ -11,6 +11,12 @@ class AssetStatus(str, Enum):
     DECOMMISSIONED = "decommissioned"
 
 
+class InventorySearchKind(str, Enum):
+    ALL = "all"
+    BIKE = "bike"
+    BATTERY = "battery"
+
+
 class ActiveContractInfo(BaseModel):
     contract_number: str | None = None
     user_full_name: str | None = None
@@ -144,3 +150,47 @@ class BikePricingRead(BikePricingBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class InventoryImportRowError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class InventoryImportResult(BaseModel):
+    created: int
+    errors: list[InventoryImportRowError] = Field(default_factory=list)
+
+
+class BikeSearchItem(BaseModel):
+    id: int
+    number: str
+    vin: str
+    name: str
+    status: AssetStatus
+    type_id: int | None = None
+    location_id: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class BatterySearchItem(BaseModel):
+    id: int
+    number: str
+    name: str
+    status: AssetStatus
+    location_id: int | None = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class InventorySearchResult(BaseModel):
+    bikes: list[BikeSearchItem] = Field(default_factory=list)
+    batteries: list[BatterySearchItem] = Field(default_factory=list)
+
+
+class InventoryAvailabilityResult(BaseModel):
+    start: date
+    end: date
+    bikes: list[BikeSearchItem] = Field(default_factory=list)
+    batteries: list[BatterySearchItem] = Field(default_factory=list)
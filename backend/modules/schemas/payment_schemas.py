@@ -1,5 +1,6 @@
 from datetime import date, datetime
 from decimal import Decimal
+from enum import Enum
 
 from pydantic import BaseModel, Field
 
@@ -85,4 +86,9 @@ class ContractPaymentRead(BaseModel):
     payment_id: int | None
     paid_at: datetime | None
 
-    model_config = {"from_attributes": True}
\ No newline at end of file
+    model_config = {"from_attributes": True}
+
+
+class PaymentExportFormat(str, Enum):
+    csv = "csv"
+    xlsx = "xlsx"
\ No newline at end of file
@@ -0,0 +1,86 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class LatencySummary(BaseModel):
+    p50_ms: float | None = None
+    p95_ms: float | None = None
+    max_ms: float | None = None
+
+
+class ConnectionAgeSummary(BaseModel):
+    p50: float | None = None
+    max: float | None = None
+
+
+class PoolMetricsRead(BaseModel):
+    size: int | None = None
+    max_overflow: int | None = None
+    timeout_seconds: float | None = None
+    checked_out: int | None = None
+    idle: int | None = None
+    overflow: int | None = None
+    headroom: int | None = None
+    checkouts: int = 0
+    timeouts: int = 0
+    connections_opened: int = 0
+    invalidations: int = 0
+    peak_overflow: int = 0
+    wait: LatencySummary = LatencySummary()
+    checkout: LatencySummary = LatencySummary()
+    connection_age_seconds: ConnectionAgeSummary = ConnectionAgeSummary()
+
+
+class ReplicaStatusRead(BaseModel):
+    configured: bool
+    healthy: bool
+    lag_seconds: float | None = None
+
+
+class DatabaseMetricsRead(BaseModel):
+    liveness: str
+    recycle_seconds: int
+    primary: PoolMetricsRead
+    replica: PoolMetricsRead | None = None
+    replica_status: ReplicaStatusRead
+
+
+class CircuitBreakerRead(BaseModel):
+    state: str
+    retry_after_seconds: float | None = None
+    consecutive_failures: int
+    in_flight: int
+    max_concurrent_calls: int
+    calls: int
+    failures: int
+    slow_calls: int
+    rejected_open: int
+    rejected_bulkhead: int
+    times_opened: int
+
+
+class SystemMetricsRead(BaseModel):
+    database: DatabaseMetricsRead
+    yookassa: CircuitBreakerRead
+
+
+class ProfileFileFormat(str, Enum):
+    prof = "prof"
+    text = "text"
+
+
+class ProfileRead(BaseModel):
+    id: str
+    method: str
+    path: str
+    route: str | None = None
+    status_code: int | None = None
+    duration_ms: float
+    size_bytes: int | None = None
+    request_id: str | None = None
+    requested_by: int
+    created_at: datetime
+    error: str | None = None
+    download_url: str | None = None
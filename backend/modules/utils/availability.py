@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+import time
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from modules.models.user_document import UserDocument
+from modules.utils.config import settings
+from modules.utils.document_security import get_sensitive_data_cipher
+
+BIKE = "bike"
+BATTERY = "battery"
+
+# A bike and a battery may share a serial string, so keys are (asset kind, hash).
+_HASH_COLUMNS = (
+    (BIKE, "bike_serial_hash"),
+    (BATTERY, "akb1_serial_hash"),
+    (BATTERY, "akb2_serial_hash"),
+)
+_SerialKey = tuple[str, str]
+
+
+@lru_cache(maxsize=65536)
+def serial_hash(serial: str) -> str | None:
+    return get_sensitive_data_cipher().blind_index(serial)
+
+
+@dataclass(frozen=True)
+class _Intervals:
+    """Occupied [start, end] date intervals of one asset, sorted by start.
+
+    ``max_end[i]`` is the latest end among the first ``i + 1`` intervals, so an
+    overlap test is one bisect plus one comparison.
+    """
+
+    starts: tuple[date, ...]
+    ends: tuple[date, ...]
+    max_end: tuple[date, ...]
+    document_ids: tuple[int, ...]
+
+    @classmethod
+    def build(cls, items: Iterable[tuple[date, date, int]]) -> "_Intervals":
+        ordered = sorted(items)
+        max_end: list[date] = []
+        for _, end, _ in ordered:
+            max_end.append(end if not max_end or end > max_end[-1] else max_end[-1])
+        return cls(
+            starts=tuple(start for start, _, _ in ordered),
+            ends=tuple(end for _, end, _ in ordered),
+            max_end=tuple(max_end),
+            document_ids=tuple(doc_id for _, _, doc_id in ordered),
+        )
+
+    def overlaps(self, start: date, end: date) -> bool:
+        # Intervals that start after ``end`` cannot overlap; among the rest it is
+        # enough to know whether any of them ends on or after ``start``.
+        count = bisect_right(self.starts, end)
+        return count > 0 and self.max_end[count - 1] >= start
+
+    def items(self) -> list[tuple[date, date, int]]:
+        return list(zip(self.starts, self.ends, self.document_ids))
+
+
+class AvailabilityIndex:
+    """In-process index of signed contract periods keyed by serial blind index.
+
+    Built from ``user_documents`` without decrypting anything, patched in place
+    when a contract is signed or closed, and rebuilt after
+    ``AVAILABILITY_INDEX_TTL_SECONDS`` so changes made by other workers are
+    picked up too.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_key: dict[_SerialKey, _Intervals] = {}
+        self._by_document: dict[int, tuple[tuple[_SerialKey, date, date], ...]] = {}
+        self._built_at: float | None = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._built_at = None
+
+    def ensure_fresh(self, db: Session) -> None:
+        built_at = self._built_at
+        ttl = settings.AVAILABILITY_INDEX_TTL_SECONDS
+        if built_at is not None and time.monotonic() - built_at < ttl:
+            return
+        self.rebuild(db)
+
+    def rebuild(self, db: Session) -> None:
+        rows = db.execute(
+            select(
+                UserDocument.id,
+                UserDocument.filled_date,
+                UserDocument.end_date,
+                *(getattr(UserDocument, column) for _, column in _HASH_COLUMNS),
+            ).where(
+                UserDocument.signed.is_(True),
+                UserDocument.filled_date.is_not(None),
+                UserDocument.end_date.is_not(None),
+                UserDocument.end_date >= date.today(),
+            )
+        ).all()
+
+        by_document = {
+            row[0]: self._document_entries(row[1], row[2], row[3:]) for row in rows
+        }
+        grouped: dict[_SerialKey, list[tuple[date, date, int]]] = {}
+        for doc_id, entries in by_document.items():
+            for serial_key, start, end in entries:
+                grouped.setdefault(serial_key, []).append((start, end, doc_id))
+
+        with self._lock:
+            self._by_document = {
+                doc_id: entries for doc_id, entries in by_document.items() if entries
+            }
+            self._by_key = {key: _Intervals.build(items) for key, items in grouped.items()}
+            self._built_at = time.monotonic()
+
+    def refresh_document(self, doc: UserDocument) -> None:
+        """Re-index one contract after it was signed, shortened or closed."""
+        entries = ()
+        if doc.signed and doc.end_date is not None and doc.end_date >= date.today():
+            entries = self._document_entries(
+                doc.filled_date,
+                doc.end_date,
+                [getattr(doc, column) for _, column in _HASH_COLUMNS],
+            )
+
+        with self._lock:
+            if self._built_at is None:
+                return
+            old_entries = self._by_document.pop(doc.id, ())
+            touched = {serial_key for serial_key, _, _ in old_entries}
+            touched.update(serial_key for serial_key, _, _ in entries)
+            if entries:
+                self._by_document[doc.id] = entries
+
+            for serial_key in touched:
+                current = self._by_key.get(serial_key)
+                items = [
+                    item for item in (current.items() if current else []) if item[2] != doc.id
+                ]
+                items.extend(
+                    (start, end, doc.id) for key, start, end in entries if key == serial_key
+                )
+                if items:
+                    self._by_key[serial_key] = _Intervals.build(items)
+                else:
+                    self._by_key.pop(serial_key, None)
+
+    def is_free(
+        self, kind: str, serials: Iterable[str | None], start: date, end: date
+    ) -> bool:
+        for serial in serials:
+            if not serial:
+                continue
+            digest = serial_hash(serial)
+            intervals = self._by_key.get((kind, digest)) if digest else None
+            if intervals is not None and intervals.overlaps(start, end):
+                return False
+        return True
+
+    @staticmethod
+    def _document_entries(
+        start: date | None, end: date | None, hashes: Iterable[str | None]
+    ) -> tuple[tuple[_SerialKey, date, date], ...]:
+        if start is None or end is None or end < start:
+            return ()
+        keys = {
+            (kind, digest)
+            for (kind, _), digest in zip(_HASH_COLUMNS, hashes)
+            if digest
+        }
+        return tuple((serial_key, start, end) for serial_key in sorted(keys))
+
+
+availability_index = AvailabilityIndex()
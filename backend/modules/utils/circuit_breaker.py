@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The call was rejected without reaching the remote service."""
+
+    def __init__(self, name: str, retry_after: float, reason: str) -> None:
+        super().__init__(f"{name}: {reason}")
+        self.retry_after = retry_after
+        self.reason = reason
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class CircuitBreaker:
+    """Circuit breaker with a bulkhead for calls to a remote service.
+
+    ``failure_threshold`` consecutive failures open the circuit; a call that
+    succeeds but takes longer than ``slow_call_seconds`` counts as a failure
+    too. While open, calls are rejected at once for ``open_seconds``, then up
+    to ``half_open_calls`` probe calls are let through: that many successes
+    close the circuit, a failure opens it again. Independently of the state,
+    at most ``max_concurrent_calls`` calls run at a time; a caller waits up
+    to ``bulkhead_wait_seconds`` for a free slot and is rejected otherwise.
+
+    ``is_failure`` decides which exceptions raised by the call count against
+    the service; the rest (e.g. a rejected request) count as successes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int,
+        slow_call_seconds: float,
+        open_seconds: float,
+        half_open_calls: int,
+        max_concurrent_calls: int,
+        bulkhead_wait_seconds: float,
+        is_failure: Callable[[BaseException], bool] = lambda exc: True,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.max_concurrent_calls = max_concurrent_calls
+        self.bulkhead_wait_seconds = bulkhead_wait_seconds
+        self.is_failure = is_failure
+
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_concurrent_calls)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._consecutive_failures = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        self._in_flight = 0
+        self._calls = 0
+        self._failures = 0
+        self._slow_calls = 0
+        self._rejected_open = 0
+        self._rejected_bulkhead = 0
+        self._times_opened = 0
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Run the body as one call to the service, or raise ``CircuitOpenError``."""
+        probe = self._admit()
+        if not self._slots.acquire(timeout=self.bulkhead_wait_seconds):
+            with self._lock:
+                self._rejected_bulkhead += 1
+                if probe:
+                    self._probes_in_flight -= 1
+            raise CircuitOpenError(self.name, 1.0, "превышено число одновременных запросов")
+
+        with self._lock:
+            self._in_flight += 1
+        started = time.monotonic()
+        failed = True
+        try:
+            yield
+            failed = False
+        except BaseException as exc:
+            failed = self.is_failure(exc)
+            raise
+        finally:
+            elapsed = time.monotonic() - started
+            self._slots.release()
+            self._record(probe, failed, elapsed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "retry_after_seconds": round(self._retry_after(), 1) if self._state == OPEN else None,
+                "consecutive_failures": self._consecutive_failures,
+                "in_flight": self._in_flight,
+                "max_concurrent_calls": self.max_concurrent_calls,
+                "calls": self._calls,
+                "failures": self._failures,
+                "slow_calls": self._slow_calls,
+                "rejected_open": self._rejected_open,
+                "rejected_bulkhead": self._rejected_bulkhead,
+                "times_opened": self._times_opened,
+            }
+
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and not self._retry_after():
+            return HALF_OPEN
+        return self._state
+
+    def _admit(self) -> bool:
+        """Let the call through or reject it; returns whether it is a probe."""
+        with self._lock:
+            if self._current_state() == CLOSED:
+                return False
+
+            if self._state == OPEN:
+                if self._retry_after():
+                    self._rejected_open += 1
+                    raise CircuitOpenError(self.name, self._retry_after(), "сервис недоступен")
+                self._state = HALF_OPEN
+                self._probes_in_flight = 0
+                self._probe_successes = 0
+                logger.info("%s: пробные запросы после паузы %s с", self.name, self.open_seconds)
+
+            if self._probes_in_flight + self._probe_successes >= self.half_open_calls:
+                self._rejected_open += 1
+                raise CircuitOpenError(self.name, 1.0, "ожидается результат пробных запросов")
+            self._probes_in_flight += 1
+            return True
+
+    def _record(self, probe: bool, failed: bool, elapsed: float) -> None:
+        slow = not failed and elapsed > self.slow_call_seconds
+        with self._lock:
+            self._in_flight -= 1
+            self._calls += 1
+            if probe:
+                self._probes_in_flight -= 1
+            if slow:
+                self._slow_calls += 1
+            if failed:
+                self._failures += 1
+
+            if not (failed or slow):
+                self._consecutive_failures = 0
+                if probe and self._state == HALF_OPEN:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._state = CLOSED
+                        logger.info("%s: сервис снова доступен, запросы возобновлены", self.name)
+                return
+
+            self._consecutive_failures += 1
+            if self._state == HALF_OPEN and probe:
+                self._open(f"пробный запрос {'медленный' if slow else 'неудачный'}")
+            elif self._state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+                self._open(f"{self._consecutive_failures} ошибок или медленных ответов подряд")
+
+    def _open(self, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        logger.warning("%s: запросы приостановлены на %s с (%s)", self.name, self.open_seconds, reason)
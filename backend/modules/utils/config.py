@@ -9,10 +9,19 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    DATABASE_REPLICA_URL: str | None = Field(default=None)
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = Field(default=5)
+    DATABASE_REPLICA_CHECK_INTERVAL_SECONDS: float = Field(default=5)
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_POOL_MAX_OVERFLOW: int = Field(default=20)
+    DB_POOL_TIMEOUT_SECONDS: float = Field(default=30)
+    DB_POOL_LIVENESS: str = Field(default="pre_ping")
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=-1)
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=7)
+    JWT_VERIFIED_CACHE_SIZE: int = Field(default=10000)
     ENCRYPTION_KEY: str
     SMTP_HOST: str = Field(default="localhost")
     SMTP_PORT: int = Field(default=465)
@@ -27,11 +36,46 @@ class Settings(BaseSettings):
     SECURE_STORAGE_DIR: Path = BASE_DIR / "secure_storage"
     CONTRACT_TEMPLATE_FILENAME: str = "contract_template.docx"
     RETURN_ACT_TEMPLATE_FILENAME: str = "return_act_template.docx"
+    PDF_FONT_PATH: Path = BASE_DIR.parent / "fonts" / "DejaVuSans.ttf"
+    CONTRACT_EXPORT_WORKERS: int = Field(default=4)
+    LOG_DIR: Path = Field(default=Path("/backend/logs"))
+    ACCESS_LOG_ENABLED: bool = Field(default=True)
+    SLOW_QUERY_THRESHOLD_MS: float = Field(default=500)
+    SLOW_QUERY_EXPLAIN_SAMPLE_RATE: float = Field(default=0.0)
+    PROFILING_ENABLED: bool = Field(default=True)
+    PROFILE_MAX_BYTES: int = Field(default=5 * 1024 * 1024)
+    PROFILE_RETENTION_COUNT: int = Field(default=50)
+    PROFILE_RATE_LIMIT_PER_HOUR: int = Field(default=10)
+    PROFILE_DOWNLOAD_RATE_LIMIT_PER_MINUTE: int = Field(default=30)
+    COMPRESSION_ENABLED: bool = Field(default=True)
+    COMPRESSION_MINIMUM_SIZE: int = Field(default=1024)
+    READY_MIN_POOL_HEADROOM: int = Field(default=1)
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = Field(default=25)
+    AVAILABILITY_INDEX_TTL_SECONDS: int = Field(default=300)
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    RATE_LIMIT_BACKEND: str = Field(default="memory")
+    RATE_LIMIT_REDIS_URL: str | None = Field(default=None)
+    RATE_LIMIT_TRUSTED_PROXY_HOPS: int = Field(default=0)
+    AUTH_RATE_LIMIT_PER_IP: int = Field(default=30)
+    AUTH_RATE_LIMIT_PER_EMAIL: int = Field(default=5)
     YOOKASSA_SHOP_ID: str | None = Field(default=None)
     YOOKASSA_SECRET_KEY: str | None = Field(default=None)
     YOOKASSA_API_URL: str = Field(default="https://api.yookassa.ru/v3")
     YOOKASSA_RETURN_URL: str | None = Field(default=None)
     YOOKASSA_WEBHOOK_SECRET: str | None = Field(default=None)
+    # YooKassa keeps its own idempotence keys for 24 hours as well.
+    PAYMENT_IDEMPOTENCY_WINDOW_SECONDS: int = Field(default=24 * 60 * 60)
+    YOOKASSA_BREAKER_FAILURE_THRESHOLD: int = Field(default=5)
+    YOOKASSA_BREAKER_SLOW_CALL_SECONDS: float = Field(default=5)
+    YOOKASSA_BREAKER_OPEN_SECONDS: float = Field(default=30)
+    YOOKASSA_BREAKER_HALF_OPEN_CALLS: int = Field(default=2)
+    YOOKASSA_MAX_CONCURRENT_CALLS: int = Field(default=10)
+    YOOKASSA_BULKHEAD_WAIT_SECONDS: float = Field(default=1)
+    PAYMENT_RECONCILE_ENABLED: bool = Field(default=True)
+    PAYMENT_RECONCILE_INTERVAL_SECONDS: float = Field(default=60)
+    PAYMENT_RECONCILE_STALE_AFTER_SECONDS: float = Field(default=600)
+    PAYMENT_RECONCILE_BATCH_SIZE: int = Field(default=50)
+    PAYMENT_RECONCILE_CALLS_PER_SECOND: float = Field(default=5)
 
     class Config:
         # Use the project-level .env file regardless of the working directory
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy.orm import Query, Session, contains_eager
+
+from modules.connection_to_db.database import SessionLocal
+from modules.models.types import DocumentStatusEnum
+from modules.models.user import User
+from modules.models.user_document import UserDocument
+from modules.schemas.contract_export_schemas import (
+    ContractExportCreateRequest,
+    ContractExportJobRead,
+    ContractExportState,
+    ContractExportStatusFilter,
+)
+from modules.schemas.document_schemas import DocumentFileFormat
+from modules.utils.config import settings
+from modules.utils.document_security import (
+    decrypt_document_fields,
+    decrypt_user_fields,
+    get_contract_exports_dir,
+    get_sensitive_data_cipher,
+    render_contract_docx,
+    render_contract_pdf,
+)
+
+logger = logging.getLogger(__name__)
+
+_JOB_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+_UNSAFE_FILENAME_CHARS_RE = re.compile(r"[^0-9A-Za-zА-Яа-яЁё._-]+")
+_PROGRESS_WRITE_INTERVAL_SECONDS = 1.0
+_STALE_JOB_TIMEOUT = timedelta(minutes=5)
+_MAX_REPORTED_ERRORS = 50
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _manifest_path(job_id: str) -> Path:
+    return get_contract_exports_dir() / f"{job_id}.json"
+
+
+def get_contract_export_archive_path(job_id: str) -> Path:
+    return get_contract_exports_dir() / f"{job_id}.zip"
+
+
+def _write_manifest(job: ContractExportJobRead) -> None:
+    job.updated_at = _now()
+    path = _manifest_path(job.id)
+    tmp_path = path.with_suffix(".json.tmp")
+    tmp_path.write_text(job.model_dump_json(exclude={"download_url"}), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def get_contract_export_job(job_id: str) -> ContractExportJobRead | None:
+    if not _JOB_ID_RE.match(job_id):
+        return None
+    path = _manifest_path(job_id)
+    if not path.exists():
+        return None
+
+    job = ContractExportJobRead.model_validate_json(path.read_text(encoding="utf-8"))
+    if (
+        job.state in (ContractExportState.pending, ContractExportState.running)
+        and _now() - job.updated_at > _STALE_JOB_TIMEOUT
+    ):
+        # The worker thread died together with its process (restart, deploy).
+        job.state = ContractExportState.failed
+        job.errors = [*job.errors, "Экспорт прерван: процесс был перезапущен"]
+    if job.state == ContractExportState.completed:
+        job.download_url = f"/admin/contracts/exports/{job.id}/download"
+    return job
+
+
+def start_contract_export(
+    body: ContractExportCreateRequest, requested_by: int
+) -> ContractExportJobRead:
+    now = _now()
+    job = ContractExportJobRead(
+        id=uuid.uuid4().hex,
+        state=ContractExportState.pending,
+        status=body.status,
+        file_format=body.file_format,
+        date_from=body.date_from,
+        date_to=body.date_to,
+        requested_by=requested_by,
+        created_at=now,
+        updated_at=now,
+    )
+    _write_manifest(job)
+    # The worker thread mutates its own copy while the caller serializes this one.
+    snapshot = job.model_copy(deep=True)
+
+    worker = threading.Thread(
+        target=_run_contract_export,
+        args=(job,),
+        name=f"contract-export-{job.id}",
+        daemon=True,
+    )
+    worker.start()
+    return snapshot
+
+
+def _build_documents_query(session: Session, job: ContractExportJobRead) -> Query:
+    query = (
+        session.query(UserDocument)
+        .join(UserDocument.user)
+        .options(contains_eager(UserDocument.user).lazyload(User.documents))
+        .filter(
+            User.status == DocumentStatusEnum.APPROVED,
+            UserDocument.filled_date.is_not(None),
+            UserDocument.filled_date >= job.date_from,
+            UserDocument.filled_date <= job.date_to,
+        )
+    )
+
+    if job.status == ContractExportStatusFilter.signed:
+        query = query.filter(UserDocument.signed.is_(True))
+    elif job.status == ContractExportStatusFilter.active:
+        query = query.filter(UserDocument.signed.is_(True), UserDocument.active.is_(True))
+    elif job.status == ContractExportStatusFilter.closed:
+        query = query.filter(UserDocument.signed.is_(True), UserDocument.active.is_(False))
+
+    return query.order_by(UserDocument.id.asc())
+
+
+def _archive_entry_name(doc: UserDocument, contract_number: str | None, extension: str) -> str:
+    label = _UNSAFE_FILENAME_CHARS_RE.sub("_", str(contract_number or doc.id)).strip("_")
+    return f"contract_{label or doc.id}_user_{doc.user_id}_doc_{doc.id}.{extension}"
+
+
+class _ArchiveWriter:
+    """Writes rendered documents into the ZIP as they complete and tracks progress."""
+
+    def __init__(self, archive: zipfile.ZipFile, job: ContractExportJobRead, compression: int):
+        self.archive = archive
+        self.job = job
+        self.compression = compression
+        self.pending: dict[Future, str] = {}
+        self._last_progress_write = 0.0
+
+    def drain(self, return_when: str) -> None:
+        if not self.pending:
+            return
+        done, _ = wait(self.pending, return_when=return_when)
+        for future in done:
+            entry_name = self.pending.pop(future)
+            try:
+                buf = future.result()
+            except Exception as exc:
+                logger.warning("Не удалось сформировать %s: %s", entry_name, exc)
+                self.job.failed += 1
+                if len(self.job.errors) < _MAX_REPORTED_ERRORS:
+                    self.job.errors.append(f"{entry_name}: {exc}")
+            else:
+                info = zipfile.ZipInfo(entry_name, date_time=time.localtime()[:6])
+                info.compress_type = self.compression
+                self.archive.writestr(info, buf.getvalue())
+            self.job.processed += 1
+
+        if time.monotonic() - self._last_progress_write >= _PROGRESS_WRITE_INTERVAL_SECONDS:
+            _write_manifest(self.job)
+            self._last_progress_write = time.monotonic()
+
+
+def _run_contract_export(job: ContractExportJobRead) -> None:
+    archive_path = get_contract_export_archive_path(job.id)
+    part_path = archive_path.with_suffix(".zip.part")
+    cipher = get_sensitive_data_cipher()
+    is_pdf = job.file_format == DocumentFileFormat.pdf
+    render = render_contract_pdf if is_pdf else render_contract_docx
+    # DOCX is already a ZIP container, deflating it again only burns CPU.
+    compression = zipfile.ZIP_DEFLATED if is_pdf else zipfile.ZIP_STORED
+    workers = max(1, settings.CONTRACT_EXPORT_WORKERS)
+
+    session = SessionLocal()
+    try:
+        query = _build_documents_query(session, job)
+        job.total = query.order_by(None).count()
+        job.state = ContractExportState.running
+        _write_manifest(job)
+
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="contract-export"
+        ) as executor, zipfile.ZipFile(part_path, "w") as archive:
+            writer = _ArchiveWriter(archive, job, compression)
+            for doc in query.yield_per(100):
+                decrypted_fields = {
+                    **decrypt_user_fields(doc.user, cipher),
+                    **decrypt_document_fields(doc, cipher),
+                }
+                entry_name = _archive_entry_name(
+                    doc, decrypted_fields.get("contract_number"), job.file_format.value
+                )
+                future = executor.submit(render, doc.user, doc, decrypted_fields)
+                writer.pending[future] = entry_name
+                # Bound the number of rendered documents held in memory at once.
+                if len(writer.pending) >= workers * 2:
+                    writer.drain(FIRST_COMPLETED)
+            writer.drain(ALL_COMPLETED)
+
+        part_path.replace(archive_path)
+        job.state = ContractExportState.completed
+    except Exception as exc:
+        logger.exception("Экспорт договоров %s завершился с ошибкой", job.id)
+        part_path.unlink(missing_ok=True)
+        job.state = ContractExportState.failed
+        job.errors.append(str(exc))
+    finally:
+        session.close()
+        job.finished_at = _now()
+        _write_manifest(job)
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from modules.models.user_counter import UserCounter
+
+PAYMENT_NUMBER_COUNTER = "payment_number"
+CONTRACT_NUMBER_COUNTER = "contract_number"
+
+_INSERT_BY_DIALECT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _upsert(db: Session, user_id: int, name: str, value: int, increment: bool) -> int:
+    insert = _INSERT_BY_DIALECT[db.get_bind().dialect.name]
+    stmt = insert(UserCounter).values(user_id=user_id, name=name, value=value)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserCounter.user_id, UserCounter.name],
+        set_={"value": UserCounter.value + value if increment else stmt.excluded.value},
+    ).returning(UserCounter.value)
+    return db.execute(stmt).scalar_one()
+
+
+def next_user_counter(db: Session, user_id: int, name: str) -> int:
+    """Increment and return a per-user counter in one atomic statement.
+
+    The upsert locks the counter row until the surrounding transaction ends,
+    so concurrent callers for the same user get distinct values.
+    """
+    return _upsert(db, user_id, name, 1, increment=True)
+
+
+def set_user_counter(db: Session, user_id: int, name: str, value: int) -> None:
+    _upsert(db, user_id, name, value, increment=False)
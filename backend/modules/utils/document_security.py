@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
 import io
 from datetime import date, datetime
 from functools import lru_cache
@@ -7,12 +9,15 @@ from pathlib import Path
 from typing import Any, Mapping, TYPE_CHECKING
 
 from cryptography.fernet import Fernet, InvalidToken
-from docx import Document as DocxDocument
-from docx.text.paragraph import Paragraph
 
 from modules.utils.config import settings
 
 if TYPE_CHECKING:
+    # python-docx (with lxml) and reportlab are imported on first render, not at
+    # startup: most requests never produce a document.
+    from docx import Document as DocxDocument
+    from docx.text.paragraph import Paragraph
+
     from modules.models.user import User
     from modules.models.user_document import UserDocument
 
@@ -40,10 +45,14 @@ _ENCRYPTED_DOCUMENT_FIELDS = {
     "amount_text",
 }
 _DOCUMENT_FIELDS = _ENCRYPTED_DOCUMENT_FIELDS | _DATE_FIELDS
+# Encrypted serials that also get a deterministic ``<field>_hash`` column for lookups.
+BLIND_INDEX_FIELDS = ("bike_serial", "akb1_serial", "akb2_serial")
 
 _SECURE_TEMPLATE_SUBDIR = "templates"
 _SECURE_CONTRACTS_SUBDIR = "generated_contracts"
 _SECURE_RETURN_ACTS_SUBDIR = "generated_return_acts"
+_SECURE_CONTRACT_EXPORTS_SUBDIR = "contract_exports"
+_SECURE_PROFILES_SUBDIR = "profiles"
 _ENCRYPTED_PREFIX = "enc:"
 _CONTRACT_CITY = "Великий Новгород"
 
@@ -86,12 +95,22 @@ def get_generated_return_acts_dir() -> Path:
 def get_generated_return_act_path(user_id: int, act_id: int) -> Path:
     return get_generated_return_acts_dir() / f"return_act_user_{user_id}_{act_id}.docx"
 
+
+def get_contract_exports_dir() -> Path:
+    return _ensure_secure_dir(settings.SECURE_STORAGE_DIR / _SECURE_CONTRACT_EXPORTS_SUBDIR)
+
+
+def get_profiles_dir() -> Path:
+    return _ensure_secure_dir(settings.SECURE_STORAGE_DIR / _SECURE_PROFILES_SUBDIR)
+
 class SensitiveDataCipher:
     def __init__(self, key: str):
         try:
             self._fernet = Fernet(key.encode())
         except (TypeError, ValueError) as exc:
             raise ValueError("Invalid ENCRYPTION_KEY provided") from exc
+        # Separate key for the blind index, so the HMAC never reuses the Fernet key as-is.
+        self._index_key = hmac.new(key.encode(), b"blind-index", hashlib.sha256).digest()
 
     def encrypt(self, value: str | None) -> str | None:
         if value is None:
@@ -102,6 +121,15 @@ class SensitiveDataCipher:
         token = self._fernet.encrypt(value.encode())
         return f"{_ENCRYPTED_PREFIX}{token.decode()}"
 
+    def blind_index(self, value: Any) -> str | None:
+        """Deterministic HMAC of a serial number, used to find rows without decrypting."""
+        if value is None:
+            return None
+        normalized = self.decrypt(str(value)).strip()
+        if not normalized:
+            return None
+        return hmac.new(self._index_key, normalized.encode(), hashlib.sha256).hexdigest()
+
     def decrypt(self, value: str | None) -> str | None:
         if value is None:
             return None
@@ -139,6 +167,8 @@ def encrypt_document_fields(
             continue
 
         encrypted[field] = cipher.encrypt(value if value is None else str(value))
+        if field in BLIND_INDEX_FIELDS:
+            encrypted[f"{field}_hash"] = cipher.blind_index(value)
     return encrypted
 
 def _normalize_numeric(value: Any) -> Any:
@@ -360,10 +390,7 @@ def _build_contract_values(
     }
 
 
-def render_contract_docx(
-    user: "User", doc: "UserDocument", decrypted_fields: Mapping[str, Any]
-) -> io.BytesIO:
-    """Generate contract DOCX in memory and return as BytesIO (no disk write)."""
+def _get_existing_contract_template_path() -> Path:
     template_path = get_contract_template_path()
     if not template_path.exists():
         raise FileNotFoundError(
@@ -371,7 +398,39 @@ def render_contract_docx(
             "Поместите контрактный шаблон в SECURE_STORAGE_DIR/templates "
             "и обновите CONTRACT_TEMPLATE_FILENAME при необходимости."
         )
-    document = DocxDocument(template_path)
+    return template_path
+
+
+def _get_existing_return_act_template_path() -> Path:
+    template_path = get_return_act_template_path()
+    if not template_path.exists():
+        raise FileNotFoundError(
+            f"DOCX-шаблон акта возврата не найден по пути: {template_path}. "
+            "Поместите шаблон в SECURE_STORAGE_DIR/templates "
+            "и обновите RETURN_ACT_TEMPLATE_FILENAME при необходимости."
+        )
+    return template_path
+
+
+@lru_cache(maxsize=8)
+def _read_template_bytes(template_path: str, mtime_ns: int) -> bytes:
+    # ``mtime_ns`` is part of the cache key so that a replaced template is re-read.
+    return Path(template_path).read_bytes()
+
+
+def _open_docx_template(template_path: Path) -> DocxDocument:
+    from docx import Document as DocxDocument
+
+    data = _read_template_bytes(str(template_path), template_path.stat().st_mtime_ns)
+    return DocxDocument(io.BytesIO(data))
+
+
+def render_contract_docx(
+    user: "User", doc: "UserDocument", decrypted_fields: Mapping[str, Any]
+) -> io.BytesIO:
+    """Generate contract DOCX in memory and return as BytesIO (no disk write)."""
+    template_path = _get_existing_contract_template_path()
+    document = _open_docx_template(template_path)
     _replace_placeholders_in_docx(document, _build_contract_values(user, doc, decrypted_fields))
     buf = io.BytesIO()
     document.save(buf)
@@ -388,16 +447,30 @@ def _format_date_human(value: Any) -> str:
 
 def render_return_act_docx(values: Mapping[str, Any]) -> io.BytesIO:
     """Generate return-act DOCX in memory and return as BytesIO (no disk write)."""
-    template_path = get_return_act_template_path()
-    if not template_path.exists():
-        raise FileNotFoundError(
-            f"DOCX-шаблон акта возврата не найден по пути: {template_path}. "
-            "Поместите шаблон в SECURE_STORAGE_DIR/templates "
-            "и обновите RETURN_ACT_TEMPLATE_FILENAME при необходимости."
-        )
-    document = DocxDocument(template_path)
+    template_path = _get_existing_return_act_template_path()
+    document = _open_docx_template(template_path)
     _replace_placeholders_in_docx(document, values)
     buf = io.BytesIO()
     document.save(buf)
     buf.seek(0)
-    return buf
\ No newline at end of file
+    return buf
+
+
+def render_contract_pdf(
+    user: "User", doc: "UserDocument", decrypted_fields: Mapping[str, Any]
+) -> io.BytesIO:
+    """Generate contract PDF in memory from the same values as the DOCX."""
+    from modules.utils.pdf_rendering import render_pdf_from_template
+
+    template_path = _get_existing_contract_template_path()
+    return render_pdf_from_template(
+        template_path, _build_contract_values(user, doc, decrypted_fields)
+    )
+
+
+def render_return_act_pdf(values: Mapping[str, Any]) -> io.BytesIO:
+    """Generate return-act PDF in memory from the same values as the DOCX."""
+    from modules.utils.pdf_rendering import render_pdf_from_template
+
+    template_path = _get_existing_return_act_template_path()
+    return render_pdf_from_template(template_path, values)
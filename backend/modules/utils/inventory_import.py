@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Any
+
+from fastapi import Depends, HTTPException, Request, status
+
+from modules.models.user import User
+from modules.utils.admin_utils import get_current_admin
+
+MAX_IMPORT_ROWS = 5000
+
+IMPORT_OPENAPI_EXTRA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "application/json": {"schema": {"type": "array", "items": {"type": "object"}}},
+            "text/csv": {"schema": {"type": "string"}},
+        },
+    }
+}
+
+
+def _parse_csv(raw: bytes) -> list[dict[str, Any]]:
+    try:
+        text = raw.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="CSV должен быть в кодировке UTF-8",
+        )
+
+    first_line = text.split("\n", 1)[0]
+    delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
+    reader = csv.DictReader(io.StringIO(text), delimiter=delimiter)
+    # Empty cells mean "not set", so that optional columns fall back to their defaults.
+    return [
+        {
+            key.strip(): value.strip()
+            for key, value in row.items()
+            if key and value is not None and value.strip() != ""
+        }
+        for row in reader
+    ]
+
+
+def _parse_json(raw: bytes) -> list[dict[str, Any]]:
+    try:
+        payload = json.loads(raw)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Некорректный JSON",
+        )
+    if not isinstance(payload, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ожидается JSON-массив объектов",
+        )
+    return payload
+
+
+async def read_import_rows(
+    request: Request,
+    _admin: User = Depends(get_current_admin),
+) -> list[Any]:
+    """Read an import payload sent either as a JSON array or as CSV with a header row.
+
+    Depends on ``get_current_admin`` so that the body is never read or parsed
+    for an unauthorized caller, whatever the order of the endpoint's
+    dependencies.
+    """
+    content_type = request.headers.get("content-type", "").split(";", 1)[0].strip().lower()
+    raw = await request.body()
+
+    if content_type in ("text/csv", "application/csv"):
+        rows = _parse_csv(raw)
+    elif content_type in ("application/json", ""):
+        rows = _parse_json(raw)
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Поддерживаются только application/json и text/csv",
+        )
+
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Файл импорта не содержит строк",
+        )
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"За один импорт можно загрузить не более {MAX_IMPORT_ROWS} строк",
+        )
+    return rows
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # Keep Decimal exact, the same way pydantic renders it in JSON mode.
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    if isinstance(content, BaseModel):
+        return content.__pydantic_serializer__.to_json(content)
+    try:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        # orjson is limited to 64-bit integers; 20-digit bank account numbers
+        # are not, so such payloads go through pydantic-core instead.
+        return pydantic_core.to_json(content)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Used as the application's default response class. ``date``/``datetime``
+    and enums are handled natively, ``Decimal`` is rendered as a string and
+    Pydantic models passed as content are serialized by pydantic-core
+    directly, without an intermediate ``jsonable_encoder`` pass. Payloads
+    orjson cannot encode fall back to pydantic-core.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
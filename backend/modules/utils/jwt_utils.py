@@ -1,4 +1,8 @@
 import datetime
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
@@ -32,8 +36,57 @@ def create_refresh_token(data: dict, expire_delta: datetime.timedelta) -> str:
     return _create_token(data=data, expire_delta=expire_delta, token_type="refresh")
 
 
+class _VerifiedTokenCache:
+    """Bounded LRU of already verified tokens: sha256(token) -> (claims, exp).
+
+    Entries are dropped once the token's ``exp`` passes, so a cached token is
+    never accepted for longer than a full verification would accept it.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+    def get(self, digest: bytes) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+        return dict(claims)
+
+    def put(self, digest: bytes, claims: dict) -> None:
+        expires_at = claims.get("exp")
+        if self._max_size <= 0 or not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[digest] = (dict(claims), float(expires_at))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_token_cache = _VerifiedTokenCache(settings.JWT_VERIFIED_CACHE_SIZE)
+
+
 def decode_token(token: str) -> dict:
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = verified_token_cache.get(digest)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    verified_token_cache.put(digest, claims)
+    return claims
 
 
 async def get_current_user(
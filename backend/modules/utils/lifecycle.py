@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from modules.connection_to_db.pool_metrics import pool_snapshot
+from modules.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+_draining = threading.Event()
+
+
+class InFlightCalls:
+    """Counts calls that must not be cut off by a worker shutdown."""
+
+    def __init__(self) -> None:
+        self._count = 0
+        self._idle = threading.Condition()
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        with self._idle:
+            self._count += 1
+        try:
+            yield
+        finally:
+            with self._idle:
+                self._count -= 1
+                if self._count == 0:
+                    self._idle.notify_all()
+
+    def wait_idle(self, timeout: float) -> bool:
+        with self._idle:
+            return self._idle.wait_for(lambda: self._count == 0, timeout=timeout)
+
+
+# Requests to YooKassa: a payment created there but not recorded here has to
+# be reconciled by hand, so shutdown waits for these to finish.
+yookassa_calls = InFlightCalls()
+
+
+def is_draining() -> bool:
+    return _draining.is_set()
+
+
+def begin_drain() -> None:
+    _draining.set()
+
+
+def install_drain_signal_handler() -> None:
+    """Flip readiness to "draining" as soon as the worker receives SIGTERM.
+
+    Chains to the handler the server installed, so its graceful shutdown
+    still runs. Must be called from the main thread, after the server has
+    set up its signal handling (i.e. during lifespan startup).
+    """
+    previous = signal.getsignal(signal.SIGTERM)
+    if not callable(previous):
+        return
+
+    def _handle_sigterm(signum, frame) -> None:
+        begin_drain()
+        previous(signum, frame)
+
+    try:
+        signal.signal(signal.SIGTERM, _handle_sigterm)
+    except ValueError:
+        # Not the main thread (e.g. an embedded test server): nothing to chain.
+        pass
+
+
+def drain(timeout: float) -> None:
+    begin_drain()
+    if yookassa_calls.count:
+        logger.info("Ожидание завершения запросов к YooKassa: %s", yookassa_calls.count)
+    if not yookassa_calls.wait_idle(timeout):
+        logger.warning(
+            "Не дождались завершения запросов к YooKassa за %s с: %s",
+            timeout,
+            yookassa_calls.count,
+        )
+
+
+def _pool_status(engine: Engine) -> dict[str, Any]:
+    snapshot = pool_snapshot(engine.pool)
+    return {
+        key: snapshot[key]
+        for key in ("size", "checked_out", "overflow", "headroom")
+        if key in snapshot
+    }
+
+
+def check_readiness(engine: Engine) -> tuple[bool, dict[str, Any]]:
+    if is_draining():
+        return False, {"status": "draining"}
+
+    pool = _pool_status(engine)
+    # Checking out a connection from an exhausted pool would block for
+    # pool_timeout; report not ready instead.
+    if pool and pool["headroom"] < settings.READY_MIN_POOL_HEADROOM:
+        return False, {"status": "pool_exhausted", "pool": pool}
+
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as exc:
+        logger.warning("Проверка готовности: база данных недоступна: %s", exc)
+        return False, {"status": "database_unavailable", "pool": pool}
+
+    return True, {"status": "ready", "pool": pool}
@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from modules.utils.request_metrics import get_request_id
+
+logger = logging.getLogger(__name__)
+
+ACCESS_LOGGER_NAME = "app.access"
+SLOW_QUERY_LOGGER_NAME = "app.slow_query"
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+_rollover_stop: threading.Event | None = None
+_rollover_thread: threading.Thread | None = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request id.
+
+    Attached to the queue handler, so it runs on the thread that logged the
+    record, where the request context is still available.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "request_id"):
+            record.request_id = get_request_id() or "-"
+        return True
+
+
+class _LoggerNameFilter(logging.Filter):
+    def __init__(self, names: set[str], accept: bool) -> None:
+        super().__init__()
+        self._names = names
+        self._accept = accept
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return (record.name in self._names) == self._accept
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; fields passed as ``extra={"fields": {...}}`` are merged in."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        payload.update(getattr(record, "fields", None) or {})
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def _rotating_file_handler(path: Path) -> logging.Handler:
+    # Rotate at midnight, keep 5 days
+    return logging.handlers.TimedRotatingFileHandler(
+        filename=path,
+        when="midnight",
+        interval=1,
+        backupCount=5,
+        encoding="utf-8",
+        utc=True,
+    )
+
+
+def setup_logging(log_dir: Path, access_log: bool = True) -> logging.handlers.QueueListener:
+    """Route the root logger through a queue drained by a background thread.
+
+    Request threads only enqueue records; formatting and file writes happen
+    on the listener thread. Files are rotated at midnight by this process
+    only (see ``_rollover_loop``); processes forked from it append to the
+    same files and reopen them after a rotation.
+    """
+    global _listener, _queue_handler, _rollover_stop, _rollover_thread
+    if _listener is not None:
+        return _listener
+
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    formatter = logging.Formatter(
+        fmt="%(asctime)s [%(levelname)s] %(name)s [%(request_id)s]: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+
+    # Structured logs go to their own JSON-lines files instead of app.log.
+    structured_files = {SLOW_QUERY_LOGGER_NAME: "slow_queries.log"}
+    if access_log:
+        structured_files[ACCESS_LOGGER_NAME] = "access.log"
+    structured_names = {ACCESS_LOGGER_NAME, SLOW_QUERY_LOGGER_NAME}
+
+    file_handler = _rotating_file_handler(log_dir / "app.log")
+    file_handler.setFormatter(formatter)
+    file_handler.setLevel(logging.INFO)
+    file_handler.addFilter(_LoggerNameFilter(structured_names, accept=False))
+
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    console_handler.setLevel(logging.INFO)
+    console_handler.addFilter(_LoggerNameFilter(structured_names, accept=False))
+
+    handlers: list[logging.Handler] = [file_handler, console_handler]
+    for logger_name, filename in structured_files.items():
+        structured_handler = _rotating_file_handler(log_dir / filename)
+        structured_handler.setFormatter(JsonFormatter())
+        structured_handler.addFilter(_LoggerNameFilter({logger_name}, accept=True))
+        handlers.append(structured_handler)
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _queue_handler.addFilter(RequestIdFilter())
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(_queue_handler)
+
+    # Suppress noisy third-party loggers
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+
+    rotating = [h for h in handlers if isinstance(h, logging.handlers.TimedRotatingFileHandler)]
+    _rollover_stop = threading.Event()
+    _rollover_thread = threading.Thread(
+        target=_rollover_loop,
+        args=(rotating, _rollover_stop),
+        name="log-rollover",
+        daemon=True,
+    )
+    _rollover_thread.start()
+    return _listener
+
+
+def _rollover_loop(
+    handlers: list[logging.handlers.TimedRotatingFileHandler], stop: threading.Event
+) -> None:
+    # Rotate on time rather than on the next record, so that the files roll
+    # over even when this process (e.g. the gunicorn master) logs nothing.
+    while handlers:
+        due = min(handler.rolloverAt for handler in handlers)
+        if stop.wait(max(0.0, due - time.time()) + 1):
+            return
+        for handler in handlers:
+            # The same lock emit() holds, so a record never sees a half-done rollover.
+            handler.acquire()
+            try:
+                if handler.shouldRollover(None):
+                    handler.doRollover()
+            except OSError:
+                # Try again at the next midnight instead of every second.
+                handler.rolloverAt = handler.computeRollover(int(time.time()))
+                logger.exception("Не удалось повернуть файл журнала %s", handler.baseFilename)
+            finally:
+                handler.release()
+
+
+def _shared_file_handler(handler: logging.Handler) -> logging.Handler:
+    """Replace an inherited rotating handler with one that only appends.
+
+    If every worker rotated the shared file, each midnight rollover would
+    remove the backup the previous one just made. The workers append to the
+    file the parent rotates instead, and ``WatchedFileHandler`` reopens it
+    once it has been renamed.
+    """
+    if not isinstance(handler, logging.handlers.TimedRotatingFileHandler):
+        return handler
+
+    replacement = logging.handlers.WatchedFileHandler(handler.baseFilename, encoding="utf-8")
+    replacement.setFormatter(handler.formatter)
+    replacement.setLevel(handler.level)
+    for log_filter in handler.filters:
+        replacement.addFilter(log_filter)
+    # Closes only this process's copy of the descriptor.
+    handler.close()
+    return replacement
+
+
+def _restart_listener_in_child() -> None:
+    # Threads do not survive fork(): with a preloaded app every worker would
+    # otherwise enqueue records that nobody writes. Start from an empty queue
+    # so records still pending in the parent are not written twice.
+    global _listener, _rollover_stop, _rollover_thread
+    _rollover_stop = _rollover_thread = None
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = logging.handlers.QueueListener(
+        log_queue,
+        *(_shared_file_handler(handler) for handler in _listener.handlers),
+        respect_handler_level=True,
+    )
+    _listener.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listener_in_child)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler, _rollover_stop, _rollover_thread
+    if _listener is None:
+        return
+    if _rollover_stop is not None:
+        _rollover_stop.set()
+        _rollover_thread.join()
+        _rollover_stop = _rollover_thread = None
+    listener, _listener = _listener, None
+    logging.getLogger().removeHandler(_queue_handler)
+    _queue_handler = None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
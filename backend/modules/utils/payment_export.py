@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+from datetime import date
+from typing import Any, Iterator
+
+from sqlalchemy import Select, select
+
+from modules.connection_to_db.database import open_read_session
+from modules.models.payment import ContractPayment, Order, Payment
+from modules.models.user import User
+from modules.utils.xlsx_stream import iter_xlsx
+
+_YIELD_PER = 1000
+_CSV_FLUSH_EVERY_ROWS = 500
+
+PAYMENT_EXPORT_HEADER = (
+    "schedule_id",
+    "user_id",
+    "email",
+    "document_id",
+    "payment_number",
+    "due_date",
+    "amount",
+    "payment_type",
+    "status",
+    "paid_at",
+    "order_id",
+    "order_status",
+    "payment_id",
+    "payment_status",
+    "yookassa_payment_id",
+    "payment_amount",
+    "currency",
+)
+
+
+def _build_export_query(
+    due_from: date | None,
+    due_to: date | None,
+    status: str | None,
+    payment_type: str | None,
+) -> Select:
+    query = (
+        select(
+            ContractPayment.id,
+            ContractPayment.user_id,
+            User.email,
+            ContractPayment.document_id,
+            ContractPayment.payment_number,
+            ContractPayment.due_date,
+            ContractPayment.amount,
+            ContractPayment.payment_type,
+            ContractPayment.status,
+            ContractPayment.paid_at,
+            ContractPayment.order_id,
+            Order.status,
+            ContractPayment.payment_id,
+            Payment.status,
+            Payment.yookassa_payment_id,
+            Payment.amount,
+            Order.currency,
+        )
+        .join(User, User.id == ContractPayment.user_id)
+        .outerjoin(Order, Order.id == ContractPayment.order_id)
+        .outerjoin(Payment, Payment.id == ContractPayment.payment_id)
+    )
+
+    if due_from is not None:
+        query = query.where(ContractPayment.due_date >= due_from)
+    if due_to is not None:
+        query = query.where(ContractPayment.due_date <= due_to)
+    if status:
+        query = query.where(ContractPayment.status == status)
+    if payment_type:
+        query = query.where(ContractPayment.payment_type == payment_type)
+
+    # ``yield_per`` turns on a server-side cursor, rows are fetched in batches.
+    return query.order_by(ContractPayment.due_date.asc(), ContractPayment.id.asc()).execution_options(
+        yield_per=_YIELD_PER
+    )
+
+
+def _iter_rows(query: Select) -> Iterator[tuple[Any, ...]]:
+    # The request session is closed once the endpoint returns, so the stream owns its own.
+    session = open_read_session()
+    try:
+        for row in session.execute(query):
+            yield tuple(row)
+    finally:
+        session.close()
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def iter_payments_csv(
+    due_from: date | None = None,
+    due_to: date | None = None,
+    status: str | None = None,
+    payment_type: str | None = None,
+) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=";")
+    writer.writerow(PAYMENT_EXPORT_HEADER)
+    # BOM, so that Excel opens the file as UTF-8.
+    yield codecs.BOM_UTF8 + buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+
+    query = _build_export_query(due_from, due_to, status, payment_type)
+    for idx, row in enumerate(_iter_rows(query), start=1):
+        writer.writerow([_csv_value(value) for value in row])
+        if idx % _CSV_FLUSH_EVERY_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    tail = buffer.getvalue()
+    if tail:
+        yield tail.encode("utf-8")
+
+
+def iter_payments_xlsx(
+    due_from: date | None = None,
+    due_to: date | None = None,
+    status: str | None = None,
+    payment_type: str | None = None,
+) -> Iterator[bytes]:
+    query = _build_export_query(due_from, due_to, status, payment_type)
+    yield from iter_xlsx(PAYMENT_EXPORT_HEADER, _iter_rows(query), sheet_name="Payments")
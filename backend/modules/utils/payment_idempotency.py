@@ -0,0 +1,150 @@
+"""Idempotency keys for payment creation.
+
+A key is reserved in ``payment_idempotency_keys`` before YooKassa is called
+and keeps the response once the payment exists, so a retried request within
+``PAYMENT_IDEMPOTENCY_WINDOW_SECONDS`` gets the same payment back instead of
+a new provider payment and new order rows. The reservation's
+``provider_key`` is what YooKassa receives as its ``Idempotence-Key``: a
+retry after a failed or timed-out call reuses it, so YooKassa returns the
+payment it may already have created.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from modules.models.payment_idempotency_key import PaymentIdempotencyKey
+from modules.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+PROCESSING = "processing"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# A reservation still processing after this long belongs to a request that
+# died mid-flight (YooKassa calls time out after 20 s) and may be taken over.
+_ABANDONED_AFTER = timedelta(seconds=60)
+
+
+def schedule_key(schedule_payment_id: int) -> str:
+    """Key derived for a schedule item when the client sends none.
+
+    Shared by manual payments and autopay, so a double tap or a webhook-driven
+    charge racing the user cannot pay the same item twice.
+    """
+    return f"schedule:{schedule_payment_id}"
+
+
+def client_key(scope: str, key: str) -> str:
+    return f"{scope}:{key}"
+
+
+def request_hash(scope: str, data: BaseModel) -> str:
+    return hashlib.sha256(f"{scope}:{data.model_dump_json()}".encode("utf-8")).hexdigest()
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A payment request with this idempotency key is already in progress",
+        headers={"Retry-After": "1"},
+    )
+
+
+def claim_idempotency_key(
+    db: Session, user_id: int, key: str, fingerprint: str, derived: bool = False
+) -> PaymentIdempotencyKey:
+    """Reserve ``key`` for the current request and commit the reservation.
+
+    Returns a record with status ``completed`` when the stored response must
+    be replayed instead. Raises 409 while another request holds the key and
+    422 when a client key is reused with different parameters. A derived key
+    (see ``schedule_key``) replays for any request about the item and is
+    freed once its payment is canceled, so the item can be paid again.
+    """
+    now = datetime.now(timezone.utc)
+    record = (
+        db.query(PaymentIdempotencyKey)
+        .filter(PaymentIdempotencyKey.user_id == user_id, PaymentIdempotencyKey.key == key)
+        .with_for_update()
+        .first()
+    )
+
+    if record is None:
+        record = PaymentIdempotencyKey(
+            user_id=user_id,
+            key=key,
+            request_hash=fingerprint,
+            provider_key=str(uuid.uuid4()),
+            status=PROCESSING,
+            created_at=now,
+        )
+        db.add(record)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise _in_progress()
+        return record
+
+    age = now - _as_utc(record.created_at)
+    if record.status == COMPLETED and age < timedelta(seconds=settings.PAYMENT_IDEMPOTENCY_WINDOW_SECONDS):
+        freed = derived and record.payment is not None and record.payment.status == "canceled"
+        if not freed:
+            if not derived and record.request_hash != fingerprint:
+                db.rollback()
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail="Idempotency key was already used with different parameters",
+                )
+            db.rollback()
+            return record
+    elif record.status == PROCESSING and age < _ABANDONED_AFTER:
+        db.rollback()
+        raise _in_progress()
+
+    # Expired, freed, failed or abandoned: take the key over. Only a retry of
+    # the very same request may reuse the provider key.
+    if record.status == COMPLETED or record.request_hash != fingerprint:
+        record.provider_key = str(uuid.uuid4())
+    record.request_hash = fingerprint
+    record.status = PROCESSING
+    record.payment_id = None
+    record.response = None
+    record.created_at = now
+    db.commit()
+    return record
+
+
+def complete_idempotency_key(record: PaymentIdempotencyKey, payment_id: int, response: BaseModel) -> None:
+    """Store the response; committed together with the payment by the caller."""
+    record.status = COMPLETED
+    record.payment_id = payment_id
+    record.response = response.model_dump_json()
+
+
+def fail_idempotency_key(db: Session, record: PaymentIdempotencyKey) -> None:
+    """Roll back the failed request and release its reservation for a retry."""
+    record_id = record.id
+    db.rollback()
+    try:
+        record.status = FAILED
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        logger.exception("Не удалось освободить ключ идемпотентности платежа %s", record_id)
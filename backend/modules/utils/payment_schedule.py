@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 
 from modules.models.payment import ContractPayment
 from modules.models.user_document import UserDocument
+from modules.utils.counters import PAYMENT_NUMBER_COUNTER, set_user_counter
 from modules.utils.document_security import decrypt_document_fields, get_sensitive_data_cipher
 from modules.utils.pricing import resolve_weekly_amount
 
@@ -39,5 +40,7 @@ def rebuild_schedule_for_document(db: Session, document: UserDocument) -> list[C
         db.add(row)
         rows.append(row)
 
+    # The schedule was renumbered from scratch; later extra payments continue after it.
+    set_user_counter(db, document.user_id, PAYMENT_NUMBER_COUNTER, weeks_count)
     db.flush()
     return rows
\ No newline at end of file
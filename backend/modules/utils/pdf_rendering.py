@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import io
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Mapping
+from xml.sax.saxutils import escape
+
+from docx import Document as DocxDocument
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY, TA_LEFT, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import Paragraph as PdfParagraph
+from reportlab.platypus import SimpleDocTemplate, Spacer, TableStyle
+from reportlab.platypus import Table as PdfTable
+
+from modules.utils.config import settings
+
+
+_PDF_FONT_NAME = "DejaVuSans"
+_DEFAULT_FONT_SIZE = 10.0
+_PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
+
+_ALIGNMENTS = {
+    WD_ALIGN_PARAGRAPH.CENTER: TA_CENTER,
+    WD_ALIGN_PARAGRAPH.RIGHT: TA_RIGHT,
+    WD_ALIGN_PARAGRAPH.JUSTIFY: TA_JUSTIFY,
+}
+
+# Even items are literal text, odd items are placeholder names (re.split layout).
+_CompiledText = tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _ParagraphBlock:
+    text: _CompiledText
+    alignment: int
+    font_size: float
+
+
+@dataclass(frozen=True)
+class _TableBlock:
+    rows: tuple[tuple[_CompiledText, ...], ...]
+    font_size: float
+
+
+_Block = _ParagraphBlock | _TableBlock
+
+
+def _compile_text(text: str) -> _CompiledText:
+    return tuple(_PLACEHOLDER_RE.split(text))
+
+
+def _render_text(parts: _CompiledText, values: Mapping[str, Any]) -> str:
+    rendered: list[str] = []
+    for idx, part in enumerate(parts):
+        if idx % 2 == 0:
+            rendered.append(part)
+        elif part in values:
+            rendered.append(str(values[part]))
+        else:
+            # Unknown placeholders stay as-is, like in the DOCX output.
+            rendered.append(f"{{{part}}}")
+    return "".join(rendered)
+
+
+def _paragraph_font_size(paragraph: Paragraph) -> float:
+    for run in paragraph.runs:
+        if run.font.size is not None:
+            return run.font.size.pt
+    style_font = paragraph.style.font if paragraph.style is not None else None
+    if style_font is not None and style_font.size is not None:
+        return style_font.size.pt
+    return _DEFAULT_FONT_SIZE
+
+
+def _compile_paragraph(paragraph: Paragraph) -> _ParagraphBlock:
+    return _ParagraphBlock(
+        text=_compile_text("".join(run.text for run in paragraph.runs)),
+        alignment=_ALIGNMENTS.get(paragraph.alignment, TA_LEFT),
+        font_size=_paragraph_font_size(paragraph),
+    )
+
+
+def _compile_table(table: Table) -> _TableBlock:
+    rows = tuple(
+        tuple(
+            _compile_text("\n".join(p.text for p in cell.paragraphs))
+            for cell in row.cells
+        )
+        for row in table.rows
+    )
+    first_cell = table.rows[0].cells[0] if rows and rows[0] else None
+    font_size = (
+        _paragraph_font_size(first_cell.paragraphs[0])
+        if first_cell is not None and first_cell.paragraphs
+        else _DEFAULT_FONT_SIZE
+    )
+    return _TableBlock(rows=rows, font_size=font_size)
+
+
+@lru_cache(maxsize=8)
+def _compile_template(template_path: str, mtime_ns: int) -> tuple[_Block, ...]:
+    # ``mtime_ns`` is part of the cache key so that a replaced template is recompiled.
+    document = DocxDocument(template_path)
+    blocks: list[_Block] = []
+
+    for section in document.sections[:1]:
+        blocks.extend(_compile_paragraph(p) for p in section.header.paragraphs)
+
+    for child in document.element.body.iterchildren():
+        tag = child.tag.rsplit("}", 1)[-1]
+        if tag == "p":
+            blocks.append(_compile_paragraph(Paragraph(child, document)))
+        elif tag == "tbl":
+            blocks.append(_compile_table(Table(child, document)))
+
+    for section in document.sections[:1]:
+        blocks.extend(_compile_paragraph(p) for p in section.footer.paragraphs)
+
+    return tuple(blocks)
+
+
+def get_compiled_template(template_path: Path) -> tuple[_Block, ...]:
+    return _compile_template(str(template_path), template_path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _register_pdf_font() -> str:
+    font_path = settings.PDF_FONT_PATH
+    if not font_path.exists():
+        raise FileNotFoundError(
+            f"Шрифт для PDF не найден по пути: {font_path}. "
+            "Укажите путь к DejaVuSans.ttf в PDF_FONT_PATH."
+        )
+    pdfmetrics.registerFont(TTFont(_PDF_FONT_NAME, str(font_path)))
+    return _PDF_FONT_NAME
+
+
+@lru_cache(maxsize=32)
+def _paragraph_style(alignment: int, font_size: float) -> ParagraphStyle:
+    return ParagraphStyle(
+        name=f"doc-{alignment}-{font_size}",
+        fontName=_register_pdf_font(),
+        fontSize=font_size,
+        leading=font_size * 1.25,
+        alignment=alignment,
+    )
+
+
+def _to_markup(text: str) -> str:
+    return escape(text).replace("\n", "<br/>")
+
+
+def render_pdf_from_template(
+    template_path: Path, values: Mapping[str, Any]
+) -> io.BytesIO:
+    """Render a DOCX template straight to PDF using the compiled template cache."""
+    story: list[Any] = []
+    for block in get_compiled_template(template_path):
+        if isinstance(block, _TableBlock):
+            style = _paragraph_style(TA_LEFT, block.font_size)
+            data = [
+                [PdfParagraph(_to_markup(_render_text(cell, values)), style) for cell in row]
+                for row in block.rows
+            ]
+            if not data:
+                continue
+            table = PdfTable(data, hAlign="LEFT")
+            table.setStyle(
+                TableStyle(
+                    [
+                        ("GRID", (0, 0), (-1, -1), 0.5, "#000000"),
+                        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+                    ]
+                )
+            )
+            story.append(table)
+            continue
+
+        text = _render_text(block.text, values)
+        if not text.strip():
+            story.append(Spacer(1, block.font_size * 1.25))
+            continue
+        story.append(
+            PdfParagraph(_to_markup(text), _paragraph_style(block.alignment, block.font_size))
+        )
+
+    buf = io.BytesIO()
+    SimpleDocTemplate(
+        buf,
+        pagesize=A4,
+        leftMargin=20 * mm,
+        rightMargin=15 * mm,
+        topMargin=15 * mm,
+        bottomMargin=15 * mm,
+    ).build(story)
+    buf.seek(0)
+    return buf
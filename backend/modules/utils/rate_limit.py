@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Protocol
+
+from fastapi import HTTPException, Request, status
+
+from modules.utils.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """Token bucket: ``capacity`` requests in a burst, refilled over ``period_seconds``."""
+
+    name: str
+    capacity: int
+    period_seconds: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.capacity / self.period_seconds
+
+
+class RateLimitBackend(Protocol):
+    def consume(self, key: str, rule: RateLimitRule) -> float:
+        """Take one token; return 0 when allowed, otherwise seconds until the next token."""
+
+
+class InMemoryRateLimitBackend:
+    """Per-process buckets, for a single worker and local development.
+
+    Every gunicorn worker keeps its own buckets, so with ``WEB_CONCURRENCY``
+    workers a client gets up to that many times the capacity. Deployments
+    with more than one worker use ``RATE_LIMIT_BACKEND=redis``.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._max_keys = max_keys
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, rule: RateLimitRule) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.pop(key, (float(rule.capacity), now))
+            tokens = min(rule.capacity, tokens + (now - updated_at) * rule.refill_per_second)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0.0
+            else:
+                retry_after = (1 - tokens) / rule.refill_per_second
+
+            self._buckets[key] = (tokens, now)
+            # Drop the least recently used buckets; a dropped bucket simply starts full.
+            while len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+_REDIS_TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * refill)
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+else
+  retry_after = (1 - tokens) / refill
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / refill) + 1)
+return tostring(retry_after)
+"""
+
+
+class RedisRateLimitBackend:
+    """Buckets shared between workers and instances, updated atomically by a Lua script.
+
+    The limits are checked on the event loop, so Redis gets short timeouts,
+    and while it is unreachable the buckets fall back to this process's
+    memory: requests stay limited per worker instead of failing with 500.
+    """
+
+    _TIMEOUT_SECONDS = 0.2
+    _WARNING_INTERVAL_SECONDS = 60.0
+
+    def __init__(self, url: str) -> None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis требует установленного пакета redis"
+            ) from exc
+
+        self._client = redis.Redis.from_url(
+            url,
+            socket_timeout=self._TIMEOUT_SECONDS,
+            socket_connect_timeout=self._TIMEOUT_SECONDS,
+        )
+        self._script = self._client.register_script(_REDIS_TOKEN_BUCKET)
+        self._redis_error = redis.RedisError
+        self._fallback = InMemoryRateLimitBackend()
+        self._warned_at: float | None = None
+
+    def consume(self, key: str, rule: RateLimitRule) -> float:
+        try:
+            retry_after = self._script(
+                keys=[f"rate_limit:{key}"],
+                args=[rule.capacity, rule.refill_per_second, time.time()],
+            )
+        except self._redis_error as exc:
+            now = time.monotonic()
+            if self._warned_at is None or now - self._warned_at >= self._WARNING_INTERVAL_SECONDS:
+                self._warned_at = now
+                logger.warning(
+                    "Redis недоступен для ограничения запросов, лимиты считаются в памяти процесса: %s",
+                    exc,
+                )
+            return self._fallback.consume(key, rule)
+        return float(retry_after)
+
+
+LOGIN_PER_IP = RateLimitRule("login-ip", settings.AUTH_RATE_LIMIT_PER_IP, 60)
+LOGIN_PER_EMAIL = RateLimitRule("login-email", settings.AUTH_RATE_LIMIT_PER_EMAIL, 60)
+CODE_REQUEST_PER_IP = RateLimitRule("code-request-ip", settings.AUTH_RATE_LIMIT_PER_IP, 60)
+CODE_REQUEST_PER_EMAIL = RateLimitRule(
+    "code-request-email", settings.AUTH_RATE_LIMIT_PER_EMAIL, 60
+)
+CODE_CONFIRM_PER_IP = RateLimitRule("code-confirm-ip", settings.AUTH_RATE_LIMIT_PER_IP, 60)
+CODE_CONFIRM_PER_EMAIL = RateLimitRule(
+    "code-confirm-email", settings.AUTH_RATE_LIMIT_PER_EMAIL, 60
+)
+PROFILE_RUN_PER_ADMIN = RateLimitRule("profile-run", settings.PROFILE_RATE_LIMIT_PER_HOUR, 3600)
+PROFILE_DOWNLOAD_PER_ADMIN = RateLimitRule(
+    "profile-download", settings.PROFILE_DOWNLOAD_RATE_LIMIT_PER_MINUTE, 60
+)
+
+
+@lru_cache
+def get_rate_limit_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        if not settings.RATE_LIMIT_REDIS_URL:
+            raise RuntimeError("Для RATE_LIMIT_BACKEND=redis укажите RATE_LIMIT_REDIS_URL")
+        return RedisRateLimitBackend(settings.RATE_LIMIT_REDIS_URL)
+    return InMemoryRateLimitBackend()
+
+
+def get_client_ip(request: Request) -> str:
+    hops = settings.RATE_LIMIT_TRUSTED_PROXY_HOPS
+    if hops > 0:
+        forwarded = [
+            part.strip()
+            for part in request.headers.get("x-forwarded-for", "").split(",")
+            if part.strip()
+        ]
+        # Entries appended by our own proxies are the only ones that cannot be forged.
+        if len(forwarded) >= hops:
+            return forwarded[-hops]
+    return request.client.host if request.client else "unknown"
+
+
+def enforce_rate_limit(rule: RateLimitRule, identity: str) -> None:
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+
+    # Hash the identity so e-mails do not end up in a shared store in clear text.
+    digest = hashlib.sha256(identity.strip().lower().encode()).hexdigest()[:32]
+    retry_after = get_rate_limit_backend().consume(f"{rule.name}:{digest}", rule)
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Слишком много запросов. Попробуйте позже.",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@dataclass
+class RequestMetrics:
+    """Per-request counters shared by the access log and SQLAlchemy hooks.
+
+    The object is set once per request and mutated in place, so sync handlers
+    running in the threadpool (which get a copy of the context) update the
+    same instance the middleware later reads.
+    """
+
+    request_id: str
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    pool_wait_seconds: float = 0.0
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+current_request_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request_metrics", default=None
+)
+
+
+def get_request_id() -> str | None:
+    metrics = current_request_metrics.get()
+    return metrics.request_id if metrics else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_request_metrics.get() is not None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    metrics = current_request_metrics.get()
+    started = conn.info.get("query_started_at")
+    if metrics is None or not started:
+        return
+    metrics.db_seconds += time.perf_counter() - started.pop()
+    metrics.db_queries += 1
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    started = conn.info.get("query_started_at") if conn is not None else None
+    if started:
+        started.pop()
+
+
+def install_query_metrics(engine: Engine) -> None:
+    """Count statements and their time against the request that issued them."""
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import cProfile
+import io
+import logging
+import pstats
+import re
+import threading
+import uuid
+from pathlib import Path
+
+from modules.schemas.system_schemas import ProfileRead
+from modules.utils.config import settings
+from modules.utils.document_security import get_profiles_dir
+
+logger = logging.getLogger(__name__)
+
+PROFILE_REQUEST_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_PROFILE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+# cProfile can only run one profiler per process, so requests are profiled one at a time.
+_profiler_slot = threading.Lock()
+
+
+def _manifest_path(profile_id: str) -> Path:
+    return get_profiles_dir() / f"{profile_id}.json"
+
+
+def get_profile_path(profile_id: str) -> Path:
+    return get_profiles_dir() / f"{profile_id}.prof"
+
+
+def new_profile_id() -> str:
+    return uuid.uuid4().hex
+
+
+def start_profiler() -> cProfile.Profile | None:
+    """Start a profiler for the current request, or return None if one is already running."""
+    if not _profiler_slot.acquire(blocking=False):
+        return None
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # Another tool (a debugger, py-spy in-process) already holds the profiling hook.
+        _profiler_slot.release()
+        return None
+    return profiler
+
+
+def stop_profiler(profiler: cProfile.Profile) -> None:
+    try:
+        profiler.disable()
+    finally:
+        _profiler_slot.release()
+
+
+def save_profile(profiler: cProfile.Profile, profile: ProfileRead) -> ProfileRead:
+    """Persist the collected stats and their manifest, then prune old profiles.
+
+    Profiles larger than ``PROFILE_MAX_BYTES`` are dropped; only the manifest
+    is kept so the id returned to the client still resolves to an explanation.
+    """
+    path = get_profile_path(profile.id)
+    tmp_path = path.with_suffix(".prof.tmp")
+    profiler.dump_stats(tmp_path)
+    size = tmp_path.stat().st_size
+    if size > settings.PROFILE_MAX_BYTES:
+        tmp_path.unlink(missing_ok=True)
+        profile.error = (
+            f"Профиль занимает {size} байт, больше лимита {settings.PROFILE_MAX_BYTES}, и не сохранен"
+        )
+        logger.warning("Профиль %s отброшен: %s байт", profile.id, size)
+    else:
+        tmp_path.replace(path)
+        profile.size_bytes = size
+
+    manifest_path = _manifest_path(profile.id)
+    tmp_manifest = manifest_path.with_suffix(".json.tmp")
+    tmp_manifest.write_text(profile.model_dump_json(exclude={"download_url"}), encoding="utf-8")
+    tmp_manifest.replace(manifest_path)
+
+    _prune_profiles()
+    return profile
+
+
+def _prune_profiles() -> None:
+    manifests = sorted(
+        get_profiles_dir().glob("*.json"), key=lambda item: item.stat().st_mtime, reverse=True
+    )
+    for manifest in manifests[settings.PROFILE_RETENTION_COUNT:]:
+        get_profile_path(manifest.stem).unlink(missing_ok=True)
+        manifest.unlink(missing_ok=True)
+
+
+def _read_manifest(path: Path) -> ProfileRead | None:
+    try:
+        profile = ProfileRead.model_validate_json(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        # Pruned by another worker between listing and reading.
+        return None
+    if profile.error is None:
+        profile.download_url = f"/admin/system/profiles/{profile.id}/download"
+    return profile
+
+
+def get_profile(profile_id: str) -> ProfileRead | None:
+    if not _PROFILE_ID_RE.match(profile_id):
+        return None
+    path = _manifest_path(profile_id)
+    if not path.exists():
+        return None
+    return _read_manifest(path)
+
+
+def list_profiles(limit: int) -> list[ProfileRead]:
+    profiles = [
+        profile
+        for profile in map(_read_manifest, get_profiles_dir().glob("*.json"))
+        if profile is not None
+    ]
+    profiles.sort(key=lambda profile: profile.created_at, reverse=True)
+    return profiles[:limit]
+
+
+def render_profile_text(profile_id: str, limit: int = 60) -> str:
+    """Top functions by cumulative time, as printed by ``pstats``."""
+    output = io.StringIO()
+    stats = pstats.Stats(str(get_profile_path(profile_id)), stream=output)
+    stats.strip_dirs().sort_stats(pstats.SortKey.CUMULATIVE).print_stats(limit)
+    return output.getvalue()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from modules.utils.config import settings
+from modules.utils.logging_utils import SLOW_QUERY_LOGGER_NAME
+from modules.utils.request_metrics import get_request_id
+
+slow_query_logger = logging.getLogger(SLOW_QUERY_LOGGER_NAME)
+
+_STARTED_KEY = "slow_query_started_at"
+_MAX_SQL_LENGTH = 4000
+_EXPLAIN_QUEUE_SIZE = 16
+_EXPLAIN_STATEMENT_TIMEOUT_MS = 10_000
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_PLACEHOLDER = r"(?:%\([^)]+\)s|%s|\?|\$\d+)"
+_IN_LIST_RE = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})+\s*\)")
+_PLACEHOLDER_RE = re.compile(_PLACEHOLDER)
+_STRING_RE = re.compile(r"'(?:''|[^'])*'")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LOCKING_RE = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.IGNORECASE)
+
+# Frames from these modules are plumbing, not the code that issued the query.
+_SKIPPED_MODULE_PREFIXES = ("sqlalchemy.", "modules.utils.slow_query_log", "modules.connection_to_db.")
+
+
+def normalize_sql(statement: str) -> str:
+    """Collapse whitespace and replace literals and bind parameters with ``?``.
+
+    Statements differing only in parameter values (or IN-list length)
+    normalize to the same text, so they can be grouped.
+    """
+    normalized = _WHITESPACE_RE.sub(" ", statement).strip()
+    normalized = _IN_LIST_RE.sub("(...)", normalized)
+    normalized = _STRING_RE.sub("?", normalized)
+    normalized = _PLACEHOLDER_RE.sub("?", normalized)
+    return _NUMBER_RE.sub("?", normalized)
+
+
+def _fingerprint(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode()).hexdigest()[:12]
+
+
+def _find_caller() -> str | None:
+    """Nearest application frame, preferring handler methods."""
+    frame = sys._getframe(2)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(("app.", "modules.")) and not module.startswith(_SKIPPED_MODULE_PREFIXES):
+            location = f"{module}.{frame.f_code.co_qualname}:{frame.f_lineno}"
+            if module.startswith("app.handlers."):
+                return location
+            fallback = fallback or location
+        frame = frame.f_back
+    return fallback
+
+
+def _is_explainable(statement: str) -> bool:
+    # EXPLAIN ANALYZE executes the statement: plain reads only.
+    head = statement.lstrip()[:6].upper()
+    return head == "SELECT" and not _LOCKING_RE.search(statement)
+
+
+class _ExplainWorker:
+    """Runs sampled EXPLAIN (ANALYZE, BUFFERS) on a background thread.
+
+    Each plan is captured on its own connection in a read-only transaction
+    with a statement timeout, so the request that issued the slow query does
+    not wait for it and the re-execution cannot modify data.
+    """
+
+    def __init__(self) -> None:
+        self._queue: queue.Queue[tuple[Engine, str, Any, dict[str, Any], str | None]] = queue.Queue(
+            maxsize=_EXPLAIN_QUEUE_SIZE
+        )
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+
+    def submit(
+        self,
+        engine: Engine,
+        statement: str,
+        parameters: Any,
+        fields: dict[str, Any],
+        request_id: str | None,
+    ) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((engine, statement, parameters, fields, request_id))
+        except queue.Full:
+            pass
+
+    def _ensure_started(self) -> None:
+        # Also restarts the thread in a forked worker, where it does not exist.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._queue = queue.Queue(maxsize=_EXPLAIN_QUEUE_SIZE)
+            threading.Thread(target=self._run, name="slow-query-explain", daemon=True).start()
+            self._pid = os.getpid()
+
+    def _run(self) -> None:
+        while True:
+            engine, statement, parameters, fields, request_id = self._queue.get()
+            try:
+                plan = self._explain(engine, statement, parameters)
+            except Exception as exc:
+                slow_query_logger.warning(
+                    "explain failed",
+                    extra={"request_id": request_id, "fields": {**fields, "error": str(exc)}},
+                )
+            else:
+                slow_query_logger.info(
+                    "explain", extra={"request_id": request_id, "fields": {**fields, "plan": plan}}
+                )
+
+    @staticmethod
+    def _explain(engine: Engine, statement: str, parameters: Any) -> Any:
+        raw = engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            cursor.execute("SET TRANSACTION READ ONLY")
+            cursor.execute(f"SET LOCAL statement_timeout = {_EXPLAIN_STATEMENT_TIMEOUT_MS}")
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            return cursor.fetchone()[0]
+        finally:
+            raw.rollback()
+            raw.close()
+
+
+_explain_worker = _ExplainWorker()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get(_STARTED_KEY)
+    if not started:
+        return
+    duration_ms = (time.perf_counter() - started.pop()) * 1000
+    if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    normalized = normalize_sql(statement)
+    fields = {
+        "duration_ms": round(duration_ms, 2),
+        "fingerprint": _fingerprint(normalized),
+        "sql": normalized[:_MAX_SQL_LENGTH],
+        "caller": _find_caller(),
+        "executemany": executemany,
+        "rows": cursor.rowcount,
+        "database": conn.engine.url.database,
+    }
+    slow_query_logger.warning("slow query", extra={"fields": fields})
+
+    if (
+        settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE > 0
+        and conn.dialect.name == "postgresql"
+        and not executemany
+        and _is_explainable(statement)
+        and random.random() < settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+    ):
+        # The worker thread has no request context; carry the id along.
+        _explain_worker.submit(conn.engine, statement, parameters, fields, get_request_id())
+
+
+def _handle_error(exception_context) -> None:
+    conn = exception_context.connection
+    started = conn.info.get(_STARTED_KEY) if conn is not None else None
+    if started:
+        started.pop()
+
+
+def install_slow_query_log(engine: Engine) -> None:
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+        return
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
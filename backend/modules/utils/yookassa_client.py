@@ -2,10 +2,34 @@ import base64
 import json
 import uuid
 from urllib import error, request
+from urllib.parse import quote
 
 from fastapi import HTTPException, status
 
+from modules.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
 from modules.utils.config import settings
+from modules.utils.lifecycle import yookassa_calls
+
+
+def _is_provider_failure(exc: BaseException) -> bool:
+    """Unreachable, timing out, overloaded or failing; a rejected request is not a failure."""
+    if isinstance(exc, error.HTTPError):
+        return exc.code >= 500 or exc.code == 429
+    return isinstance(exc, OSError)
+
+
+# One breaker per worker process: a degraded YooKassa fails payment calls fast
+# instead of holding a thread and a DB connection for the whole timeout.
+yookassa_breaker = CircuitBreaker(
+    name="YooKassa",
+    failure_threshold=settings.YOOKASSA_BREAKER_FAILURE_THRESHOLD,
+    slow_call_seconds=settings.YOOKASSA_BREAKER_SLOW_CALL_SECONDS,
+    open_seconds=settings.YOOKASSA_BREAKER_OPEN_SECONDS,
+    half_open_calls=settings.YOOKASSA_BREAKER_HALF_OPEN_CALLS,
+    max_concurrent_calls=settings.YOOKASSA_MAX_CONCURRENT_CALLS,
+    bulkhead_wait_seconds=settings.YOOKASSA_BULKHEAD_WAIT_SECONDS,
+    is_failure=_is_provider_failure,
+)
 
 
 class YooKassaClient:
@@ -23,22 +47,34 @@ class YooKassaClient:
     def create_payment(self, payload: dict, idempotence_key: str | None = None) -> dict:
         return self._request("POST", "/payments", payload, idempotence_key=idempotence_key)
 
+    def get_payment(self, yookassa_payment_id: str) -> dict:
+        return self._request("GET", f"/payments/{quote(yookassa_payment_id, safe='')}")
+
     def create_refund(self, payload: dict, idempotence_key: str | None = None) -> dict:
         return self._request("POST", "/refunds", payload, idempotence_key=idempotence_key)
 
-    def _request(self, method: str, path: str, payload: dict, idempotence_key: str | None = None) -> dict:
+    def _request(
+        self, method: str, path: str, payload: dict | None = None, idempotence_key: str | None = None
+    ) -> dict:
         url = f"{self.base_url}{path}"
-        data = json.dumps(payload).encode("utf-8")
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
 
         req = request.Request(url, data=data, method=method)
         req.add_header("Authorization", self.auth_header)
-        req.add_header("Content-Type", "application/json")
-        req.add_header("Idempotence-Key", idempotence_key or str(uuid.uuid4()))
+        if data is not None:
+            req.add_header("Content-Type", "application/json")
+            req.add_header("Idempotence-Key", idempotence_key or str(uuid.uuid4()))
 
         try:
-            with request.urlopen(req, timeout=20) as response:
+            with yookassa_breaker.guard(), yookassa_calls.track(), request.urlopen(req, timeout=20) as response:
                 raw = response.read().decode("utf-8")
                 return json.loads(raw)
+        except CircuitOpenError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="YooKassa is temporarily unavailable, retry later",
+                headers={"Retry-After": exc.retry_after_header},
+            ) from exc
         except error.HTTPError as exc:
             body = exc.read().decode("utf-8") if exc.fp else ""
             raise HTTPException(